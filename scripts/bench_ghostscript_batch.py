@@ -0,0 +1,109 @@
+"""Benchmark Ghostscript compression of many small PDFs: one gs per file vs. a session.
+
+Generates invoice-sized PDFs (one page of text plus a small scanned-looking
+image, roughly 50-200 KB each) and compresses them with compress_pdf, first
+starting Ghostscript for every file, then with batched=True, which reuses one
+interpreter. Both runs go through the same process pool when --jobs > 1, so
+each pool process keeps its own session.
+
+    python scripts/bench_ghostscript_batch.py [--files 300] [--jobs 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from pdf_toolbox.core.batch import FileJob, iter_parallel
+from pdf_toolbox.core.capabilities import get_registry
+from pdf_toolbox.core.compress import CompressionLevel, compress_pdf
+from pdf_toolbox.core.ghostscript import close_session
+
+
+def _make_invoices(folder: Path, count: int) -> list[Path]:
+    files = []
+    for i in range(count):
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Invoice {i:05d}", fontsize=20)
+        for line in range(30):
+            page.insert_text((72, 110 + line * 18), f"Item {line:02d}  ....  {line * 7.5:8.2f}")
+        # Noise compresses badly, which keeps files in the 50-200 KB range.
+        side = 120 + (i % 4) * 40
+        pix = fitz.Pixmap(fitz.csRGB, side, side, os.urandom(side * side * 3), False)
+        page.insert_image(fitz.Rect(350, 600, 520, 770), pixmap=pix)
+        path = folder / f"invoice_{i:05d}.pdf"
+        doc.save(path)
+        doc.close()
+        files.append(path)
+    return files
+
+
+def _run(files: list[Path], out_dir: Path, jobs: int, batched: bool) -> tuple[float, int]:
+    """Return (seconds, failures)."""
+    out_dir.mkdir()
+    batch = [
+        FileJob(
+            src,
+            compress_pdf,
+            {
+                "src": src,
+                "dst": out_dir / src.name,
+                "level": CompressionLevel.HIGH,
+                "batched": batched,
+            },
+        )
+        for src in files
+    ]
+    started = time.perf_counter()
+    if jobs > 1:
+        outcomes = [outcome for _, outcome in iter_parallel(batch, jobs)]
+    else:
+        outcomes = []
+        for job in batch:
+            try:
+                outcomes.append(job.run())
+            except Exception as exc:
+                outcomes.append(exc)
+        close_session()
+    elapsed = time.perf_counter() - started
+    failures = sum(1 for o in outcomes if isinstance(o, BaseException) or not o.success)
+    return elapsed, failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args()
+
+    gs = get_registry().get("ghostscript")
+    if not gs.available:
+        print("Ghostscript is not installed; nothing to compare.", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        inputs = root / "in"
+        inputs.mkdir()
+        files = _make_invoices(inputs, args.files)
+        total = sum(p.stat().st_size for p in files)
+        print(
+            f"Ghostscript {gs.version}, {len(files)} files, "
+            f"{total / len(files) / 1024:.0f} KB average, {args.jobs} process(es)"
+        )
+        print(f"{'mode':<10} {'seconds':>9} {'files/s':>9} {'failed':>7}")
+        for mode, batched in (("per-file", False), ("batched", True)):
+            elapsed, failures = _run(files, root / mode, args.jobs, batched)
+            print(f"{mode:<10} {elapsed:>9.2f} {len(files) / elapsed:>9.1f} {failures:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
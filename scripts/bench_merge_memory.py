@@ -0,0 +1,97 @@
+"""Benchmark peak memory of merging many PDFs: in memory vs. streamed in batches.
+
+Generates small one-page PDFs (a line of text and a small image each) and
+merges the first N of them for every N in --counts, each merge in a fresh
+process so its peak RSS can be read on its own. "memory" builds the whole
+output in memory before saving it (batch_size=None); "streamed" appends
+--batch-size inputs at a time to the output file.
+
+    python scripts/bench_merge_memory.py [--counts 500,1000,2000,5000] [--batch-size 256]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+
+def _make_inputs(folder: Path, count: int) -> list[Path]:
+    files = []
+    for i in range(count):
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Statement {i:05d}", fontsize=16)
+        pix = fitz.Pixmap(fitz.csRGB, 64, 64, os.urandom(64 * 64 * 3), False)
+        page.insert_image(fitz.Rect(72, 100, 136, 164), pixmap=pix)
+        path = folder / f"in_{i:05d}.pdf"
+        doc.save(path)
+        doc.close()
+        files.append(path)
+    return files
+
+
+def _child(folder: Path, count: int, batch_size: int | None, output: Path) -> None:
+    from pdf_toolbox.core.merge import merge_pdfs
+
+    files = sorted(folder.glob("in_*.pdf"))[:count]
+    started = time.perf_counter()
+    result = merge_pdfs(files, output, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    if not result.success:
+        print(result.message, file=sys.stderr)
+        sys.exit(1)
+    # ru_maxrss is in KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+    print(f"{elapsed:.2f} {peak_mb:.0f}")
+
+
+def _measure(folder: Path, count: int, batch_size: int | None) -> tuple[float, float]:
+    """Return (seconds, peak RSS in MB) of one merge in a fresh process."""
+    cmd = [
+        sys.executable,
+        __file__,
+        "--child",
+        str(folder),
+        str(count),
+        str(batch_size or 0),
+    ]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    seconds, peak = out.splitlines()[-1].split()
+    return float(seconds), float(peak)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", default="500,1000,2000,5000")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        folder, count, batch_size = Path(args.child[0]), int(args.child[1]), int(args.child[2])
+        _child(folder, count, batch_size or None, folder / f"merged_{count}_{batch_size}.pdf")
+        return 0
+
+    counts = [int(c) for c in args.counts.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        _make_inputs(folder, max(counts))
+        print(f"{'inputs':>7} {'mode':<8} {'seconds':>9} {'peak MB':>9}")
+        for count in counts:
+            for mode, batch_size in (("memory", None), ("streamed", args.batch_size)):
+                elapsed, peak = _measure(folder, count, batch_size)
+                print(f"{count:>7} {mode:<8} {elapsed:>9.2f} {peak:>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
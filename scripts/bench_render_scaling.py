@@ -0,0 +1,98 @@
+"""Benchmark PDF to PNG rendering with PyMuPDF across process counts (and pdftoppm).
+
+Generates a drawing-set-like PDF (vector line work on every page) and renders
+it with convert_pdf_to_png for each process count, doubling from 1 up to the
+number of CPUs, and once with pdftoppm when it is installed. With a single
+process, pages are encoded on --encode-jobs threads while the next render.
+
+    python scripts/bench_render_scaling.py [--pages 64] [--dpi 300]
+        [--format png] [--encode-jobs 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from pdf_toolbox.core.capabilities import get_registry
+from pdf_toolbox.core.convert import RenderEngine, convert_pdf_to_png
+from pdf_toolbox.core.raster import ImageFormat
+
+
+def _make_drawing_set(path: Path, pages: int) -> None:
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=1190, height=842)  # A3 landscape
+        shape = page.new_shape()
+        for n in range(400):
+            x = (n * 37 + i * 11) % 1150 + 20
+            y = (n * 53 + i * 7) % 800 + 20
+            shape.draw_line((x, y), (1190 - x, 842 - y))
+            shape.draw_circle((x, y), 5 + n % 30)
+        shape.finish(width=0.3)
+        shape.commit()
+        page.insert_text((40, 40), f"Sheet {i + 1:03d}", fontsize=24)
+    doc.save(path)
+    doc.close()
+
+
+def _run(
+    pdf: Path, out_dir: Path, args: argparse.Namespace, engine: RenderEngine, jobs: int
+) -> float:
+    out_dir.mkdir()
+    started = time.perf_counter()
+    result = convert_pdf_to_png(
+        pdf,
+        out_dir,
+        dpi=args.dpi,
+        engine=engine,
+        max_workers=jobs,
+        image_format=ImageFormat[args.format.upper()],
+        encode_workers=args.encode_jobs,
+    )
+    elapsed = time.perf_counter() - started
+    if not result.success:
+        raise SystemExit(result.message)
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--format", choices=[f.name.lower() for f in ImageFormat], default="png")
+    parser.add_argument("--encode-jobs", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        pdf = root / "drawings.pdf"
+        _make_drawing_set(pdf, args.pages)
+        cpus = os.cpu_count() or 1
+        print(f"{args.pages} pages at {args.dpi} DPI as {args.format}, {cpus} CPU(s)")
+        print(f"{'engine':<10} {'procs':>5} {'seconds':>9} {'pages/s':>9}")
+
+        counts = []
+        jobs = 1
+        while jobs < cpus:
+            counts.append(jobs)
+            jobs *= 2
+        counts.append(cpus)
+        for jobs in counts:
+            elapsed = _run(pdf, root / f"pymupdf-{jobs}", args, RenderEngine.PYMUPDF, jobs)
+            print(f"{'pymupdf':<10} {jobs:>5} {elapsed:>9.2f} {args.pages / elapsed:>9.1f}")
+
+        if get_registry().available("pdftoppm"):
+            elapsed = _run(pdf, root / "pdftoppm", args, RenderEngine.PDFTOPPM, 1)
+            print(f"{'pdftoppm':<10} {1:>5} {elapsed:>9.2f} {args.pages / elapsed:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Benchmark GUI-thread CPU time of worker updates, with and without coalescing.
+
+Runs a worker whose files take no time at all (the worst case for signal
+traffic) against a visible LogPanel and ProgressPanel, and reports the CPU
+time spent in the GUI thread. With coalescing, that time stays roughly flat as
+the number of files grows; delivering every update individually makes it grow
+with the batch.
+
+    QT_QPA_PLATFORM=offscreen python scripts/bench_signal_coalescing.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+from PySide6.QtCore import QEventLoop
+from PySide6.QtWidgets import QApplication, QVBoxLayout, QWidget
+
+from pdf_toolbox.gui.widgets.log_panel import LogPanel
+from pdf_toolbox.gui.widgets.progress_panel import ProgressPanel
+from pdf_toolbox.workers.base_worker import BaseWorker, FileResult, TaskStatus
+from pdf_toolbox.workers.coalescer import FLUSH_INTERVAL, SignalCoalescer
+
+BATCH_SIZES = [1_000, 5_000, 20_000, 50_000]
+# Per-update delivery degrades badly past this (minutes for 20k files), so the
+# comparison stops here.
+PER_UPDATE_MAX_FILES = 5_000
+
+
+class _InstantWorker(BaseWorker):
+    def __init__(self, files: list[Path], interval: float) -> None:
+        super().__init__(files)
+        self._updates = SignalCoalescer(self._deliver, interval)
+
+    def process_file(self, file_path: Path, index: int, total: int) -> FileResult:
+        return FileResult(file_path, None, TaskStatus.SUCCESS, f"✓ {file_path.name}")
+
+
+def _run(count: int, interval: float) -> tuple[float, float]:
+    """Return (GUI-thread CPU seconds, wall seconds) for one batch."""
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    progress = ProgressPanel()
+    log = LogPanel()
+    layout.addWidget(progress)
+    layout.addWidget(log)
+    window.show()
+
+    worker = _InstantWorker([Path(f"{i:06d}.pdf") for i in range(count)], interval)
+    worker.progress_updated.connect(progress.update_progress)
+    worker.step_progress.connect(progress.update_step)
+    worker.log_messages.connect(log.append_many)
+    loop = QEventLoop()
+    worker.finished.connect(loop.quit)
+
+    cpu = time.thread_time()
+    wall = time.perf_counter()
+    worker.start()
+    loop.exec()
+    # Drain updates still queued for the GUI thread.
+    QApplication.processEvents()
+    cpu = time.thread_time() - cpu
+    wall = time.perf_counter() - wall
+
+    worker.wait()
+    window.close()
+    return cpu, wall
+
+
+def main() -> int:
+    app = QApplication.instance() or QApplication(sys.argv)
+    _run(200, FLUSH_INTERVAL)  # warm-up
+
+    print(f"{'files':>8}  {'mode':<12} {'GUI CPU (s)':>12} {'wall (s)':>10} {'CPU/1k files':>13}")
+    for count in BATCH_SIZES:
+        for mode, interval in (("coalesced", FLUSH_INTERVAL), ("per-update", 0.0)):
+            if interval == 0.0 and count > PER_UPDATE_MAX_FILES:
+                continue
+            cpu, wall = _run(count, interval)
+            print(f"{count:>8}  {mode:<12} {cpu:>12.3f} {wall:>10.3f} {cpu / count * 1000:>13.4f}")
+    app.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Benchmark splitting a long scan every N pages: page by page vs. range copies vs. sharded.
+
+Generates a --pages page PDF (a line of text and a grey scan-like image per
+page) and splits it every N pages for every N in --chunks:
+
+    page-loop   one pikepdf.Pdf per part, pages appended one at a time (as
+                split_pdf did before range copies)
+    ranges      split_pdf in this process, each part copied as one range
+    sharded     split_pdf with --jobs processes, each writing its shards
+
+    python scripts/bench_split.py [--pages 10000] [--chunks 1,10,100] [--jobs 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import pikepdf
+
+from pdf_toolbox.core.batch import default_max_workers
+from pdf_toolbox.core.split import SplitMode, split_pdf
+
+
+def _make_scan(path: Path, pages: int) -> None:
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Scan page {i + 1:05d}", fontsize=16)
+        pix = fitz.Pixmap(fitz.csGRAY, 160, 160, os.urandom(160 * 160), False)
+        page.insert_image(fitz.Rect(72, 100, 472, 500), pixmap=pix)
+    doc.save(path)
+    doc.close()
+
+
+def _page_loop(src: Path, out_dir: Path, n: int) -> int:
+    files = 0
+    with pikepdf.open(str(src)) as pdf:
+        total = len(pdf.pages)
+        for start in range(0, total, n):
+            end = min(start + n, total)
+            out_pdf = pikepdf.Pdf.new()
+            for page_idx in range(start, end):
+                out_pdf.pages.append(pdf.pages[page_idx])
+            out_pdf.save(str(out_dir / f"{src.stem}_p{start + 1}-{end}.pdf"))
+            out_pdf.close()
+            files += 1
+    return files
+
+
+def _timed(mode: str, src: Path, out_dir: Path, n: int, jobs: int) -> tuple[float, int]:
+    """Return (seconds, files written) of one split into a fresh out_dir."""
+    shutil.rmtree(out_dir, ignore_errors=True)
+    out_dir.mkdir()
+    started = time.perf_counter()
+    if mode == "page-loop":
+        files = _page_loop(src, out_dir, n)
+    else:
+        result = split_pdf(
+            src,
+            out_dir,
+            SplitMode.EVERY_N_PAGES,
+            pages_per_split=n,
+            max_workers=jobs if mode == "sharded" else 1,
+        )
+        if not result.success:
+            raise RuntimeError(result.message)
+        files = len(result.output_files)
+    return time.perf_counter() - started, files
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10000)
+    parser.add_argument("--chunks", default="1,10,100")
+    parser.add_argument("--jobs", type=int, default=default_max_workers())
+    args = parser.parse_args()
+
+    chunks = [int(c) for c in args.chunks.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        src = folder / "scan.pdf"
+        _make_scan(src, args.pages)
+        size_mb = src.stat().st_size / 1024**2
+        print(f"{args.pages} pages, {size_mb:.0f} MB, {args.jobs} jobs")
+        print(f"{'N':>5} {'mode':<10} {'files':>6} {'seconds':>9} {'files/s':>9}")
+        for n in chunks:
+            for mode in ("page-loop", "ranges", "sharded"):
+                elapsed, files = _timed(mode, src, folder / "out", n, args.jobs)
+                print(f"{n:>5} {mode:<10} {files:>6} {elapsed:>9.2f} {files / elapsed:>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import multiprocessing
 import sys
 
 from PySide6.QtGui import QFont, QIcon
@@ -14,6 +15,8 @@ from pdf_toolbox.gui.theme import get_stylesheet
 
 def main() -> None:
     """Launch the PDF Toolbox application."""
+    # Worker processes of a frozen (PyInstaller) build re-enter here.
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setStyleSheet(get_stylesheet())
@@ -0,0 +1,690 @@
+"""
+Headless command-line runner over the core package (no Qt).
+
+    pdf-toolbox                      launch the GUI
+    pdf-toolbox run OPERATION [options] INPUT... OUTPUT
+    pdf-toolbox tools                list external tools and libraries found
+
+INPUT is a PDF file or a directory (its *.pdf files are used). OUTPUT is the
+output directory, or the merged file for "merge", whose inputs may pick pages
+as in a.pdf[1-3,7] or c.pdf[-2:]. Progress goes to stderr and
+a JSON summary to stdout. With --journal every finished file is recorded, and
+--resume skips files a previous run with the same settings completed. With
+--cache, inputs whose content was already processed with the same settings
+get the cached output. The exit status is 0 when every file succeeded, 1 when
+any failed and 130 when interrupted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import multiprocessing
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pdf_toolbox import __version__
+from pdf_toolbox.core.batch import FileJob, default_max_workers, iter_parallel
+from pdf_toolbox.core.cache import DEFAULT_MAX_BYTES, CacheHit, ResultCache, default_cache_dir
+from pdf_toolbox.core.cancel import CancelToken, OperationCancelledError
+from pdf_toolbox.core.capabilities import get_registry
+from pdf_toolbox.core.compress import CompressionLevel, compress_pdf
+from pdf_toolbox.core.convert import RenderEngine, convert_pdf_to_png
+from pdf_toolbox.core.journal import JobJournal, JobStatus, JournalRecord
+from pdf_toolbox.core.merge import append_pdfs, merge_pdfs_tree, parse_merge_input
+from pdf_toolbox.core.protect import protect_pdf
+from pdf_toolbox.core.raster import DEFAULT_PNG_LEVEL, DEFAULT_QUALITY, ImageFormat
+from pdf_toolbox.core.reorder import get_page_count, reorder_pdf
+from pdf_toolbox.core.rotate import rotate_pdf
+from pdf_toolbox.core.split import SplitMode, split_pdf
+from pdf_toolbox.core.unlock import repair_pdf
+from pdf_toolbox.core.utils import ensure_unique_path
+from pdf_toolbox.core.watermark import WatermarkConfig, add_watermark
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_INTERRUPTED = 130
+
+_SPLIT_MODES = {
+    "range": SplitMode.BY_RANGE,
+    "every": SplitMode.EVERY_N_PAGES,
+    "extract": SplitMode.EXTRACT_PAGES,
+}
+
+_POSITIONS = ["center", "top-left", "top-right", "bottom-left", "bottom-right"]
+
+
+# -- Job builders (one per operation) --
+
+
+def _parse_pages(spec: str | None) -> list[int] | None:
+    """'1,3,5' (1-based) -> [0, 2, 4]; None/empty -> None."""
+    if not spec:
+        return None
+    return [int(x.strip()) - 1 for x in spec.split(",") if x.strip().isdigit()]
+
+
+def _parse_dpis(spec: str | None) -> list[int]:
+    """'300,72' -> [300, 72]; None/empty -> []."""
+    if not spec:
+        return []
+    return [int(x.strip()) for x in spec.split(",") if x.strip().isdigit()]
+
+
+def _output_file(src: Path, out_dir: Path, suffix: str, reserved: set[Path]) -> Path:
+    return ensure_unique_path(out_dir / f"{src.stem}{suffix}{src.suffix}", reserved)
+
+
+def _compress_job(
+    src: Path, out_dir: Path, args: argparse.Namespace, reserved: set[Path]
+) -> FileJob:
+    dst = _output_file(src, out_dir, "_compressed", reserved)
+    level = CompressionLevel[args.level.upper()]
+    return FileJob(
+        src, compress_pdf, {"src": src, "dst": dst, "level": level, "batched": args.gs_batch}
+    )
+
+
+def _convert_job(
+    src: Path, out_dir: Path, args: argparse.Namespace, reserved: set[Path]
+) -> FileJob:
+    return FileJob(
+        src,
+        convert_pdf_to_png,
+        {
+            "pdf_path": src,
+            "output_dir": out_dir,
+            "dpi": args.dpi,
+            "engine": RenderEngine[args.engine.upper()],
+            "max_workers": args.render_jobs,
+            "fallback": args.fallback,
+            "memory_budget": args.memory_budget * 1024 * 1024 if args.memory_budget else None,
+            "image_format": ImageFormat[args.format.upper()],
+            "png_level": args.png_level,
+            "quality": args.quality,
+            "encode_workers": args.encode_jobs,
+            "subdirectory": args.subdir,
+            "write_manifest": args.manifest,
+            "pyramid": tuple(_parse_dpis(args.pyramid)),
+            "incremental": args.incremental,
+        },
+    )
+
+
+def _protect_job(
+    src: Path, out_dir: Path, args: argparse.Namespace, reserved: set[Path]
+) -> FileJob:
+    dst = _output_file(src, out_dir, "_p", reserved)
+    return FileJob(src, protect_pdf, {"src": src, "dst": dst})
+
+
+def _reorder_job(
+    src: Path, out_dir: Path, args: argparse.Namespace, reserved: set[Path]
+) -> FileJob:
+    dst = _output_file(src, out_dir, "_reordered", reserved)
+    if args.reverse:
+        new_order = list(range(get_page_count(src)))[::-1]
+    else:
+        new_order = _parse_pages(args.order) or []
+    return FileJob(src, reorder_pdf, {"src": src, "dst": dst, "new_order": new_order})
+
+
+def _rotate_job(src: Path, out_dir: Path, args: argparse.Namespace, reserved: set[Path]) -> FileJob:
+    dst = _output_file(src, out_dir, "_rotated", reserved)
+    return FileJob(
+        src,
+        rotate_pdf,
+        {
+            "src": src,
+            "dst": dst,
+            "degrees": args.degrees,
+            "page_indices": _parse_pages(args.pages),
+        },
+    )
+
+
+def _split_job(src: Path, out_dir: Path, args: argparse.Namespace, reserved: set[Path]) -> FileJob:
+    return FileJob(
+        src,
+        split_pdf,
+        {
+            "src": src,
+            "output_dir": out_dir,
+            "mode": _SPLIT_MODES[args.mode],
+            "page_ranges": args.ranges,
+            "pages_per_split": args.every,
+            "page_numbers": _parse_pages(args.pages),
+            "max_workers": args.split_jobs,
+        },
+    )
+
+
+def _unlock_job(src: Path, out_dir: Path, args: argparse.Namespace, reserved: set[Path]) -> FileJob:
+    dst = _output_file(src, out_dir, "_\u5df2\u4fee\u5fa9", reserved)
+    return FileJob(
+        src,
+        repair_pdf,
+        {"src": src, "dst": dst, "password": args.password, "batched": args.gs_batch},
+    )
+
+
+def _watermark_job(
+    src: Path, out_dir: Path, args: argparse.Namespace, reserved: set[Path]
+) -> FileJob:
+    dst = _output_file(src, out_dir, "_watermarked", reserved)
+    config = WatermarkConfig(
+        text=args.text,
+        image_path=args.image,
+        opacity=args.opacity,
+        angle=args.angle,
+        position=args.position,
+        font_size=args.font_size,
+        scale=args.scale,
+    )
+    return FileJob(src, add_watermark, {"src": src, "dst": dst, "config": config})
+
+
+_BUILDERS: dict[str, Callable[[Path, Path, argparse.Namespace, set[Path]], FileJob]] = {
+    "compress": _compress_job,
+    "convert": _convert_job,
+    "protect": _protect_job,
+    "reorder": _reorder_job,
+    "rotate": _rotate_job,
+    "split": _split_job,
+    "unlock": _unlock_job,
+    "watermark": _watermark_job,
+}
+
+
+# -- Argument parsing --
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pdf-toolbox",
+        description="PDF Toolbox. Without arguments the GUI is started.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("tools", help="list external tools and libraries with their versions")
+
+    run = commands.add_parser("run", help="run an operation headless")
+    ops = run.add_subparsers(dest="operation", required=True, metavar="OPERATION")
+
+    def add_op(name: str, help_text: str) -> argparse.ArgumentParser:
+        op = ops.add_parser(name, help=help_text)
+        op.add_argument("inputs", nargs="+", type=Path, metavar="INPUT")
+        op.add_argument("output", type=Path, metavar="OUTPUT")
+        op.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=default_max_workers(),
+            help="files processed in parallel (default: CPU count)",
+        )
+        op.add_argument(
+            "-r", "--recursive", action="store_true", help="search input directories recursively"
+        )
+        op.add_argument("-q", "--quiet", action="store_true", help="no progress on stderr")
+        op.add_argument(
+            "-v", "--verbose", action="store_true", help="print tracebacks of failed files"
+        )
+        op.add_argument("--journal", type=Path, help="append finished files to this job journal")
+        op.add_argument(
+            "--resume",
+            action="store_true",
+            help="skip files the journal lists as completed (needs --journal)",
+        )
+        op.add_argument(
+            "--cache",
+            nargs="?",
+            type=Path,
+            const=default_cache_dir(),
+            metavar="DIR",
+            help="reuse outputs of identical inputs and settings (default DIR: per-user cache)",
+        )
+        op.add_argument(
+            "--cache-size",
+            type=int,
+            default=DEFAULT_MAX_BYTES // 1024**2,
+            metavar="MB",
+            help="evict least recently used cache entries beyond this size",
+        )
+        return op
+
+    op = add_op("compress", "compress PDFs")
+    op.add_argument(
+        "--level",
+        choices=[level.name.lower() for level in CompressionLevel],
+        default="medium",
+    )
+    op.add_argument(
+        "--gs-batch",
+        action="store_true",
+        help="reuse one Ghostscript interpreter per process (faster for many small files)",
+    )
+
+    op = add_op("convert", "render pages to PNG, JPEG, WebP or TIFF")
+    op.add_argument("--dpi", type=int, default=1200)
+    op.add_argument(
+        "--engine",
+        choices=[engine.name.lower() for engine in RenderEngine],
+        default="pdftoppm",
+        help="pymupdf renders pages in-process instead of with poppler's pdftoppm",
+    )
+    op.add_argument(
+        "--render-jobs",
+        type=int,
+        metavar="N",
+        help=(
+            "processes per document; pdftoppm renders one page range per process "
+            "(default: CPU count / --jobs)"
+        ),
+    )
+    op.add_argument(
+        "--fallback",
+        action="store_true",
+        help="render with pdftoppm what --engine pymupdf cannot",
+    )
+    op.add_argument(
+        "--memory-budget",
+        type=int,
+        default=1024,
+        metavar="MB",
+        help=(
+            "bitmap memory for --engine pymupdf; larger pages are rendered in bands "
+            "(default: 1024, 0: unlimited)"
+        ),
+    )
+    op.add_argument(
+        "--format",
+        choices=[fmt.name.lower() for fmt in ImageFormat],
+        default="png",
+        help="tiff writes one multi-page file per document; webp and tiff need --engine pymupdf",
+    )
+    op.add_argument(
+        "--png-level",
+        type=int,
+        choices=range(10),
+        default=DEFAULT_PNG_LEVEL,
+        metavar="0-9",
+        help=f"PNG compression, 0 fastest, 9 smallest (default: {DEFAULT_PNG_LEVEL})",
+    )
+    op.add_argument(
+        "--quality",
+        type=int,
+        default=DEFAULT_QUALITY,
+        metavar="1-100",
+        help=f"JPEG and WebP quality (default: {DEFAULT_QUALITY})",
+    )
+    op.add_argument(
+        "--encode-jobs",
+        type=int,
+        default=2,
+        metavar="N",
+        help=(
+            "threads encoding pages while the next ones render, when --engine pymupdf "
+            "renders in one process (default: 2)"
+        ),
+    )
+    op.add_argument(
+        "--subdir",
+        action="store_true",
+        help="write each document's pages into a folder named after it",
+    )
+    op.add_argument(
+        "--manifest",
+        action="store_true",
+        help="also write <name>.manifest.json listing the file of every page",
+    )
+    op.add_argument(
+        "--pyramid",
+        metavar="DPI,...",
+        help=(
+            "also write these lower resolutions, each into a <dpi>dpi folder, downscaled "
+            "from the --dpi render of every page (needs --engine pymupdf), e.g. 300,72"
+        ),
+    )
+    op.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "render only pages missing or changed since the last run with the same settings, "
+            "as recorded in <name>.manifest.json (implies --manifest)"
+        ),
+    )
+
+    add_op("protect", "restrict copying and editing")
+
+    op = add_op("reorder", "reorder pages")
+    group = op.add_mutually_exclusive_group(required=True)
+    group.add_argument("--order", help="new page order, 1-based, e.g. 3,1,2")
+    group.add_argument("--reverse", action="store_true", help="reverse the pages")
+
+    op = add_op("rotate", "rotate pages")
+    op.add_argument("--degrees", type=int, choices=[90, 180, 270], default=90)
+    op.add_argument("--pages", help="1-based pages to rotate, e.g. 1,3 (default: all)")
+
+    op = add_op("split", "split PDFs")
+    op.add_argument("--mode", choices=list(_SPLIT_MODES), default="every")
+    op.add_argument("--ranges", default="", help='ranges for --mode range, e.g. "1-3, 5"')
+    op.add_argument("--every", type=int, default=1, help="pages per part for --mode every")
+    op.add_argument("--pages", help="1-based pages for --mode extract, e.g. 1,4")
+    op.add_argument(
+        "--split-jobs",
+        type=int,
+        metavar="N",
+        help=(
+            "processes per document writing its parts, for --mode range and every "
+            "(default: CPU count / --jobs)"
+        ),
+    )
+
+    op = add_op("unlock", "remove restrictions / repair")
+    op.add_argument("--password")
+    op.add_argument(
+        "--gs-batch",
+        action="store_true",
+        help="reuse one Ghostscript interpreter per process when Ghostscript is tried",
+    )
+
+    op = add_op("watermark", "add a text or image watermark")
+    op.add_argument("--text", default="")
+    op.add_argument("--image", type=Path)
+    op.add_argument("--opacity", type=float, default=0.3)
+    op.add_argument("--angle", type=float, default=-45.0)
+    op.add_argument("--position", choices=_POSITIONS, default="center")
+    op.add_argument("--font-size", type=int, default=48)
+    op.add_argument("--scale", type=float, default=1.0)
+
+    op = add_op(
+        "merge",
+        "merge all inputs into OUTPUT (a file), or only the pages picked as in "
+        "a.pdf[1-3,7], b.pdf[all] or c.pdf[-2:]; with --jobs above 1, large merges are "
+        "merged in groups in parallel first",
+    )
+    op.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="keep every input's own copy of identical fonts, images and other resources",
+    )
+    op.add_argument(
+        "--append",
+        action="store_true",
+        help=(
+            "append the inputs to OUTPUT, an existing PDF, as an incremental update "
+            "instead of rewriting it"
+        ),
+    )
+    return parser
+
+
+def collect_inputs(inputs: Sequence[Path], recursive: bool = False) -> list[Path]:
+    """Expand directories to their PDF files (sorted); keep files as given."""
+    files: list[Path] = []
+    for path in inputs:
+        if path.is_dir():
+            pattern = "**/*" if recursive else "*"
+            files.extend(
+                sorted(p for p in path.glob(pattern) if p.is_file() and p.suffix.lower() == ".pdf")
+            )
+        else:
+            files.append(path)
+    return files
+
+
+# -- Execution --
+
+
+def _file_entry(source: Path, outcome: Any) -> dict[str, Any]:
+    """Describe one job's outcome for the JSON summary."""
+    if isinstance(outcome, JournalRecord):
+        return {
+            "source": str(source),
+            "status": "skipped",
+            "message": "completed by an earlier run",
+            "outputs": outcome.outputs,
+        }
+    if isinstance(outcome, CacheHit):
+        return {
+            "source": str(source),
+            "status": "success",
+            "message": "reused cached output",
+            "outputs": [str(p) for p in outcome.outputs],
+        }
+    if isinstance(outcome, OperationCancelledError):
+        return {"source": str(source), "status": "cancelled", "message": "", "outputs": []}
+    if isinstance(outcome, BaseException):
+        return {
+            "source": str(source),
+            "status": "failed",
+            "message": str(outcome) or type(outcome).__name__,
+            "outputs": [],
+        }
+    outputs = list(getattr(outcome, "output_files", None) or [])
+    if getattr(outcome, "output_path", None) is not None:
+        outputs = [outcome.output_path]
+    if getattr(outcome, "manifest_file", None) is not None:
+        outputs.append(outcome.manifest_file)
+    return {
+        "source": str(source),
+        "status": "success" if outcome.success else "failed",
+        "message": outcome.message,
+        "outputs": [str(p) for p in outputs] if outcome.success else [],
+    }
+
+
+def _iter_outcomes(
+    jobs: Iterator[FileJob], max_workers: int, cancel: CancelToken
+) -> Iterator[tuple[FileJob, Any]]:
+    if max_workers > 1:
+        yield from iter_parallel(jobs, max_workers, cancel)
+        return
+    for job in jobs:
+        if cancel.is_cancelled:
+            return
+        try:
+            yield job, job.run()
+        except Exception as exc:
+            yield job, exc
+
+
+def run_operation(args: argparse.Namespace, log: Callable[[str], None]) -> dict[str, Any]:
+    """Run one `run` command and return its summary."""
+    files = collect_inputs(args.inputs, args.recursive)
+    journal = JobJournal(args.journal) if args.journal is not None else None
+    cache = ResultCache(args.cache, args.cache_size * 1024**2) if args.cache is not None else None
+    cancel = CancelToken()
+    entries: list[dict[str, Any]] = []
+    started = time.perf_counter()
+    interrupted = False
+    max_workers = 1
+
+    try:
+        if args.operation == "merge":
+            output = args.output / "merged.pdf" if args.output.is_dir() else args.output
+            output.parent.mkdir(parents=True, exist_ok=True)
+            sources = [parse_merge_input(str(path)) for path in files]
+            files = [path for path, _spec in sources]
+            pages = [spec for _path, spec in sources]
+            if args.append:
+                job = FileJob(
+                    output,
+                    append_pdfs,
+                    {
+                        "archive": output,
+                        "input_files": files,
+                        "cancel": cancel,
+                        "deduplicate": not args.no_dedup,
+                        "pages": pages,
+                    },
+                )
+            else:
+                job = FileJob(
+                    output,
+                    merge_pdfs_tree,
+                    {
+                        "input_files": files,
+                        "output_path": output,
+                        "max_workers": args.jobs,
+                        "cancel": cancel,
+                        "deduplicate": not args.no_dedup,
+                        "on_stage": lambda stage, stages: log(f"merge stage {stage}/{stages}"),
+                        "pages": pages,
+                    },
+                )
+            jobs = iter([job])
+        else:
+            args.output.mkdir(parents=True, exist_ok=True)
+            max_workers = max(1, min(args.jobs, len(files)))
+            if args.operation == "convert" and args.render_jobs is None:
+                # Cores not used for separate documents render pages of each one.
+                args.render_jobs = max(1, default_max_workers() // max_workers)
+            if args.operation == "split" and args.split_jobs is None:
+                # Likewise, they write the parts of each document.
+                args.split_jobs = max(1, default_max_workers() // max_workers)
+            jobs = _iter_jobs(files, args, cancel, journal, cache)
+
+        if args.operation != "merge" or files:
+            for job, outcome in _iter_outcomes(jobs, max_workers, cancel):
+                entry = _file_entry(job.source, outcome)
+                entries.append(entry)
+                if job.func is not None:
+                    outputs = [Path(p) for p in entry["outputs"]]
+                    if journal is not None:
+                        journal.record(job, JobStatus(entry["status"]), outputs, entry["message"])
+                    if cache is not None and entry["status"] == "success":
+                        cache.store(job, outputs)
+                mark = "\u2717" if entry["status"] in ("failed", "cancelled") else "\u2713"
+                log(f"{mark} {job.source.name} \u2192 {entry['message'] or entry['status']}")
+                for item in getattr(outcome, "inputs", ()):
+                    # Inputs a merge had to leave out.
+                    if not item.merged:
+                        entries.append(
+                            {
+                                "source": str(item.source),
+                                "status": "failed",
+                                "message": item.error,
+                                "outputs": [],
+                            }
+                        )
+                        log(f"\u2717 {item.source.name} \u2192 {item.error}")
+                if (
+                    args.verbose
+                    and isinstance(outcome, BaseException)
+                    and not isinstance(outcome, OperationCancelledError)
+                ):
+                    log("".join(traceback.format_exception(outcome)).rstrip())
+    except KeyboardInterrupt:
+        cancel.cancel()
+        interrupted = True
+    finally:
+        if journal is not None:
+            journal.close()
+        if cache is not None:
+            cache.evict()
+
+    counts = {
+        status: sum(1 for e in entries if e["status"] == status)
+        for status in ("success", "skipped", "failed", "cancelled")
+    }
+    return {
+        "operation": args.operation,
+        "version": __version__,
+        "jobs": max_workers,
+        "total": 1 if args.operation == "merge" else len(files),
+        "succeeded": counts["success"],
+        "skipped": counts["skipped"],
+        "failed": counts["failed"],
+        "cancelled": counts["cancelled"],
+        "interrupted": interrupted,
+        "cache": (
+            {"hits": cache.stats.hits, "misses": cache.stats.misses} if cache is not None else None
+        ),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "files": entries,
+    }
+
+
+def _iter_jobs(
+    files: list[Path],
+    args: argparse.Namespace,
+    cancel: CancelToken,
+    journal: JobJournal | None = None,
+    cache: ResultCache | None = None,
+) -> Iterator[FileJob]:
+    builder = _BUILDERS[args.operation]
+    reserved: set[Path] = set()
+    for src in files:
+        try:
+            job = builder(src, args.output, args, reserved)
+        except Exception as exc:
+            yield FileJob.failed(src, exc)
+            continue
+        record = journal.lookup(job) if journal is not None and args.resume else None
+        if record is not None:
+            yield FileJob.completed(src, record)
+            continue
+        if job.output is not None:
+            reserved.add(job.output)
+        hit = cache.fetch(job) if cache is not None else None
+        if hit is not None:
+            if journal is not None:
+                journal.record(job, JobStatus.SUCCESS, hit.outputs, "reused cached output")
+            yield FileJob.completed(src, hit)
+            continue
+        job.kwargs["cancel"] = cancel
+        yield job
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Console entry point; returns the exit status."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv:
+        from pdf_toolbox.app import main as gui_main
+
+        gui_main()
+        return EXIT_OK
+
+    multiprocessing.freeze_support()
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "tools":
+        tools = [dataclasses.asdict(c) for c in get_registry().snapshot()]
+        json.dump(tools, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return EXIT_OK
+    if args.resume and args.journal is None:
+        parser.error("--resume needs --journal")
+    if args.operation == "merge":
+        try:
+            for path in args.inputs:
+                parse_merge_input(str(path))
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    def log(message: str) -> None:
+        if not args.quiet:
+            print(message, file=sys.stderr, flush=True)
+
+    summary = run_operation(args, log)
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+    if summary["interrupted"]:
+        return EXIT_INTERRUPTED
+    done = summary["succeeded"] + summary["skipped"]
+    ok = summary["failed"] == 0 and summary["cancelled"] == 0 and done > 0
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Process-pool execution of per-file core operations.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pdf_toolbox.core.cancel import install_process_token
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from concurrent.futures import Future
+
+    from pdf_toolbox.core.cancel import CancelToken
+
+# How long to block on the oldest in-flight job before re-checking cancellation.
+_POLL_INTERVAL = 0.1
+
+# Keyword arguments naming a job's input or output location, carrying
+# callbacks or choosing how it runs, rather than settings of the operation.
+_NON_PARAM_KEYS = frozenset(
+    {
+        "src",
+        "pdf_path",
+        "input_files",
+        "archive",
+        "dst",
+        "output_dir",
+        "output_path",
+        "cancel",
+        "on_progress",
+        "on_attempt",
+        "on_page",
+        "on_stage",
+        "batched",
+        "max_workers",
+        "encode_workers",
+    }
+)
+
+
+@dataclass
+class FileJob:
+    """
+    A picklable unit of per-file work: a module-level core function and its
+    keyword arguments. A job without a function is never executed: its error
+    (a job that could not be built) or its result (work found to be done
+    already) is reported as its outcome instead.
+    """
+
+    source: Path
+    func: Callable[..., Any] | None = None
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    error: BaseException | None = None
+    result: Any = None
+
+    @classmethod
+    def failed(cls, source: Path, error: BaseException) -> FileJob:
+        """Create a job that could not be built."""
+        return cls(source, error=error)
+
+    @classmethod
+    def completed(cls, source: Path, result: Any) -> FileJob:
+        """Create a job whose outcome is already known."""
+        return cls(source, result=result)
+
+    @property
+    def output(self) -> Path | None:
+        """The destination file of the job, if the core function takes one."""
+        return self.kwargs.get("dst")
+
+    @property
+    def output_location(self) -> Path | None:
+        """Directory the job writes into."""
+        if self.output is not None:
+            return self.output.parent
+        return self.kwargs.get("output_dir")
+
+    @property
+    def operation(self) -> str:
+        """Qualified name of the core function, e.g. 'pdf_toolbox.core.rotate.rotate_pdf'."""
+        if self.func is None:
+            return ""
+        return f"{self.func.__module__}.{self.func.__qualname__}"
+
+    def params(self) -> dict[str, Any]:
+        """The job's settings as JSON-compatible values (locations and callbacks left out)."""
+        return {
+            key: _plain(value)
+            for key, value in sorted(self.kwargs.items())
+            if key not in _NON_PARAM_KEYS
+        }
+
+    def setting_files(self) -> list[Path]:
+        """Existing files the job's settings name (a watermark image, say), in a stable order."""
+        files: list[Path] = []
+        for key, value in sorted(self.kwargs.items()):
+            if key not in _NON_PARAM_KEYS:
+                files.extend(_paths(value))
+        return [path for path in files if path.is_file()]
+
+    def run(self) -> Any:
+        """Execute the job in the current process."""
+        if self.error is not None:
+            raise self.error
+        if self.func is None:
+            return self.result
+        return self.func(**self.kwargs)
+
+
+def _plain(value: Any) -> Any:
+    """Convert a job argument to a JSON-compatible value."""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, Path):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            "__type__": type(value).__name__,
+            **{f.name: _plain(getattr(value, f.name)) for f in dataclasses.fields(value)},
+        }
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _paths(value: Any) -> Iterator[Path]:
+    """Paths in a job argument, through dataclasses, dicts and sequences."""
+    if isinstance(value, Path):
+        yield value
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        for f in dataclasses.fields(value):
+            yield from _paths(getattr(value, f.name))
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _paths(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _paths(item)
+
+
+def default_max_workers() -> int:
+    """Number of worker processes to use when none is given."""
+    return os.cpu_count() or 1
+
+
+def iter_parallel(
+    jobs: Iterable[FileJob],
+    max_workers: int,
+    cancel: CancelToken | None = None,
+) -> Iterator[tuple[FileJob, Any]]:
+    """
+    Run jobs on a process pool and yield (job, outcome) in submission order.
+
+    outcome is the core function's return value, or the exception it raised.
+    jobs is consumed lazily with at most 2 * max_workers jobs in flight, so
+    once cancel is triggered no further jobs are scheduled. Jobs that had not
+    started are dropped; running jobs see the same token (a CancelToken in a
+    job's kwargs resolves to it) and are still yielded, typically with
+    OperationCancelledError as their outcome.
+    """
+    max_workers = max(1, max_workers)
+    window = 2 * max_workers
+    job_iter = iter(jobs)
+    pending: deque[tuple[FileJob, Future | None]] = deque()
+    exhausted = False
+
+    # "spawn" keeps children free of the parent's threads (Qt, the GUI event loop).
+    ctx = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=ctx,
+        initializer=install_process_token if cancel is not None else None,
+        initargs=(cancel.event,) if cancel is not None else (),
+    )
+    try:
+        while True:
+            cancelled = cancel is not None and cancel.is_cancelled
+            while not cancelled and not exhausted and len(pending) < window:
+                job = next(job_iter, None)
+                if job is None:
+                    exhausted = True
+                    break
+                if job.func is None:
+                    pending.append((job, None))
+                else:
+                    pending.append((job, executor.submit(job.func, **job.kwargs)))
+
+            if cancelled:
+                for _, future in pending:
+                    if future is not None:
+                        future.cancel()
+
+            if not pending:
+                return
+
+            job, future = pending[0]
+            if future is None:
+                pending.popleft()
+                yield job, job.error if job.error is not None else job.result
+                continue
+            if future.cancelled():
+                pending.popleft()
+                continue
+
+            done, _ = wait([future], timeout=_POLL_INTERVAL)
+            if not done:
+                continue
+            pending.popleft()
+            exc = future.exception()
+            yield job, exc if exc is not None else future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,254 @@
+"""
+Content-addressed cache of operation outputs.
+
+An entry is keyed by the SHA-256 of the input file's content, the operation
+and its settings (with the content of files they name, such as a watermark
+image), so re-running the same settings over an unchanged file
+(under any name or path) reuses the earlier output instead of processing it
+again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pdf_toolbox.core.journal import params_digest
+from pdf_toolbox.core.utils import app_data_dir
+
+if TYPE_CHECKING:
+    from pdf_toolbox.core.batch import FileJob
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+_HASH_CHUNK = 1024 * 1024
+_META_NAME = "entry.json"
+
+
+@dataclass
+class CacheHit:
+    """Outputs materialized from the cache for one job."""
+
+    outputs: list[Path]
+
+
+@dataclass
+class CacheStats:
+    """Lookups of one cache instance."""
+
+    hits: int = 0
+    misses: int = 0
+    evicted: int = 0
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _materialize(cached: Path, dst: Path) -> None:
+    """Hardlink cached to dst, copying where links are unsupported (other volume)."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(cached, dst)
+    except OSError:
+        shutil.copyfile(cached, dst)
+
+
+class ResultCache:
+    """
+    Directory of cached outputs with size-based LRU eviction.
+
+    Jobs writing one dst file reuse the output under whatever dst the new
+    job was given. Jobs writing into output_dir name their files after the
+    input, so for them the input's file name is part of the key and the
+    outputs are restored under their original names.
+
+    Outputs are hardlinked in both directions where possible, so a hit costs
+    no copying. Each entry remembers the size and modification time of its
+    files; an output edited in place (which also changes the shared cache
+    file) makes the entry a miss and it is dropped.
+
+    Entries are written to a temporary directory and renamed into place, so
+    several processes can share a cache and a crash leaves no half entry.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._root = root
+        self._max_bytes = max_bytes
+        self.stats = CacheStats()
+        # A miss hashes the input again when its output is stored.
+        self._digests: dict[tuple[str, int, int], str] = {}
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def key(self, job: FileJob) -> str | None:
+        """Cache key of job, or None if its outputs cannot be cached."""
+        if job.func is None or (job.output is None and "output_dir" not in job.kwargs):
+            return None
+        try:
+            content = self._content_digest(job.source)
+            # A file replaced under the same name (a new logo) changes the output.
+            setting_files = [self._content_digest(path) for path in job.setting_files()]
+        except OSError:
+            return None
+        parts = [content, job.operation, params_digest(job), *setting_files]
+        if job.output is None:
+            parts.append(job.source.stem)
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def fetch(self, job: FileJob) -> CacheHit | None:
+        """Write the cached outputs of job to its destination; None on a miss."""
+        key = self.key(job)
+        if key is None:
+            return None
+        entry = self._entry_dir(key)
+        meta = self._read_meta(entry)
+        if meta is None or not self._intact(entry, meta):
+            if meta is not None:
+                shutil.rmtree(entry, ignore_errors=True)
+            self.stats.misses += 1
+            return None
+
+        names = [name for name, _, _ in meta["files"]]
+        if job.output is not None:
+            targets = [job.output]
+        else:
+            out_dir = job.output_location or job.source.parent
+            targets = [out_dir / name for name in names]
+        try:
+            for name, target in zip(names, targets, strict=True):
+                _materialize(entry / name, target)
+        except OSError:
+            # Evicted by another process in the meantime.
+            self.stats.misses += 1
+            return None
+        os.utime(entry / _META_NAME)
+        self.stats.hits += 1
+        return CacheHit(targets)
+
+    def store(self, job: FileJob, outputs: list[Path]) -> None:
+        """Add the outputs of a successful job."""
+        key = self.key(job)
+        if key is None or not outputs:
+            return
+        if job.output is not None and len(outputs) != 1:
+            return
+        entry = self._entry_dir(key)
+        if entry.exists():
+            return
+        base = job.output_location or job.source.parent
+        tmp = self._root / "tmp" / uuid.uuid4().hex
+        try:
+            tmp.mkdir(parents=True)
+            files = []
+            for output in outputs:
+                # Outputs in a subfolder of the output directory keep their folder.
+                name = (
+                    output.relative_to(base).as_posix()
+                    if job.output is None and output.is_relative_to(base)
+                    else output.name
+                )
+                cached = tmp / name
+                _materialize(output, cached)
+                stat = cached.stat()
+                files.append([name, stat.st_size, stat.st_mtime_ns])
+            (tmp / _META_NAME).write_text(
+                json.dumps({"files": files, "created": time.time()}),
+                encoding="utf-8",
+            )
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            os.rename(tmp, entry)
+        except OSError:
+            # Output vanished, disk full, or another process stored the same entry.
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def size(self) -> int:
+        """Total bytes held by the cache."""
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits; returns the count removed."""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, entry, size in entries:
+            if total <= self._max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        self.stats.evicted += removed
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        shutil.rmtree(self._root, ignore_errors=True)
+
+    def _content_digest(self, path: Path) -> str:
+        stat = path.stat()
+        ident = (str(path), stat.st_size, stat.st_mtime_ns)
+        if ident not in self._digests:
+            self._digests[ident] = file_digest(path)
+        return self._digests[ident]
+
+    def _entry_dir(self, key: str) -> Path:
+        return self._root / "objects" / key[:2] / key
+
+    @staticmethod
+    def _read_meta(entry: Path) -> dict | None:
+        try:
+            text = (entry / _META_NAME).read_text(encoding="utf-8")
+        except OSError:
+            return None
+        try:
+            meta = json.loads(text)
+        except ValueError:
+            return None
+        return meta if isinstance(meta, dict) and meta.get("files") else None
+
+    @staticmethod
+    def _intact(entry: Path, meta: dict) -> bool:
+        for name, size, mtime_ns in meta["files"]:
+            try:
+                stat = (entry / name).stat()
+            except OSError:
+                return False
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                return False
+        return True
+
+    def _entries(self) -> list[tuple[int, Path, int]]:
+        """(last use in ns, directory, bytes) of every entry."""
+        objects = self._root / "objects"
+        if not objects.is_dir():
+            return []
+        entries = []
+        for bucket in objects.iterdir():
+            for entry in bucket.iterdir():
+                try:
+                    used = (entry / _META_NAME).stat().st_mtime_ns
+                    size = sum(p.stat().st_size for p in entry.rglob("*") if p.is_file())
+                except OSError:
+                    continue
+                entries.append((used, entry, size))
+        return entries
+
+
+def default_cache_dir() -> Path:
+    """Shared result cache of the GUI and the command line."""
+    return app_data_dir() / "cache"
@@ -0,0 +1,159 @@
+"""
+Cooperative cancellation for core operations and the external tools they run.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import subprocess
+import sys
+import threading
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from pathlib import Path
+
+# How often a running child process is checked for cancellation (seconds).
+_POLL_INTERVAL = 0.05
+# How long a terminated child gets to exit before it is killed (seconds).
+_TERMINATE_GRACE = 0.2
+
+
+class OperationCancelledError(Exception):
+    """Raised inside a core operation once its CancelToken has been triggered."""
+
+
+class CancelToken:
+    """
+    Cancellation flag shared between the caller and a running operation.
+
+    The flag is backed by a multiprocessing event, so a token handed to
+    core.batch.iter_parallel also reaches jobs running in worker processes:
+    there, a pickled token resolves to the pool's shared token.
+    """
+
+    def __init__(self) -> None:
+        self._event = multiprocessing.get_context("spawn").Event()
+
+    @classmethod
+    def _from_event(cls, event: object) -> CancelToken:
+        token = cls.__new__(cls)
+        token._event = event
+        return token
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise OperationCancelledError if cancellation was requested."""
+        if self._event.is_set():
+            raise OperationCancelledError
+
+    def __reduce__(self) -> tuple:
+        return (_inherited_token, ())
+
+    @property
+    def event(self) -> object:
+        """The underlying event, for handing to a process-pool initializer."""
+        return self._event
+
+
+_process_token: CancelToken | None = None
+
+
+def _inherited_token() -> CancelToken:
+    """Unpickle a token as the one this worker process inherited (or a fresh one)."""
+    global _process_token
+    if _process_token is None:
+        _process_token = CancelToken()
+    return _process_token
+
+
+def install_process_token(event: object) -> None:
+    """Process-pool initializer: adopt the parent's cancellation event."""
+    global _process_token
+    _process_token = CancelToken._from_event(event)
+
+
+def check_cancelled(cancel: CancelToken | None) -> None:
+    """Raise OperationCancelledError if cancel is set; no-op for None."""
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+
+
+def run_process(
+    cmd: Sequence[str],
+    cancel: CancelToken | None = None,
+    on_output: Callable[[str], None] | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """
+    subprocess.run() replacement for external tools (Ghostscript, pdftoppm).
+
+    Output is captured as text; on_output, if given, also receives each line
+    of stdout and stderr as it is printed (from a reader thread). If cancel is
+    triggered while the child runs, it is terminated (then killed) and
+    OperationCancelledError is raised.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+    )
+    stdout: list[str] = []
+    stderr: list[str] = []
+    readers = [
+        threading.Thread(target=_pump, args=(proc.stdout, stdout, on_output), daemon=True),
+        threading.Thread(target=_pump, args=(proc.stderr, stderr, on_output), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        while True:
+            try:
+                proc.wait(timeout=_POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel is None or not cancel.is_cancelled:
+                    continue
+            stop_process(proc)
+            raise OperationCancelledError
+    finally:
+        for reader in readers:
+            reader.join()
+
+    return subprocess.CompletedProcess(cmd, proc.returncode, "".join(stdout), "".join(stderr))
+
+
+def stop_process(proc: subprocess.Popen) -> None:
+    """Terminate a child process, killing it if it does not exit promptly."""
+    proc.terminate()
+    try:
+        proc.wait(timeout=_TERMINATE_GRACE)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def _pump(stream: IO[str], sink: list[str], on_output: Callable[[str], None] | None) -> None:
+    """Reader thread: collect a child's output stream line by line."""
+    with stream:
+        for line in stream:
+            sink.append(line)
+            if on_output is not None:
+                on_output(line.rstrip("\n"))
+
+
+def remove_partial(*paths: Path) -> None:
+    """Delete outputs left behind by an interrupted operation."""
+    for path in paths:
+        path.unlink(missing_ok=True)
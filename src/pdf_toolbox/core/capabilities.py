@@ -0,0 +1,166 @@
+"""
+Process-wide registry of the external tools and libraries the core modules use.
+
+Each capability is probed once, on first use, and the result is kept for the
+life of the process; refresh() probes again, e.g. after installing a tool.
+"""
+
+from __future__ import annotations
+
+import importlib.metadata
+import importlib.util
+import shutil
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+GHOSTSCRIPT = "ghostscript"
+PDFTOPPM = "pdftoppm"
+PYMUPDF = "pymupdf"
+PYPDF2 = "pypdf2"
+PIKEPDF = "pikepdf"
+
+_GS_COMMANDS = ("gs", "gswin64c", "gswin32c", "ghostscript")
+_PROBE_TIMEOUT = 10
+
+
+@dataclass(frozen=True)
+class Capability:
+    """Availability of one tool or library."""
+
+    name: str
+    available: bool
+    version: str = ""
+    command: str | None = None  # executable of an external tool
+
+
+def _run_version(cmd: list[str]) -> subprocess.CompletedProcess | None:
+    try:
+        return subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=_PROBE_TIMEOUT,
+            check=False,
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+        )
+    except OSError, subprocess.TimeoutExpired:
+        return None
+
+
+def _probe_ghostscript() -> Capability:
+    for cmd in _GS_COMMANDS:
+        if shutil.which(cmd) is None:
+            continue
+        result = _run_version([cmd, "--version"])
+        if result is not None and result.returncode == 0:
+            return Capability(GHOSTSCRIPT, True, result.stdout.strip(), cmd)
+    return Capability(GHOSTSCRIPT, False)
+
+
+def _probe_pdftoppm() -> Capability:
+    if shutil.which("pdftoppm") is None:
+        return Capability(PDFTOPPM, False)
+    result = _run_version(["pdftoppm", "-v"])
+    if result is None:
+        return Capability(PDFTOPPM, False)
+    # "pdftoppm version 24.02.0" on stderr; the exit status varies by release.
+    first_line = (result.stderr or result.stdout).strip().splitlines()[:1]
+    version = first_line[0].rsplit(" ", 1)[-1] if first_line else ""
+    return Capability(PDFTOPPM, True, version, "pdftoppm")
+
+
+def _library_probe(name: str, module: str, distribution: str) -> Callable[[], Capability]:
+    """Probe an importable library without importing it."""
+
+    def probe() -> Capability:
+        if importlib.util.find_spec(module) is None:
+            return Capability(name, False)
+        try:
+            version = importlib.metadata.version(distribution)
+        except importlib.metadata.PackageNotFoundError:
+            version = ""
+        return Capability(name, True, version)
+
+    return probe
+
+
+_PROBES: dict[str, Callable[[], Capability]] = {
+    GHOSTSCRIPT: _probe_ghostscript,
+    PDFTOPPM: _probe_pdftoppm,
+    PYMUPDF: _library_probe(PYMUPDF, "fitz", "PyMuPDF"),
+    PYPDF2: _library_probe(PYPDF2, "PyPDF2", "PyPDF2"),
+    PIKEPDF: _library_probe(PIKEPDF, "pikepdf", "pikepdf"),
+}
+
+
+class CapabilityRegistry:
+    """
+    Thread-safe cache of probed capabilities. Worker processes of a pool
+    have their own registry, so each probes at most once per capability.
+    """
+
+    def __init__(self, probes: dict[str, Callable[[], Capability]] | None = None) -> None:
+        self._probes = dict(_PROBES if probes is None else probes)
+        self._cache: dict[str, Capability] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._probes)
+
+    def get(self, name: str) -> Capability:
+        """The capability called name, probing it on first use. Raises KeyError if unknown."""
+        with self._lock:
+            capability = self._cache.get(name)
+            if capability is None:
+                capability = self._probes[name]()
+                self._cache[name] = capability
+            return capability
+
+    def available(self, name: str) -> bool:
+        return self.get(name).available
+
+    def command(self, name: str) -> str | None:
+        """Executable of an external tool, or None if it is not installed."""
+        return self.get(name).command
+
+    def refresh(self, name: str | None = None) -> None:
+        """Forget probed results (of one capability, or all) so they are probed again."""
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(name, None)
+
+    def snapshot(self) -> list[Capability]:
+        """Every capability, probing those not yet known."""
+        return [self.get(name) for name in self._probes]
+
+
+_registry: CapabilityRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> CapabilityRegistry:
+    """Return the process-wide registry, creating it on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = CapabilityRegistry()
+        return _registry
+
+
+def ghostscript_command() -> str | None:
+    """The Ghostscript executable, or None if it is not installed."""
+    return get_registry().command(GHOSTSCRIPT)
+
+
+def pdftoppm_command() -> str | None:
+    """The pdftoppm executable, or None if poppler-utils is not installed."""
+    return get_registry().command(PDFTOPPM)
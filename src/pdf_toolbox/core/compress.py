@@ -4,11 +4,24 @@ Compress PDF by reducing image resolution and removing metadata.
 
 from __future__ import annotations
 
-import subprocess
-import sys
+import re
 from dataclasses import dataclass
 from enum import Enum, auto
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pdf_toolbox.core.cancel import (
+    CancelToken,
+    OperationCancelledError,
+    check_cancelled,
+    remove_partial,
+    run_process,
+)
+from pdf_toolbox.core.capabilities import ghostscript_command
+from pdf_toolbox.core.ghostscript import session_for
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 
 class CompressionLevel(Enum):
@@ -28,6 +41,10 @@ _GS_SETTINGS = {
     CompressionLevel.MAXIMUM: "/screen",
 }
 
+# Ghostscript console output (without -dQUIET) used for page progress
+_GS_PAGE_RANGE = re.compile(r"Processing pages \d+ through (\d+)\.")
+_GS_PAGE = re.compile(r"Page (\d+)$")
+
 
 @dataclass
 class CompressResult:
@@ -46,41 +63,39 @@ class CompressResult:
         return (1 - self.compressed_size / self.original_size) * 100
 
 
-def _find_ghostscript() -> str | None:
-    """Find the Ghostscript command."""
-    for cmd in ("gs", "gswin64c", "gswin32c", "ghostscript"):
-        try:
-            subprocess.run(
-                [cmd, "--version"],
-                capture_output=True,
-                check=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
-            )
-            return cmd
-        except FileNotFoundError, subprocess.CalledProcessError:
-            continue
-    return None
-
-
 def compress_pdf(
     src: Path,
     dst: Path,
     level: CompressionLevel = CompressionLevel.MEDIUM,
     remove_metadata: bool = True,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+    batched: bool = False,
 ) -> CompressResult:
     """
     Compress PDF using Ghostscript.
     Falls back to PyMuPDF if Ghostscript is not available.
+    on_progress(done, total) follows Ghostscript page by page; the PyMuPDF
+    fallback reports a single step.
+    With batched, the file is handed to this thread's long-lived Ghostscript
+    session (core.ghostscript) instead of a new gs process, which pays off
+    for many small files.
+    Raises OperationCancelledError (leaving no partial dst) if cancel is triggered.
     """
     original_size = src.stat().st_size
 
     # Try Ghostscript first
-    gs_cmd = _find_ghostscript()
+    gs_cmd = ghostscript_command()
     if gs_cmd:
-        return _compress_with_gs(src, dst, gs_cmd, level, original_size)
+        return _compress_with_gs(
+            src, dst, gs_cmd, level, original_size, on_progress, cancel, batched
+        )
 
     # Fallback to PyMuPDF
-    return _compress_with_pymupdf(src, dst, level, original_size, remove_metadata)
+    result = _compress_with_pymupdf(src, dst, level, original_size, remove_metadata, cancel)
+    if on_progress:
+        on_progress(1, 1)
+    return result
 
 
 def _compress_with_gs(
@@ -89,29 +104,45 @@ def _compress_with_gs(
     gs_cmd: str,
     level: CompressionLevel,
     original_size: int,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+    batched: bool = False,
 ) -> CompressResult:
     """Compress using Ghostscript."""
-    setting = _GS_SETTINGS[level]
-    cmd = [
-        gs_cmd,
-        "-sDEVICE=pdfwrite",
-        "-dCompatibilityLevel=1.4",
-        f"-dPDFSETTINGS={setting}",
-        "-dNOPAUSE",
-        "-dQUIET",
-        "-dBATCH",
-        f"-sOutputFile={dst}",
-        str(src),
-    ]
-
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
-    )
+    device_args = ["-dCompatibilityLevel=1.4", f"-dPDFSETTINGS={_GS_SETTINGS[level]}"]
+    page_total = 0
+
+    def on_output(line: str) -> None:
+        nonlocal page_total
+        if match := _GS_PAGE_RANGE.match(line):
+            page_total = int(match.group(1))
+        elif (match := _GS_PAGE.match(line)) and page_total:
+            on_progress(int(match.group(1)), page_total)
+
+    if batched:
+        session = session_for(gs_cmd, device_args, src, dst)
+        outcome = session.convert(src, dst, on_output if on_progress else None, cancel)
+        ok, errors = outcome.success, outcome.output
+    else:
+        cmd = [
+            gs_cmd,
+            "-sDEVICE=pdfwrite",
+            *device_args,
+            "-dNOPAUSE",
+            "-dBATCH",
+            f"-sOutputFile={dst}",
+            str(src),
+        ]
+        if on_progress is None:
+            cmd.insert(-2, "-dQUIET")
+        try:
+            result = run_process(cmd, cancel, on_output if on_progress else None)
+        except OperationCancelledError:
+            remove_partial(dst)
+            raise
+        ok, errors = result.returncode == 0, result.stderr
 
-    if result.returncode == 0 and dst.exists():
+    if ok and dst.exists():
         compressed_size = dst.stat().st_size
         cr = CompressResult(
             True,
@@ -124,39 +155,40 @@ def _compress_with_gs(
         return cr
 
     return CompressResult(
-        False, f"\u58d3\u7e2e\u5931\u6557: {result.stderr.strip()}", None, original_size, 0
+        False, f"\u58d3\u7e2e\u5931\u6557: {errors.strip()}", None, original_size, 0
     )
 
 
+def pymupdf_save_options(level: CompressionLevel) -> dict[str, object]:
+    """fitz.Document.save() keyword arguments for a compression level."""
+    garbage = {
+        CompressionLevel.LOW: 1,
+        CompressionLevel.MEDIUM: 2,
+        CompressionLevel.HIGH: 3,
+        CompressionLevel.MAXIMUM: 4,
+    }[level]
+    return {"garbage": garbage, "deflate": True, "clean": True}
+
+
 def _compress_with_pymupdf(
     src: Path,
     dst: Path,
     level: CompressionLevel,
     original_size: int,
     remove_metadata: bool,
+    cancel: CancelToken | None = None,
 ) -> CompressResult:
     """Compress using PyMuPDF."""
     import fitz
 
+    check_cancelled(cancel)
     doc = fitz.open(str(src))
     try:
         if remove_metadata:
             doc.set_metadata({})
 
-        # Save with compression options
-        garbage = {
-            CompressionLevel.LOW: 1,
-            CompressionLevel.MEDIUM: 2,
-            CompressionLevel.HIGH: 3,
-            CompressionLevel.MAXIMUM: 4,
-        }[level]
-
-        doc.save(
-            str(dst),
-            garbage=garbage,
-            deflate=True,
-            clean=True,
-        )
+        check_cancelled(cancel)
+        doc.save(str(dst), **pymupdf_save_options(level))
     finally:
         doc.close()
 
@@ -1,46 +1,491 @@
 """
-PDF to PNG conversion via pdftoppm (poppler-utils).
+PDF to image conversion via pdftoppm (poppler-utils) or PyMuPDF.
 """
 
 from __future__ import annotations
 
-import subprocess
-import sys
+import json
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from enum import Enum, auto
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import fitz  # PyMuPDF
+
+from pdf_toolbox.core.batch import FileJob, iter_parallel
+from pdf_toolbox.core.cache import file_digest
+from pdf_toolbox.core.cancel import (
+    CancelToken,
+    OperationCancelledError,
+    check_cancelled,
+    remove_partial,
+    run_process,
+)
+from pdf_toolbox.core.capabilities import pdftoppm_command
+from pdf_toolbox.core.png import PngWriter
+from pdf_toolbox.core.raster import (
+    DEFAULT_ENCODING,
+    DEFAULT_PNG_LEVEL,
+    DEFAULT_QUALITY,
+    Encoding,
+    ImageFormat,
+    PageImage,
+    TiffWriter,
+    encode_page,
+)
+
+if TYPE_CHECKING:
+    import subprocess
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+
+
+_PDFTOPPM_PROGRESS = re.compile(r"(\d+) (\d+) (.+)")
+MANIFEST_SUFFIX = ".manifest.json"
+# Page ranges per pdftoppm process allowed to run at once; smaller ranges
+# even out documents where some pages take much longer than others.
+_SHARDS_PER_WORKER = 2
+# pdftoppm output options by format; other formats need PyMuPDF.
+_PDFTOPPM_FORMATS = {ImageFormat.PNG: ["-png"], ImageFormat.JPEG: ["-jpeg"]}
+# File systems stamp modification times from a coarse clock that can lag
+# time.time() by a tick, so a page written just after a run started may look
+# older than the run (seconds).
+_MTIME_SLACK = 0.1
+
+
+class RenderEngine(Enum):
+    """Page renderers for PDF to image conversion."""
+
+    PDFTOPPM = auto()  # poppler, one process per document or per page range
+    PYMUPDF = auto()  # in-process, pages spread over a process pool
 
 
 @dataclass
 class ConvertResult:
-    """Result of a PDF to PNG conversion."""
+    """
+    Result of a PDF to image conversion. pages maps each converted page
+    (1-based) to the file holding it, and levels does the same for every
+    lower pyramid resolution by DPI; output_files lists all those files,
+    pages first, in page order. manifest_file is the JSON copy of pages and
+    levels, if one was written.
+    """
 
     success: bool
     message: str
     output_files: list[Path] = field(default_factory=list)
+    pages: dict[int, Path] = field(default_factory=dict)
+    levels: dict[int, dict[int, Path]] = field(default_factory=dict)
+    manifest_file: Path | None = None
+
+
+def _result(
+    success: bool,
+    message: str,
+    pages: dict[int, Path],
+    levels: dict[int, dict[int, Path]] | None = None,
+) -> ConvertResult:
+    ordered = dict(sorted(pages.items()))
+    levels = {dpi: dict(sorted(files.items())) for dpi, files in (levels or {}).items()}
+    files = [*ordered.values()]
+    for level in levels.values():
+        files.extend(level.values())
+    return ConvertResult(success, message, list(dict.fromkeys(files)), ordered, levels)
+
+
+def level_dir_name(dpi: int) -> str:
+    """Folder of the output directory holding a lower pyramid resolution: "150dpi"."""
+    return f"{dpi}dpi"
 
 
 def find_pdftoppm() -> str | None:
-    """Return the pdftoppm command name if available, else None."""
-    try:
-        subprocess.run(
-            ["pdftoppm", "-v"],
-            capture_output=True,
-            check=False,
-            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
-        )
-        return "pdftoppm"
-    except FileNotFoundError:
-        return None
+    """Return the pdftoppm command name if available, else None (probed once per process)."""
+    return pdftoppm_command()
+
+
+def page_file_name(stem: str, page: int, page_count: int, extension: str = "png") -> str:
+    """
+    The name pdftoppm gives a page: "<stem>-<page>.<extension>", the 1-based
+    page number zero-padded to the digits of page_count ("doc-007.png" of 400).
+    """
+    return f"{stem}-{page:0{len(str(page_count))}d}.{extension}"
 
 
 def convert_pdf_to_png(
     pdf_path: Path,
     output_dir: Path | None = None,
     dpi: int = 1200,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+    engine: RenderEngine = RenderEngine.PDFTOPPM,
+    max_workers: int = 1,
+    fallback: bool = False,
+    memory_budget: int | None = None,
+    image_format: ImageFormat = ImageFormat.PNG,
+    png_level: int = DEFAULT_PNG_LEVEL,
+    quality: int = DEFAULT_QUALITY,
+    encode_workers: int = 0,
+    subdirectory: bool = False,
+    write_manifest: bool = False,
+    pyramid: Sequence[int] = (),
+    incremental: bool = False,
+) -> ConvertResult:
+    """
+    Convert a single PDF to image files (PNG unless image_format says otherwise).
+    Output files are placed in output_dir (or same dir as PDF), inside a
+    folder named after the PDF with subdirectory, and named as pdftoppm
+    names them with either engine (see page_file_name); a TIFF holds every
+    page in one "<stem>.tif". The result lists exactly the files written;
+    write_manifest also saves that list as "<stem>.manifest.json" next to
+    them (see read_manifest).
+    pyramid lists lower resolutions (each below dpi) written as well, each
+    into a "<dpi>dpi" folder of the output directory (see level_dir_name).
+    Every page is rendered once, at dpi, and downscaled to them; PyMuPDF only.
+    incremental keeps the pages an earlier run's manifest lists, if the PDF
+    and the settings are unchanged and their files are as written, renders
+    only the others, and writes the manifest (see _fresh_pages).
+    With max_workers > 1, pages are rendered on up to max_workers processes:
+    RenderEngine.PDFTOPPM splits the document into page ranges, each
+    rendered by its own pdftoppm -f/-l, and RenderEngine.PYMUPDF hands out
+    single pages to a process pool. fallback renders documents or pages
+    PyMuPDF cannot handle with pdftoppm instead.
+    memory_budget (bytes, PyMuPDF only) caps the bitmaps held at once, those
+    of every process and of pages waiting for an encoder thread: pages whose
+    bitmap would exceed their share are rendered in horizontal bands that
+    are streamed into the PNG file (see _write_page_banded).
+    png_level is the zlib level of PNG files and quality that of JPEG and
+    WebP files; pdftoppm writes PNG and JPEG only. With PyMuPDF rendering in
+    this process (max_workers 1, or any TIFF), encode_workers threads encode
+    pages while the following pages are rendered.
+    on_progress(done, total) is called as each page is written.
+    If cancel is triggered, rendering stops, the pages already written are
+    removed and OperationCancelledError is raised.
+    """
+    levels = sorted(set(pyramid), reverse=True)
+    if levels and (levels[0] >= dpi or levels[-1] < 1):
+        return ConvertResult(
+            False,
+            f"\u591a\u91cd\u89e3\u6790\u5ea6\u9700\u4ecb\u65bc 1 \u8207 {dpi - 1} DPI \u4e4b\u9593",
+        )
+    if levels and engine is not RenderEngine.PYMUPDF:
+        return ConvertResult(
+            False,
+            "pdftoppm \u7121\u6cd5\u7522\u751f\u591a\u91cd\u89e3\u6790\u5ea6\uff0c\u8acb\u6539\u7528 PyMuPDF",
+        )
+    out_dir = output_dir or pdf_path.parent
+    if subdirectory:
+        out_dir = out_dir / pdf_path.stem
+    level_dirs = {level: out_dir / level_dir_name(level) for level in levels}
+    folders = [*level_dirs.values(), out_dir] if subdirectory else [*level_dirs.values()]
+    # Removed again if cancelled while still empty, innermost first.
+    created = [folder for folder in folders if not folder.exists()]
+    for folder in folders:
+        folder.mkdir(parents=True, exist_ok=True)
+    encoding = Encoding(image_format, png_level, quality)
+    fresh: dict[int, Path] = {}
+    fresh_levels: dict[int, dict[int, Path]] = {}
+    if incremental:
+        write_manifest = True
+        fresh, fresh_levels, page_count = _fresh_pages(
+            out_dir / f"{pdf_path.stem}{MANIFEST_SUFFIX}", pdf_path, dpi, encoding, levels
+        )
+        if fresh and len(fresh) == page_count:
+            result = _result(
+                True,
+                f"\u5df2\u662f\u6700\u65b0\uff0c\u7565\u904e {page_count} \u9801",
+                fresh,
+                fresh_levels,
+            )
+            result.manifest_file = out_dir / f"{pdf_path.stem}{MANIFEST_SUFFIX}"
+            return result
+        if encoding.format.multi_page:
+            # A TIFF is rewritten whole.
+            fresh, fresh_levels = {}, {}
+    try:
+        result = _convert(
+            pdf_path,
+            out_dir,
+            dpi,
+            on_progress,
+            cancel,
+            engine,
+            max_workers,
+            fallback,
+            memory_budget,
+            encoding,
+            encode_workers,
+            level_dirs,
+            set(fresh),
+        )
+    except OperationCancelledError:
+        for folder in created:
+            if not any(folder.iterdir()):
+                folder.rmdir()
+        raise
+    if fresh:
+        message = f"{result.message}\uff0c{len(fresh)} \u9801\u5df2\u662f\u6700\u65b0"
+        levels_done = {
+            level: {**fresh_levels.get(level, {}), **result.levels.get(level, {})}
+            for level in levels
+        }
+        result = _result(result.success, message, {**fresh, **result.pages}, levels_done)
+    if write_manifest and result.pages:
+        result.manifest_file = _write_manifest(pdf_path, out_dir, dpi, encoding, result)
+    return result
+
+
+def _convert(
+    pdf_path: Path,
+    out_dir: Path,
+    dpi: int,
+    on_progress: Callable[[int, int], None] | None,
+    cancel: CancelToken | None,
+    engine: RenderEngine,
+    max_workers: int,
+    fallback: bool,
+    memory_budget: int | None,
+    encoding: Encoding,
+    encode_workers: int,
+    level_dirs: dict[int, Path],
+    skip: set[int],
+) -> ConvertResult:
+    if engine is RenderEngine.PYMUPDF:
+        return _convert_with_pymupdf(
+            pdf_path,
+            out_dir,
+            dpi,
+            on_progress,
+            cancel,
+            max_workers,
+            fallback,
+            memory_budget,
+            encoding,
+            encode_workers,
+            level_dirs,
+            skip,
+        )
+    return _convert_with_pdftoppm(
+        pdf_path, out_dir, dpi, on_progress, cancel, max_workers, encoding, skip
+    )
+
+
+def _pdftoppm_cmd(
+    pdftoppm: str,
+    pdf_path: Path,
+    out_dir: Path,
+    dpi: int,
+    pages: tuple[int, int] | None = None,
+    progress: bool = False,
+    encoding: Encoding = DEFAULT_ENCODING,
+) -> list[str]:
+    """pdftoppm command line; pages = (first, last), 1-based, limits the range."""
+    cmd = [pdftoppm, *_PDFTOPPM_FORMATS[encoding.format], "-r", str(dpi)]
+    if encoding.format is ImageFormat.JPEG:
+        cmd += ["-jpegopt", f"quality={encoding.quality}"]
+    if progress:
+        cmd.append("-progress")
+    if pages is not None:
+        cmd += ["-f", str(pages[0]), "-l", str(pages[1])]
+    return [*cmd, str(pdf_path), str(out_dir / pdf_path.stem)]
+
+
+def _page_shards(page_count: int, shards: int) -> list[tuple[int, int]]:
+    """Split pages 1..page_count into up to shards (first, last) ranges of near-equal size."""
+    shards = max(1, min(shards, page_count))
+    size, extra = divmod(page_count, shards)
+    ranges = []
+    first = 1
+    for i in range(shards):
+        last = first + size - 1 + (1 if i < extra else 0)
+        ranges.append((first, last))
+        first = last + 1
+    return ranges
+
+
+def _page_runs(pages: Sequence[int], shards: int) -> list[tuple[int, int]]:
+    """
+    Cover sorted 1-based pages with (first, last) ranges of consecutive
+    pages, at most about len(pages) / shards long each.
+    """
+    size = max(1, -(-len(pages) // max(1, shards)))
+    runs: list[tuple[int, int]] = []
+    for page in pages:
+        if runs and page == runs[-1][1] + 1 and runs[-1][1] - runs[-1][0] + 1 < size:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+
+def _page_count(pdf_path: Path) -> int | None:
+    try:
+        with fitz.open(str(pdf_path)) as doc:
+            return doc.page_count
+    except Exception:
+        return None
+
+
+def _remove_pages_since(
+    pdf_path: Path,
+    out_dir: Path,
+    started: float,
+    extension: str = "png",
+    page_count: int | None = None,
+) -> None:
+    """Remove the pages of pdf_path written to out_dir since started."""
+    if page_count is not None:
+        # Look up the expected names rather than listing a shared directory.
+        candidates = [
+            out_dir / page_file_name(pdf_path.stem, page, page_count, extension)
+            for page in range(1, page_count + 1)
+        ]
+    else:
+        # pdftoppm names pages "<stem>-<zero-padded number>.<extension>"
+        page_name = re.compile(rf"{re.escape(pdf_path.stem)}-\d+\.{re.escape(extension)}")
+        candidates = [p for p in out_dir.iterdir() if page_name.fullmatch(p.name)]
+    stale = []
+    for path in candidates:
+        try:
+            if path.stat().st_mtime >= started - _MTIME_SLACK:
+                stale.append(path)
+        except OSError:
+            continue
+    remove_partial(*stale)
+
+
+def _write_manifest(
+    pdf_path: Path, out_dir: Path, dpi: int, encoding: Encoding, result: ConvertResult
+) -> Path:
+    """Save the pages of result as JSON next to them; file names are relative to the manifest."""
+    path = out_dir / f"{pdf_path.stem}{MANIFEST_SUFFIX}"
+
+    def entries(pages: dict[int, Path]) -> list[dict[str, Any]]:
+        listed = []
+        for page, file in pages.items():
+            stat = file.stat()
+            listed.append(
+                {
+                    "page": page,
+                    "file": file.relative_to(out_dir).as_posix(),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                }
+            )
+        return listed
+
+    data: dict[str, Any] = {
+        "source": pdf_path.name,
+        **_source_identity(pdf_path),
+        **_settings(dpi, encoding),
+        "page_count": _page_count(pdf_path),
+        "pages": entries(result.pages),
+    }
+    if result.levels:
+        data["levels"] = [
+            {"dpi": level, "pages": entries(pages)} for level, pages in result.levels.items()
+        ]
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def read_manifest(path: Path) -> dict[int, Path]:
+    """The pages recorded in a manifest written by convert_pdf_to_png, as absolute paths."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {int(entry["page"]): path.parent / entry["file"] for entry in data["pages"]}
+
+
+def _settings(dpi: int, encoding: Encoding) -> dict[str, Any]:
+    return {
+        "dpi": dpi,
+        "format": encoding.format.name.lower(),
+        "png_level": encoding.png_level,
+        "quality": encoding.quality,
+    }
+
+
+def _source_identity(pdf_path: Path) -> dict[str, Any]:
+    stat = pdf_path.stat()
+    return {
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha256": file_digest(pdf_path),
+    }
+
+
+def _same_source(data: dict[str, Any], pdf_path: Path) -> bool:
+    """Whether pdf_path still has the content data was recorded for."""
+    stat = pdf_path.stat()
+    if stat.st_size != data.get("source_size"):
+        return False
+    if stat.st_mtime_ns == data.get("source_mtime_ns"):
+        return True
+    # Touched or copied: only the content tells.
+    return file_digest(pdf_path) == data.get("source_sha256")
+
+
+def _fresh_pages(
+    manifest: Path, pdf_path: Path, dpi: int, encoding: Encoding, levels: Sequence[int]
+) -> tuple[dict[int, Path], dict[int, dict[int, Path]], int | None]:
+    """
+    The pages of an earlier run that need no rendering, as (pages, levels,
+    page count) like ConvertResult: those manifest lists with a file (and
+    one for every pyramid level) whose size and modification time are still
+    as recorded. None of them, if the manifest is missing, the PDF changed
+    or the settings differ.
+    """
+    try:
+        data = json.loads(manifest.read_text(encoding="utf-8"))
+        if any(data.get(key) != value for key, value in _settings(dpi, encoding).items()):
+            return {}, {}, None
+        if not _same_source(data, pdf_path):
+            return {}, {}, None
+
+        def unchanged(entries: list[dict[str, Any]]) -> dict[int, Path]:
+            files = {}
+            for entry in entries:
+                file = manifest.parent / entry["file"]
+                try:
+                    stat = file.stat()
+                except OSError:
+                    continue
+                if (stat.st_size, stat.st_mtime_ns) == (entry.get("size"), entry.get("mtime_ns")):
+                    files[int(entry["page"])] = file
+            return files
+
+        pages = unchanged(data["pages"])
+        recorded = {
+            int(level["dpi"]): unchanged(level["pages"]) for level in data.get("levels", [])
+        }
+        page_count = data.get("page_count")
+    except OSError, ValueError, KeyError, TypeError:
+        return {}, {}, None
+    for level in levels:
+        pages = {page: file for page, file in pages.items() if page in recorded.get(level, {})}
+    return (
+        pages,
+        {level: {page: recorded[level][page] for page in pages} for level in levels},
+        page_count,
+    )
+
+
+def _convert_with_pdftoppm(
+    pdf_path: Path,
+    out_dir: Path,
+    dpi: int,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+    max_workers: int = 1,
+    encoding: Encoding = DEFAULT_ENCODING,
+    skip: set[int] | None = None,
 ) -> ConvertResult:
     """
-    Convert a single PDF to PNG files using pdftoppm.
-    Output files are placed in output_dir (or same dir as PDF).
+    Convert using one pdftoppm process, or one per page range when
+    max_workers > 1. Pages of skip (1-based) are left out.
     """
     pdftoppm = find_pdftoppm()
     if pdftoppm is None:
@@ -48,36 +493,529 @@ def convert_pdf_to_png(
             False,
             "\u627e\u4e0d\u5230 pdftoppm\uff0c\u8acb\u78ba\u8a8d\u5df2\u5b89\u88dd poppler-utils",
         )
+    if encoding.format not in _PDFTOPPM_FORMATS:
+        return ConvertResult(
+            False,
+            f"pdftoppm \u7121\u6cd5\u8f38\u51fa {encoding.format.name}\uff0c\u8acb\u6539\u7528 PyMuPDF",
+        )
+    page_count = _page_count(pdf_path)
+    if skip and page_count is not None:
+        # The pages still to render, in ranges of consecutive pages.
+        missing = [page for page in range(1, page_count + 1) if page not in skip]
+        runs = _page_runs(missing, max(1, max_workers) * _SHARDS_PER_WORKER)
+        return _convert_sharded(
+            pdftoppm,
+            pdf_path,
+            out_dir,
+            dpi,
+            page_count,
+            on_progress,
+            cancel,
+            max(1, max_workers),
+            encoding,
+            runs,
+        )
+    # Documents PyMuPDF cannot count are left to a single pdftoppm.
+    if max_workers > 1 and page_count is not None and page_count > 1:
+        return _convert_sharded(
+            pdftoppm,
+            pdf_path,
+            out_dir,
+            dpi,
+            page_count,
+            on_progress,
+            cancel,
+            max_workers,
+            encoding,
+        )
 
-    out_dir = output_dir or pdf_path.parent
-    output_base = out_dir / pdf_path.stem
-
-    cmd = [
-        pdftoppm,
-        "-png",
-        "-r",
-        str(dpi),
-        str(pdf_path),
-        str(output_base),
-    ]
-
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
-    )
+    # -progress reports every page written, which gives the exact outputs.
+    cmd = _pdftoppm_cmd(pdftoppm, pdf_path, out_dir, dpi, progress=True, encoding=encoding)
+    extension = encoding.format.value
+    pages: dict[int, Path] = {}
+
+    def on_output(line: str) -> None:
+        # pdftoppm -progress prints "<page> <last page> <file>" to stderr
+        if match := _PDFTOPPM_PROGRESS.match(line):
+            page = int(match.group(1))
+            if page_count is not None:
+                name = page_file_name(pdf_path.stem, page, page_count, extension)
+                pages[page] = out_dir / name
+            else:
+                # The printed name may be mis-decoded; use it only as a last resort.
+                pages[page] = Path(match.group(3))
+            if on_progress:
+                done = len(pages)
+                on_progress(done, done + int(match.group(2)) - page)
+
+    started = time.time()
+    try:
+        result = run_process(cmd, cancel, on_output)
+    except OperationCancelledError:
+        _remove_pages_since(pdf_path, out_dir, started, extension, page_count)
+        raise
 
     if result.returncode != 0:
-        return ConvertResult(
+        return _result(
             False,
             f"\u8f49\u63db\u5931\u6557: {result.stderr.strip()}",
+            pages,
+        )
+    return _result(
+        True,
+        f"\u6210\u529f\u8f49\u63db {len(pages)} \u9801",
+        pages,
+    )
+
+
+def _convert_sharded(
+    pdftoppm: str,
+    pdf_path: Path,
+    out_dir: Path,
+    dpi: int,
+    page_count: int,
+    on_progress: Callable[[int, int], None] | None,
+    cancel: CancelToken | None,
+    max_workers: int,
+    encoding: Encoding = DEFAULT_ENCODING,
+    shards: list[tuple[int, int]] | None = None,
+) -> ConvertResult:
+    """
+    Run pdftoppm -f/-l over page ranges (shards, or the whole document split
+    evenly), at most max_workers at a time. Every process pads page numbers
+    to the document's page count, so the ranges together produce exactly
+    the files one pdftoppm would.
+    """
+    if shards is None:
+        shards = _page_shards(page_count, min(max_workers, page_count) * _SHARDS_PER_WORKER)
+    workers = min(max_workers, len(shards))
+    total = sum(last - first + 1 for first, last in shards)
+    lock = threading.Lock()
+    pages_done = 0
+
+    def on_output(line: str) -> None:
+        nonlocal pages_done
+        if _PDFTOPPM_PROGRESS.match(line):
+            with lock:
+                pages_done += 1
+                on_progress(pages_done, total)
+
+    def run_shard(shard: tuple[int, int]) -> subprocess.CompletedProcess[str]:
+        check_cancelled(cancel)
+        cmd = _pdftoppm_cmd(
+            pdftoppm, pdf_path, out_dir, dpi, shard, on_progress is not None, encoding
+        )
+        return run_process(cmd, cancel, on_output if on_progress else None)
+
+    extension = encoding.format.value
+    started = time.time()
+    failures = []
+    pages: dict[int, Path] = {}
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdftoppm")
+    try:
+        futures = [pool.submit(run_shard, shard) for shard in shards]
+        for (first, last), future in zip(shards, futures, strict=True):
+            result = future.result()
+            if result.returncode != 0:
+                failures.append(f"{first}-{last}: {result.stderr.strip()}")
+                continue
+            for page in range(first, last + 1):
+                pages[page] = out_dir / page_file_name(pdf_path.stem, page, page_count, extension)
+    except OperationCancelledError:
+        pool.shutdown(cancel_futures=True)
+        _remove_pages_since(pdf_path, out_dir, started, extension, page_count)
+        raise
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    if failures:
+        return _result(
+            False,
+            f"\u8f49\u63db\u5931\u6557: {'; '.join(failures)}",
+            pages,
+        )
+    return _result(
+        True,
+        f"\u6210\u529f\u8f49\u63db {total} \u9801",
+        pages,
+    )
+
+
+# -- PyMuPDF engine --
+
+# Document opened by a pool process, reused for every page it renders.
+_pool_doc: tuple[str, fitz.Document] | None = None
+
+
+def _pool_document(pdf_path: Path) -> fitz.Document:
+    global _pool_doc
+    if _pool_doc is None or _pool_doc[0] != str(pdf_path):
+        if _pool_doc is not None:
+            _pool_doc[1].close()
+        _pool_doc = (str(pdf_path), fitz.open(str(pdf_path)))
+    return _pool_doc[1]
+
+
+def _needs_bands(page: fitz.Page, dpi: int, encoding: Encoding, memory_budget: int | None) -> bool:
+    """Whether page is rendered in bands (PNG only: the other encoders need whole pages)."""
+    if memory_budget is None or encoding.format is not ImageFormat.PNG:
+        return False
+    scale = dpi / 72
+    area = (page.rect * fitz.Matrix(scale, scale)).irect
+    return area.width * area.height * 3 > memory_budget
+
+
+def _render_image(page: fitz.Page, dpi: int) -> PageImage:
+    return PageImage.from_pixmap(page.get_pixmap(dpi=dpi, alpha=False), dpi)
+
+
+def _encode_levels(
+    image: PageImage, dst: Path, encoding: Encoding, levels: Sequence[tuple[int, Path]] = ()
+) -> Path:
+    """Encode image to dst, and downscaled to every (dpi, path) of levels."""
+    written: list[Path] = []
+    try:
+        written.append(encode_page(image, dst, encoding))
+        for level_dpi, level_dst in levels:
+            written.append(encode_page(image.scaled(level_dpi), level_dst, encoding))
+    except BaseException:
+        remove_partial(*written)
+        raise
+    return dst
+
+
+def _write_page(
+    doc: fitz.Document,
+    index: int,
+    dst: Path,
+    dpi: int,
+    encoding: Encoding = DEFAULT_ENCODING,
+    memory_budget: int | None = None,
+    cancel: CancelToken | None = None,
+    levels: Sequence[tuple[int, Path]] = (),
+) -> Path:
+    """
+    Write page index to dst at dpi and to each (dpi, path) of levels. The
+    largest resolution that fits memory_budget is rendered and the lower
+    ones are downscaled from it; the ones above it are streamed in bands.
+    """
+    page = doc[index]
+    wanted = [(dpi, dst), *levels]
+    written: list[Path] = []
+    try:
+        while wanted and _needs_bands(page, wanted[0][0], encoding, memory_budget):
+            level_dpi, level_dst = wanted.pop(0)
+            written.append(level_dst)
+            _write_page_banded(
+                page, level_dst, level_dpi, memory_budget, encoding.png_level, cancel
+            )
+        if wanted:
+            (top_dpi, top_dst), *rest = wanted
+            _encode_levels(_render_image(page, top_dpi), top_dst, encoding, rest)
+    except BaseException:
+        remove_partial(*written)
+        raise
+    return dst
+
+
+def _write_page_banded(
+    page: fitz.Page,
+    dst: Path,
+    dpi: int,
+    memory_budget: int,
+    png_level: int = DEFAULT_PNG_LEVEL,
+    cancel: CancelToken | None = None,
+) -> None:
+    """
+    Render page in full-width bands of at most memory_budget bytes each and
+    stream their rows into dst, so no more than one band is held at a time.
+    The page is interpreted once into a display list that every band replays.
+    """
+    scale = dpi / 72
+    matrix = fitz.Matrix(scale, scale)
+    display_list = page.get_displaylist()
+    rect = display_list.rect
+    area = (rect * matrix).irect
+    row_bytes = area.width * 3
+    # Each band is rendered with one extra row above and below, so the edges
+    # of the clip are not anti-aliased into the rows that are kept.
+    rows_per_band = max(1, memory_budget // row_bytes - 2)
+    with PngWriter(dst, area.width, area.height, level=png_level, dpi=dpi) as png:
+        for top in range(area.y0, area.y1, rows_per_band):
+            check_cancelled(cancel)
+            bottom = min(top + rows_per_band, area.y1)
+            clip = fitz.Rect(rect.x0, (top - 1) / scale, rect.x1, (bottom + 1) / scale)
+            band = display_list.get_pixmap(matrix=matrix, alpha=False, clip=clip)
+            skip = top - fitz.IRect(band.irect).y0
+            png.write_rows(
+                band.samples_mv[skip * band.stride : (skip + bottom - top) * band.stride]
+            )
+            band = None  # free it before the next band is rendered
+
+
+def render_page(
+    pdf_path: Path,
+    index: int,
+    dst: Path,
+    dpi: int,
+    encoding: Encoding = DEFAULT_ENCODING,
+    memory_budget: int | None = None,
+    cancel: CancelToken | None = None,
+    levels: Sequence[tuple[int, Path]] = (),
+) -> Path:
+    """Render page index (0-based) of pdf_path to dst; runs in a pool process."""
+    check_cancelled(cancel)
+    return _write_page(
+        _pool_document(pdf_path), index, dst, dpi, encoding, memory_budget, cancel, levels
+    )
+
+
+def _iter_in_process(
+    doc: fitz.Document,
+    jobs: Iterable[FileJob],
+    cancel: CancelToken | None,
+    encode_workers: int = 0,
+    encode: Callable[[PageImage, FileJob], Path] | None = None,
+) -> Iterator[tuple[FileJob, Any]]:
+    """
+    Render jobs one after another on an already open document, yielding
+    (job, written path or exception) in order. encode(image, job) writes a
+    rendered page (to the job's dst and levels by default). With
+    encode_workers > 0, pages are encoded on that many threads while the
+    next ones render; at most encode_workers rendered pages wait at a time.
+    """
+    if encode is None:
+
+        def encode(image: PageImage, job: FileJob) -> Path:
+            kwargs = job.kwargs
+            return _encode_levels(image, kwargs["dst"], kwargs["encoding"], kwargs["levels"])
+
+    def start(job: FileJob, pool: ThreadPoolExecutor | None) -> Any:
+        kwargs = job.kwargs
+        page = doc[kwargs["index"]]
+        try:
+            if _needs_bands(page, kwargs["dpi"], kwargs["encoding"], kwargs["memory_budget"]):
+                # Streamed while rendering; there is nothing left to encode.
+                return _write_page(
+                    doc,
+                    kwargs["index"],
+                    kwargs["dst"],
+                    kwargs["dpi"],
+                    kwargs["encoding"],
+                    kwargs["memory_budget"],
+                    cancel,
+                    kwargs["levels"],
+                )
+            image = _render_image(page, kwargs["dpi"])
+            if pool is None:
+                return encode(image, job)
+        except OperationCancelledError:
+            raise
+        except Exception as exc:
+            return exc
+        return pool.submit(encode, image, job)
+
+    def settle(job: FileJob, outcome: Any) -> tuple[FileJob, Any]:
+        if isinstance(outcome, Future):
+            try:
+                outcome = outcome.result()
+            except Exception as exc:
+                outcome = exc
+        return job, outcome
+
+    pool = (
+        ThreadPoolExecutor(max_workers=encode_workers, thread_name_prefix="encode")
+        if encode_workers > 0
+        else None
+    )
+    pending: deque[tuple[FileJob, Any]] = deque()
+    try:
+        for job in jobs:
+            check_cancelled(cancel)
+            pending.append((job, start(job, pool)))
+            while len(pending) > max(encode_workers, 0):
+                yield settle(*pending.popleft())
+        while pending:
+            yield settle(*pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def _convert_with_pymupdf(
+    pdf_path: Path,
+    out_dir: Path,
+    dpi: int,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+    max_workers: int = 1,
+    fallback: bool = False,
+    memory_budget: int | None = None,
+    encoding: Encoding = DEFAULT_ENCODING,
+    encode_workers: int = 0,
+    level_dirs: dict[int, Path] | None = None,
+    skip: set[int] | None = None,
+) -> ConvertResult:
+    """
+    Render every page but those of skip (1-based) with PyMuPDF, in parallel
+    when max_workers > 1, and downscale it to every pyramid level of
+    level_dirs (DPI: directory).
+    """
+    level_dirs = level_dirs or {}
+    skip = skip or set()
+    try:
+        doc = fitz.open(str(pdf_path))
+    except Exception as exc:
+        if fallback and not level_dirs:
+            return _convert_with_pdftoppm(
+                pdf_path, out_dir, dpi, on_progress, cancel, max_workers, encoding, skip
+            )
+        return ConvertResult(False, f"\u7121\u6cd5\u958b\u555f PDF: {exc}")
+
+    extension = encoding.format.value
+    tiff = None
+    tiffs: list[TiffWriter] = []  # tiff, then one per pyramid level
+    outcomes = None
+    failed: list[int] = []
+    started = time.time()
+    try:
+        page_count = doc.page_count
+        # A multi-page file is written in page order by this process.
+        workers = (
+            1 if encoding.format.multi_page else max(1, min(max_workers, page_count - len(skip)))
         )
+        # Encoder threads of the in-process path; pages are appended to a
+        # multi-page file one after another.
+        encoders = 0 if workers > 1 else max(0, encode_workers)
+        if encoding.format.multi_page:
+            encoders = min(encoders, 1)
+        if memory_budget is not None:
+            # Every process renders a page at the same time, and in this
+            # process up to encoders rendered pages wait to be encoded.
+            memory_budget = max(1, memory_budget // (workers * (encoders + 1)))
+        names = [
+            page_file_name(pdf_path.stem, i + 1, page_count, extension) for i in range(page_count)
+        ]
+        jobs = [
+            FileJob(
+                pdf_path,
+                render_page,
+                {
+                    "pdf_path": pdf_path,
+                    "index": i,
+                    "dst": out_dir / name,
+                    "dpi": dpi,
+                    "encoding": encoding,
+                    "memory_budget": memory_budget,
+                    "cancel": cancel,
+                    "levels": [
+                        (level, directory / name) for level, directory in level_dirs.items()
+                    ],
+                },
+            )
+            for i, name in enumerate(names)
+            if i + 1 not in skip
+        ]
+        if encoding.format.multi_page:
+            tiff = TiffWriter(out_dir / f"{pdf_path.stem}.{extension}")
+            tiffs.append(tiff)
+            for directory in level_dirs.values():
+                tiffs.append(TiffWriter(directory / tiff.path.name))
 
-    # Find generated PNG files
-    output_files = sorted(out_dir.glob(f"{pdf_path.stem}*.png"))
-    return ConvertResult(
+            def add_page(image: PageImage, job: FileJob) -> Path:
+                tiff.add(image)
+                for level, writer in zip(level_dirs, tiffs[1:], strict=True):
+                    writer.add(image.scaled(level))
+                return tiff.path
+
+            # Pages are appended one after another: a single encoder thread.
+            outcomes = _iter_in_process(doc, jobs, cancel, encoders, add_page)
+        elif workers > 1:
+            outcomes = iter_parallel(jobs, workers, cancel)
+        else:
+            outcomes = _iter_in_process(doc, jobs, cancel, encoders)
+        for done, (job, outcome) in enumerate(outcomes, 1):
+            if isinstance(outcome, OperationCancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                failed.append(job.kwargs["index"])
+            if on_progress:
+                on_progress(done, len(jobs))
+        # The pool stops handing out pages once cancelled without raising.
+        check_cancelled(cancel)
+
+        if failed and fallback and tiff is None:
+            retry = failed
+            failed = _render_pages_with_pdftoppm(pdf_path, out_dir, dpi, retry, cancel, encoding)
+            for level, directory in level_dirs.items():
+                failed += _render_pages_with_pdftoppm(
+                    pdf_path, directory, level, retry, cancel, encoding
+                )
+            failed = sorted(set(failed))
+    except OperationCancelledError:
+        # Let running renderers and encoders finish before cleaning up.
+        if outcomes is not None:
+            outcomes.close()
+        if tiff is not None:
+            for writer in tiffs:
+                writer.close()
+                remove_partial(writer.path)
+        else:
+            for directory in (out_dir, *level_dirs.values()):
+                _remove_pages_since(pdf_path, directory, started, extension, page_count)
+        raise
+    finally:
+        doc.close()
+        for writer in tiffs:
+            writer.close()
+
+    pages: dict[int, Path] = {}
+    levels: dict[int, dict[int, Path]] = {level: {} for level in level_dirs}
+    for job in jobs:
+        i = job.kwargs["index"]
+        if i in failed:
+            continue
+        if tiff is not None:
+            pages[i + 1] = tiff.path
+            for level, writer in zip(level_dirs, tiffs[1:], strict=True):
+                levels[level][i + 1] = writer.path
+        else:
+            pages[i + 1] = job.kwargs["dst"]
+            for level, level_dst in job.kwargs["levels"]:
+                levels[level][i + 1] = level_dst
+    if failed:
+        numbers = ", ".join(str(i + 1) for i in failed)
+        return _result(
+            False,
+            f"\u7b2c {numbers} \u9801\u8f49\u63db\u5931\u6557",
+            pages,
+            levels,
+        )
+    return _result(
         True,
-        f"\u6210\u529f\u8f49\u63db {len(output_files)} \u9801",
-        output_files,
+        f"\u6210\u529f\u8f49\u63db {len(jobs)} \u9801",
+        pages,
+        levels,
     )
+
+
+def _render_pages_with_pdftoppm(
+    pdf_path: Path,
+    out_dir: Path,
+    dpi: int,
+    indices: list[int],
+    cancel: CancelToken | None = None,
+    encoding: Encoding = DEFAULT_ENCODING,
+) -> list[int]:
+    """Render single pages with pdftoppm; returns the indices that still failed."""
+    pdftoppm = find_pdftoppm()
+    if pdftoppm is None or encoding.format not in _PDFTOPPM_FORMATS:
+        return indices
+    still_failed = []
+    for index in indices:
+        cmd = _pdftoppm_cmd(
+            pdftoppm, pdf_path, out_dir, dpi, (index + 1, index + 1), encoding=encoding
+        )
+        if run_process(cmd, cancel).returncode != 0:
+            still_failed.append(index)
+    return still_failed
@@ -0,0 +1,240 @@
+"""
+Long-lived Ghostscript sessions for batches of pdfwrite conversions.
+
+Starting Ghostscript and initialising its fonts costs more than processing a
+small PDF. A session keeps one interpreter running and feeds it one file at
+a time as PostScript on stdin: every request points the pdfwrite device at a
+new output file, runs the input inside `stopped` and prints a marker line,
+so a broken input fails only its own request. If the interpreter dies, the
+request it was working on fails and the next one starts a fresh session.
+
+Sessions are kept per thread, so pool processes and worker threads each
+reuse their own interpreter; a session ends with its thread or process.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from pdf_toolbox.core.cancel import (
+    CancelToken,
+    OperationCancelledError,
+    remove_partial,
+    stop_process,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+# How often a running request is checked for cancellation (seconds).
+_POLL_INTERVAL = 0.05
+_MARKER = "@@pdf_toolbox"
+
+
+@dataclass
+class SessionResult:
+    """Outcome of one request to a session."""
+
+    success: bool
+    output: str  # interpreter messages printed while handling the request
+
+
+def _ps_string(value: str | Path) -> str:
+    """A PostScript string literal for a file name (any bytes, safely escaped)."""
+    out = []
+    for byte in os.fsencode(value):
+        char = chr(byte)
+        if char in "()\\":
+            out.append("\\" + char)
+        elif 32 <= byte < 127:
+            out.append(char)
+        else:
+            out.append(f"\\{byte:03o}")
+    return "(" + "".join(out) + ")"
+
+
+def _permit_dir(path: Path) -> str:
+    return str(path.resolve()) + os.sep
+
+
+class GhostscriptSession:
+    """
+    One running Ghostscript interpreter with a pdfwrite device.
+
+    device_args are the pdfwrite options every request shares (e.g.
+    -dPDFSETTINGS=/ebook). The interpreter runs with -dSAFER and may only
+    read from and write to the directories it was started for.
+    """
+
+    def __init__(
+        self,
+        gs_cmd: str,
+        device_args: Sequence[str],
+        read_dirs: set[Path],
+        write_dirs: set[Path],
+    ) -> None:
+        self.device_args = tuple(device_args)
+        self.read_dirs = frozenset(read_dirs)
+        self.write_dirs = frozenset(write_dirs)
+        self._scratch_dir = Path(tempfile.mkdtemp(prefix="pdf_toolbox_gs_"))
+        self._scratch = self._scratch_dir / "idle.pdf"
+        self._ids = itertools.count(1)
+
+        cmd = [
+            gs_cmd,
+            "-dSAFER",
+            "-dNOPAUSE",
+            "-dBATCH",
+            "-sDEVICE=pdfwrite",
+            *self.device_args,
+            f"-sOutputFile={self._scratch}",
+            f"--permit-file-all={_permit_dir(self._scratch_dir)}",
+            *(f"--permit-file-read={_permit_dir(d)}" for d in sorted(self.read_dirs)),
+            *(f"--permit-file-write={_permit_dir(d)}" for d in sorted(self.write_dirs)),
+            "-",
+        ]
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+        )
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        threading.Thread(target=_pump, args=(self._proc.stdout, self._lines), daemon=True).start()
+        # Stop the interpreter when the session is dropped (thread exit, process exit).
+        self._finalizer = weakref.finalize(self, _shutdown, self._proc, self._scratch_dir)
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def covers(self, src: Path, dst: Path) -> bool:
+        """Whether the session may read src and write dst."""
+        return src.resolve().parent in self.read_dirs and dst.resolve().parent in self.write_dirs
+
+    def convert(
+        self,
+        src: Path,
+        dst: Path,
+        on_output: Callable[[str], None] | None = None,
+        cancel: CancelToken | None = None,
+    ) -> SessionResult:
+        """
+        Write src through pdfwrite to dst. on_output receives each line the
+        interpreter prints for this request. A cancelled request stops the
+        interpreter, removes dst and raises OperationCancelledError.
+        """
+        request = next(self._ids)
+        idle = _ps_string(self._scratch)
+        program = (
+            f"{{ << /OutputFile {_ps_string(dst)} >> setpagedevice "
+            f"{_ps_string(src)} run "
+            f"<< /OutputFile {idle} >> setpagedevice }} stopped\n"
+            f"{{ {{ << /OutputFile {idle} >> setpagedevice }} stopped pop "
+            f"(\\n{_MARKER} {request} failed ) print $error /errorname get =only (\\n) print }}\n"
+            f"{{ (\\n{_MARKER} {request} ok\\n) print }} ifelse flush\n"
+            "clear cleardictstack\n"
+        )
+        try:
+            self._proc.stdin.write(program.encode("ascii"))
+            self._proc.stdin.flush()
+        except OSError:
+            return SessionResult(False, "Ghostscript \u5df2\u7d50\u675f")
+
+        output: list[str] = []
+        prefix = f"{_MARKER} {request} "
+        while True:
+            try:
+                line = self._lines.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if cancel is not None and cancel.is_cancelled:
+                    # Don't wait for the interpreter to finish the input.
+                    stop_process(self._proc)
+                    self.close()
+                    remove_partial(dst)
+                    raise OperationCancelledError from None
+                continue
+            if line is None:
+                # The interpreter died on this input.
+                self.close()
+                remove_partial(dst)
+                return SessionResult(False, "".join(output))
+            if line.startswith(prefix):
+                status = line[len(prefix) :].strip()
+                if status == "ok" and dst.exists() and dst.stat().st_size > 0:
+                    return SessionResult(True, "".join(output))
+                remove_partial(dst)
+                return SessionResult(False, "".join(output) + status)
+            if line.strip():
+                output.append(line)
+                if on_output is not None:
+                    on_output(line.rstrip("\n"))
+
+    def close(self) -> None:
+        """Stop the interpreter."""
+        self._finalizer()
+
+
+def _pump(stream: IO[bytes], lines: queue.Queue[str | None]) -> None:
+    """Reader thread: forward interpreter output line by line; None at EOF."""
+    with stream:
+        for raw in stream:
+            lines.put(raw.decode("utf-8", errors="replace"))
+    lines.put(None)
+
+
+def _shutdown(proc: subprocess.Popen, scratch_dir: Path) -> None:
+    if proc.poll() is None:
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except OSError, subprocess.TimeoutExpired:
+            stop_process(proc)
+    shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+_local = threading.local()
+
+
+def session_for(
+    gs_cmd: str, device_args: Sequence[str], src: Path, dst: Path
+) -> GhostscriptSession:
+    """
+    This thread's session for device_args, able to read src and write dst.
+    A session started with other options, for other directories or that has
+    exited is replaced (keeping the directories it already covered).
+    """
+    session: GhostscriptSession | None = getattr(_local, "session", None)
+    if session is not None and session.alive and tuple(device_args) == session.device_args:
+        if session.covers(src, dst):
+            return session
+        read_dirs = set(session.read_dirs)
+        write_dirs = set(session.write_dirs)
+    else:
+        read_dirs, write_dirs = set(), set()
+    if session is not None:
+        session.close()
+    read_dirs.add(src.resolve().parent)
+    write_dirs.add(dst.resolve().parent)
+    _local.session = GhostscriptSession(gs_cmd, device_args, read_dirs, write_dirs)
+    return _local.session
+
+
+def close_session() -> None:
+    """Stop this thread's session, if any."""
+    session = getattr(_local, "session", None)
+    if session is not None:
+        session.close()
+        _local.session = None
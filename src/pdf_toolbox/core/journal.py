@@ -0,0 +1,224 @@
+"""
+Append-only journal of finished per-file jobs, for resuming interrupted batches.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import MISSING, asdict, dataclass, field, fields
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pdf_toolbox.core.utils import app_data_dir
+
+if TYPE_CHECKING:
+    from pdf_toolbox.core.batch import FileJob
+
+# Records are flushed to the OS at once (surviving an application crash) and
+# fsync'ed at most this often (seconds), so a power loss costs at most the
+# last few files while 40k fsyncs do not slow the batch down.
+_FSYNC_INTERVAL = 1.0
+# Rewrite the journal on open once it holds this many superseded records.
+_COMPACT_THRESHOLD = 10_000
+
+
+class JobStatus(StrEnum):
+    """Status of a finished job as stored in the journal."""
+
+    SUCCESS = "success"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class JournalRecord:
+    """One finished job. Jobs with the same key supersede earlier records."""
+
+    source: str
+    size: int
+    mtime_ns: int
+    operation: str
+    params: str
+    location: str
+    status: str
+    outputs: list[str] = field(default_factory=list)
+    message: str = ""
+    finished_at: float = 0.0
+
+    @property
+    def key(self) -> tuple[str, int, int, str, str, str]:
+        return (self.source, self.size, self.mtime_ns, self.operation, self.params, self.location)
+
+    @property
+    def output_paths(self) -> list[Path]:
+        return [Path(p) for p in self.outputs]
+
+
+_FIELDS = {f.name for f in fields(JournalRecord)}
+_REQUIRED_FIELDS = {
+    f.name for f in fields(JournalRecord) if f.default is MISSING and f.default_factory is MISSING
+}
+
+
+def _parse_record(line: str) -> JournalRecord | None:
+    """Parse one journal line; None for a torn or unknown line."""
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not _REQUIRED_FIELDS <= data.keys() <= _FIELDS:
+        return None
+    return JournalRecord(**data)
+
+
+def params_digest(job: FileJob) -> str:
+    """Stable hash of a job's settings."""
+    text = json.dumps(job.params(), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _job_key(job: FileJob) -> tuple[str, int, int, str, str, str] | None:
+    """Identity of a job: its input file (path, size, mtime), operation, settings, location."""
+    try:
+        source = job.source.resolve()
+        stat = source.stat()
+    except OSError:
+        return None
+    location = job.output_location
+    return (
+        str(source),
+        stat.st_size,
+        stat.st_mtime_ns,
+        job.operation,
+        params_digest(job),
+        str(location.resolve()) if location is not None else "",
+    )
+
+
+class JobJournal:
+    """
+    JSON-lines journal of finished jobs.
+
+    A job counts as done when the journal holds a successful record for the
+    same input file (unchanged size and modification time), operation,
+    settings and output directory, and all its outputs still exist. A line
+    torn by a crash is ignored when the journal is read back.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._records: dict[tuple, JournalRecord] = {}
+        self._stream = None
+        self._last_sync = 0.0
+        lines = self._load()
+        if lines - len(self._records) >= _COMPACT_THRESHOLD:
+            self.compact()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def lookup(self, job: FileJob) -> JournalRecord | None:
+        """The record of a successful earlier run of job, if its outputs still exist."""
+        key = _job_key(job)
+        record = self._records.get(key) if key is not None else None
+        if record is None or record.status != JobStatus.SUCCESS:
+            return None
+        if not all(p.exists() for p in record.output_paths):
+            return None
+        return record
+
+    def record(
+        self,
+        job: FileJob,
+        status: str,
+        outputs: list[Path] | None = None,
+        message: str = "",
+    ) -> None:
+        """Append the outcome of job."""
+        key = _job_key(job)
+        if key is None:
+            return
+        source, size, mtime_ns, operation, params, location = key
+        entry = JournalRecord(
+            source=source,
+            size=size,
+            mtime_ns=mtime_ns,
+            operation=operation,
+            params=params,
+            location=location,
+            status=status,
+            outputs=[str(p) for p in outputs or []],
+            message=message,
+            finished_at=time.time(),
+        )
+        self._records[key] = entry
+        self._append(entry)
+
+    def close(self) -> None:
+        """Flush and fsync pending records."""
+        if self._stream is not None:
+            self._stream.flush()
+            os.fsync(self._stream.fileno())
+            self._stream.close()
+            self._stream = None
+
+    def compact(self) -> None:
+        """Rewrite the journal keeping only the latest record per job."""
+        self.close()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self._records.values():
+                f.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path)
+
+    def _load(self) -> int:
+        """Read existing records; returns the number of lines read."""
+        if not self._path.exists():
+            return 0
+        lines = 0
+        with open(self._path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                lines += 1
+                entry = _parse_record(line)
+                if entry is not None:
+                    self._records[entry.key] = entry
+        return lines
+
+    def _ends_without_newline(self) -> bool:
+        try:
+            with open(self._path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            return False
+
+    def _append(self, entry: JournalRecord) -> None:
+        if self._stream is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            torn = self._ends_without_newline()
+            self._stream = open(self._path, "a", encoding="utf-8")  # noqa: SIM115
+            if torn:
+                # Terminate a line cut short by a crash so it stays a single bad line.
+                self._stream.write("\n")
+        self._stream.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+        self._stream.flush()
+        now = time.monotonic()
+        if now - self._last_sync >= _FSYNC_INTERVAL:
+            os.fsync(self._stream.fileno())
+            self._last_sync = now
+
+
+def default_journal_path(name: str) -> Path:
+    """Journal file for one kind of batch (e.g. a page or worker name)."""
+    return app_data_dir() / "journal" / f"{name}.jsonl"
@@ -1,14 +1,70 @@
 """
 Merge multiple PDFs into one.
+
+Inputs exported from the same template each carry their own copy of the
+same fonts, logos and ICC profiles. Merges keep one copy of each: objects
+with the same content (stream data included) are replaced by the first one,
+pass after pass, so objects that differed only in which copy they referred
+to are shared as well. Pages, the page tree and annotations are never shared.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import re
+import tempfile
+import zlib
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+import fitz  # PyMuPDF
 import pikepdf
 
+from pdf_toolbox.core.batch import FileJob, iter_parallel
+from pdf_toolbox.core.cancel import (
+    CancelToken,
+    OperationCancelledError,
+    check_cancelled,
+    remove_partial,
+)
+from pdf_toolbox.core.utils import human_readable_size
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable, Sequence
+
+# Pages copied into a new pikepdf PDF hold on to their source, and their
+# content is read into memory, until the merged file is saved. Beyond these
+# many inputs or bytes of input, merges are streamed instead (see
+# _merge_streaming).
+DEFAULT_BATCH_SIZE = 256
+_BATCH_BYTES = 256 * 1024 * 1024
+
+# Inputs (or intermediate PDFs) merged per group of a tree merge.
+DEFAULT_FAN_IN = DEFAULT_BATCH_SIZE
+
+# Objects that must stay distinct even when identical: two blank pages are
+# still two pages. /Parent marks nodes of a tree (pages, outlines, fields),
+# /Rect annotations, which need not have a /Type.
+_UNSHARED = re.compile(rb"/Type\s*/(?:Pages?|Catalog|Annot)\b|/Parent\b|/Rect\b")
+_REFERENCE = re.compile(r"\b(\d+) 0 R\b")
+
+# One part of a page spec: "all", a slice "a:b", a range "a-b" or a page.
+_SPEC_PART = re.compile(r"(?i:all)|(-?\d*):(-?\d*)|(\d+)-(\d+)|(-?\d+)")
+
+
+@dataclass
+class MergeInput:
+    """How one input of a merge went."""
+
+    source: Path
+    page_count: int = 0
+    error: str = ""  # why the input was left out, if it was
+
+    @property
+    def merged(self) -> bool:
+        return not self.error
+
 
 @dataclass
 class MergeResult:
@@ -18,34 +74,702 @@ class MergeResult:
     message: str
     output_path: Path | None = None
     page_count: int = 0
+    bytes_saved: int = 0  # by sharing identical objects between inputs
+    inputs: list[MergeInput] = field(default_factory=list)  # in input order
+
+
+def parse_merge_input(text: str) -> tuple[Path, str]:
+    """
+    Split "a.pdf[1-3,7]" into (Path("a.pdf"), "1-3,7"); text without a
+    trailing [spec] (or naming a file that exists as written) selects all
+    pages, spec "". Raises ValueError for a malformed spec.
+    """
+    if text.endswith("]") and "[" in text and not Path(text).exists():
+        path, _, spec = text[:-1].rpartition("[")
+        for part in spec.split(","):
+            if not _SPEC_PART.fullmatch(part.strip()):
+                raise ValueError(f"\u7121\u6548\u7684\u9801\u9762\u7bc4\u570d: {spec}")
+        return Path(path), spec
+    return Path(text), ""
+
+
+def select_pages(spec: str, total_pages: int) -> list[tuple[int, int]]:
+    """
+    Resolve a merge page spec into 0-based inclusive ranges, in the order
+    given (pages may repeat). Parts are separated by commas: "all", a page
+    "7", a range "1-3", or a slice "a:b" whose ends default to the first and
+    last page and count back from the last page when negative ("-2:" is the
+    last two pages). Pages are numbered from 1; an empty spec is all pages.
+    Raises ValueError for a malformed spec or a page past the end.
+    """
+
+    def page(number: str, default: int) -> int:
+        if not number:
+            return default
+        index = int(number)
+        index = index - 1 if index > 0 else total_pages + index
+        if not 0 <= index < total_pages:
+            raise ValueError(
+                f"\u9801\u78bc {number} \u8d85\u51fa\u7bc4\u570d\uff08\u5171 {total_pages} \u9801\uff09"
+            )
+        return index
+
+    if not spec:
+        return [(0, total_pages - 1)] if total_pages else []
+    ranges: list[tuple[int, int]] = []
+    for part in spec.split(","):
+        match = _SPEC_PART.fullmatch(part.strip())
+        if match is None:
+            raise ValueError(f"\u7121\u6548\u7684\u9801\u9762\u7bc4\u570d: {part.strip()}")
+        start_s, stop_s, first_s, last_s, single = match.groups()
+        if single is not None:
+            start = end = page(single, 0)
+        elif first_s is not None:
+            start, end = page(first_s, 0), page(last_s, 0)
+        elif start_s is not None:
+            start, end = page(start_s, 0), page(stop_s, total_pages - 1)
+        else:  # all
+            start, end = 0, total_pages - 1
+        if start > end:
+            raise ValueError(f"\u7121\u6548\u7684\u9801\u9762\u7bc4\u570d: {part.strip()}")
+        ranges.append((start, end))
+    return ranges
 
 
 def merge_pdfs(
     input_files: list[Path],
     output_path: Path,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+    batch_size: int | None = DEFAULT_BATCH_SIZE,
+    deduplicate: bool = True,
+    on_page: Callable[[int, int], None] | None = None,
+    pages: Sequence[str] | None = None,
 ) -> MergeResult:
-    """Merge multiple PDFs in order into a single file."""
+    """
+    Merge multiple PDFs in order into a single file.
+    Up to batch_size inputs (and 256 MB of them) are merged in memory in one
+    go. Larger merges are streamed: the output is written batch by batch,
+    each batch appended as an incremental update, so memory use and open
+    files stay bounded by one batch however many inputs there are.
+    batch_size None always merges in one go.
+    deduplicate keeps one copy of identical objects (see the module docstring);
+    the bytes this saves are reported in the result.
+    An input that cannot be read is left out and the rest are merged; the
+    result lists how every input went.
+    on_progress(done, total) counts one step per input plus the final save;
+    on_page(done, total) counts the pages copied of the current input.
+    pages holds a page spec for each input (see select_pages), in the same
+    order; only those pages are copied, "" copying all of them. An input
+    whose spec does not fit it is left out.
+    cancel is checked between pages and while the output is saved;
+    OperationCancelledError is raised without leaving an output file behind.
+    """
     if not input_files:
         return MergeResult(False, "\u6c92\u6709\u6a94\u6848\u9700\u8981\u5408\u4f75\u3002")
+    specs = _page_specs(input_files, pages)
+
+    steps = len(input_files) + 1
 
+    def step(done: int) -> None:
+        if on_progress:
+            on_progress(done, steps)
+
+    def page_step(done: int, total: int) -> None:
+        check_cancelled(cancel)
+        if on_page:
+            on_page(done, total)
+
+    inputs: list[MergeInput] = []
     try:
-        merged = pikepdf.Pdf.new()
-        total_pages = 0
+        if batch_size is not None and (
+            len(input_files) > batch_size or _total_size(input_files) > _BATCH_BYTES
+        ):
+            saved = _merge_streaming(
+                input_files,
+                specs,
+                output_path,
+                inputs,
+                cancel,
+                step,
+                page_step,
+                batch_size,
+                deduplicate,
+            )
+        else:
+            saved = _merge_in_memory(
+                input_files, specs, output_path, inputs, cancel, step, page_step, deduplicate
+            )
+    except Exception as exc:
+        remove_partial(output_path)
+        if isinstance(exc, OperationCancelledError):
+            raise
+        return MergeResult(False, f"\u5408\u4f75\u5931\u6557: {exc}", inputs=inputs)
+    except BaseException:
+        # KeyboardInterrupt: the CLI merges in this process and is stopped by Ctrl-C.
+        remove_partial(output_path)
+        raise
 
-        for pdf_path in input_files:
-            with pikepdf.open(str(pdf_path)) as src:
-                merged.pages.extend(src.pages)
-                total_pages += len(src.pages)
+    result = _merged_result(inputs, output_path, saved)
+    if result.success:
+        step(steps)
+    return result
 
-        merged.save(str(output_path))
-        merged.close()
 
-        return MergeResult(
-            True,
-            f"\u5408\u4f75\u5b8c\u6210\uff01\u5171 {len(input_files)} \u500b\u6a94\u6848\uff0c"
-            f"{total_pages} \u9801",
+def merge_pdfs_tree(
+    input_files: list[Path],
+    output_path: Path,
+    max_workers: int,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+    batch_size: int | None = DEFAULT_BATCH_SIZE,
+    deduplicate: bool = True,
+    on_page: Callable[[int, int], None] | None = None,
+    on_stage: Callable[[int, int], None] | None = None,
+    fan_in: int = DEFAULT_FAN_IN,
+    pages: Sequence[str] | None = None,
+) -> MergeResult:
+    """
+    Merge like merge_pdfs, as a tree: consecutive groups of inputs are merged
+    in parallel worker processes into intermediate PDFs, which are grouped and
+    merged again, level by level, until at most fan_in are left; those are
+    merged into output_path in this process. The order of input_files is kept.
+    With one worker, or at most fan_in inputs, this is merge_pdfs.
+    on_stage(stage, stages) is called as each level starts, the final merge
+    being the last stage; on_progress(done, total) counts the groups merged
+    on every level, then the steps of the final merge. on_page reports the
+    final merge only. pages apply to the first level, which copies the
+    selected pages of every input.
+    """
+    if max_workers <= 1 or len(input_files) <= fan_in:
+        return merge_pdfs(
+            input_files, output_path, on_progress, cancel, batch_size, deduplicate, on_page, pages
+        )
+
+    levels = _tree_levels(len(input_files), max_workers, max(2, fan_in))
+    stages = len(levels) + 1
+    steps = sum(levels) + levels[-1] + 1
+    done = 0
+
+    def step(current: int = 1) -> None:
+        if on_progress:
+            on_progress(done + current, steps)
+
+    inputs: list[MergeInput] = []
+    saved = 0
+    parts = list(zip(input_files, _page_specs(input_files, pages), strict=True))
+    with tempfile.TemporaryDirectory(prefix=".merge-", dir=output_path.parent) as tmp:
+        for stage, group_count in enumerate(levels, 1):
+            if on_stage:
+                on_stage(stage, stages)
+            groups = _split(parts, group_count)
+            jobs = (
+                FileJob(
+                    group[0][0],
+                    merge_pdfs,
+                    {
+                        "input_files": [path for path, _spec in group],
+                        "output_path": Path(tmp) / f"{stage}-{index:05d}.pdf",
+                        "cancel": cancel,
+                        "batch_size": batch_size,
+                        "deduplicate": deduplicate,
+                        "pages": [spec for _path, spec in group],
+                    },
+                )
+                for index, group in enumerate(groups)
+            )
+            merged: list[tuple[Path, str]] = []
+            for _job, outcome in iter_parallel(jobs, max_workers, cancel):
+                if isinstance(outcome, OperationCancelledError):
+                    raise outcome
+                if isinstance(outcome, BaseException):
+                    return MergeResult(False, f"\u5408\u4f75\u5931\u6557: {outcome}", inputs=inputs)
+                if stage == 1:
+                    # Only the first level merges the caller's files.
+                    inputs.extend(outcome.inputs)
+                elif not outcome.success:
+                    return MergeResult(False, outcome.message, inputs=inputs)
+                if outcome.success:
+                    merged.append((outcome.output_path, ""))
+                    saved += outcome.bytes_saved
+                step()
+                done += 1
+            check_cancelled(cancel)
+            if stage > 1:
+                for part, _spec in parts:
+                    remove_partial(part)  # intermediates of the level below
+            parts = merged
+            if not parts:
+                break
+
+        if not parts:
+            return _merged_result(inputs, output_path, saved)
+        if on_stage:
+            on_stage(stages, stages)
+        final = merge_pdfs(
+            [part for part, _spec in parts],
             output_path,
-            total_pages,
+            lambda d, _t: step(d),
+            cancel,
+            batch_size,
+            deduplicate,
+            on_page,
+        )
+    if not final.success:
+        return MergeResult(False, final.message, inputs=inputs)
+    if on_progress:
+        on_progress(steps, steps)  # also when groups without readable inputs were left out
+    return _merged_result(inputs, output_path, saved + final.bytes_saved)
+
+
+def append_pdfs(
+    archive: Path,
+    input_files: list[Path],
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+    batch_size: int | None = DEFAULT_BATCH_SIZE,
+    deduplicate: bool = True,
+    on_page: Callable[[int, int], None] | None = None,
+    pages: Sequence[str] | None = None,
+) -> MergeResult:
+    """
+    Append the pages of input_files to the existing PDF archive as
+    incremental updates: only the new objects, the changed page tree and a
+    new cross-reference section are written after the archive's end, so the
+    time taken depends on the inputs, not on the size of the archive.
+    Inputs are handled as by merge_pdfs; identical objects are shared among
+    them (the archive's own are not read), and pages selects the pages
+    appended of each. page_count counts the new pages.
+    On failure, cancellation or interruption (KeyboardInterrupt) the archive
+    is cut back to its original length, which undoes everything appended.
+    """
+    if not input_files:
+        return MergeResult(False, "\u6c92\u6709\u6a94\u6848\u9700\u8981\u5408\u4f75\u3002")
+    specs = _page_specs(input_files, pages)
+    try:
+        original_size = archive.stat().st_size
+        with fitz.open(str(archive)) as doc:
+            if not doc.is_pdf or doc.needs_pass:
+                raise ValueError("\u4e0d\u662f PDF \u6a94\u6848\u6216\u9700\u8981\u5bc6\u78bc")
+            if not doc.can_save_incrementally():
+                raise ValueError(
+                    "\u6a94\u6848\u5df2\u640d\u6bc0\uff0c\u7121\u6cd5\u589e\u91cf\u66f4\u65b0\uff0c\u8acb\u6539\u7528\u4e00\u822c\u5408\u4f75"
+                )
+            archive_pages = doc.page_count
+    except Exception as exc:
+        return MergeResult(False, f"\u7121\u6cd5\u9644\u52a0\u5230 {archive.name}: {exc}")
+
+    steps = len(input_files) + 1
+
+    def step(done: int) -> None:
+        if on_progress:
+            on_progress(done, steps)
+
+    def page_step(done: int, total: int) -> None:
+        check_cancelled(cancel)
+        if on_page:
+            on_page(done, total)
+
+    inputs: list[MergeInput] = []
+    try:
+        saved = _merge_streaming(
+            input_files,
+            specs,
+            archive,
+            inputs,
+            cancel,
+            step,
+            page_step,
+            batch_size or len(input_files),
+            deduplicate,
+            append=True,
         )
     except Exception as exc:
-        return MergeResult(False, f"\u5408\u4f75\u5931\u6557: {exc}")
+        _truncate(archive, original_size)
+        if isinstance(exc, OperationCancelledError):
+            raise
+        return MergeResult(False, f"\u9644\u52a0\u5931\u6557: {exc}", inputs=inputs)
+    except BaseException:
+        # KeyboardInterrupt: the CLI merges in this process and is stopped by Ctrl-C.
+        _truncate(archive, original_size)
+        raise
+
+    result = _merged_result(inputs, archive, saved, "\u9644\u52a0\u5b8c\u6210\uff01")
+    if result.success:
+        result.message += f"\uff0c\u6a94\u6848\u5171 {archive_pages + result.page_count} \u9801"
+        step(steps)
+    return result
+
+
+def _truncate(path: Path, size: int) -> None:
+    """Cut path back to size bytes, dropping incremental updates written since."""
+    with open(path, "r+b") as f:
+        f.truncate(size)
+
+
+def _tree_levels(count: int, max_workers: int, fan_in: int) -> list[int]:
+    """
+    Number of groups merged on each level of a tree merge of count inputs:
+    at most fan_in inputs per group, and at least one group per worker.
+    """
+    levels = []
+    while count > fan_in:
+        count = max(-(-count // fan_in), min(max_workers, count // 2))
+        levels.append(count)
+    return levels
+
+
+def _split[T](items: list[T], count: int) -> list[list[T]]:
+    """Split items into count consecutive groups whose sizes differ by at most one."""
+    size, extra = divmod(len(items), count)
+    groups = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        groups.append(items[start:end])
+        start = end
+    return [group for group in groups if group]
+
+
+def _merged_result(
+    inputs: list[MergeInput],
+    output_path: Path,
+    saved: int,
+    done_text: str = "\u5408\u4f75\u5b8c\u6210\uff01",
+) -> MergeResult:
+    failed = [item for item in inputs if not item.merged]
+    if len(failed) == len(inputs):
+        return MergeResult(
+            False,
+            f"\u5408\u4f75\u5931\u6557: \u6c92\u6709\u53ef\u8b80\u53d6\u7684\u6a94\u6848\uff08{failed[0].error}\uff09",
+            inputs=inputs,
+        )
+    total_pages = sum(item.page_count for item in inputs)
+    message = f"{done_text}\u5171 {len(inputs) - len(failed)} \u500b\u6a94\u6848\uff0c{total_pages} \u9801"
+    if saved:
+        message += (
+            f"\uff0c\u5171\u7528\u91cd\u8907\u8cc7\u6e90\u7701\u4e0b {human_readable_size(saved)}"
+        )
+    if failed:
+        message += (
+            f"\uff0c\u7565\u904e {len(failed)} \u500b\u7121\u6cd5\u8b80\u53d6\u7684\u6a94\u6848"
+        )
+    return MergeResult(True, message, output_path, total_pages, saved, inputs)
+
+
+def _total_size(paths: list[Path]) -> int:
+    total = 0
+    for path in paths:
+        try:
+            total += path.stat().st_size
+        except OSError:
+            continue  # reported when it is opened
+    return total
+
+
+def _page_specs(input_files: list[Path], pages: Sequence[str] | None) -> list[str]:
+    if pages is None:
+        return [""] * len(input_files)
+    if len(pages) != len(input_files):
+        raise ValueError("pages must hold one spec per input")
+    return list(pages)
+
+
+def _merge_in_memory(
+    input_files: list[Path],
+    specs: list[str],
+    output_path: Path,
+    inputs: list[MergeInput],
+    cancel: CancelToken | None,
+    step: Callable[[int], None],
+    page_step: Callable[[int, int], None],
+    deduplicate: bool,
+) -> int:
+    merged = pikepdf.Pdf.new()
+    for done, (pdf_path, spec) in enumerate(zip(input_files, specs, strict=True), 1):
+        check_cancelled(cancel)
+        item = MergeInput(pdf_path)
+        inputs.append(item)
+        first_page = len(merged.pages)
+        try:
+            with pikepdf.open(str(pdf_path)) as src:
+                selected = [
+                    index
+                    for first, last in select_pages(spec, len(src.pages))
+                    for index in range(first, last + 1)
+                ]
+                count = len(selected)
+                for copied, index in enumerate(selected, 1):
+                    merged.pages.append(src.pages[index])
+                    page_step(copied, count)
+            item.page_count = count
+        except OperationCancelledError:
+            raise
+        except Exception as exc:
+            del merged.pages[first_page:]
+            item.error = str(exc) or type(exc).__name__
+        step(done)
+
+    saved = 0
+    if any(item.merged for item in inputs):
+        check_cancelled(cancel)
+        saved = _share_duplicates_pikepdf(merged) if deduplicate else 0
+        # pikepdf calls progress while it writes, so a cancel stops the save.
+        merged.save(str(output_path), progress=lambda _percent: check_cancelled(cancel))
+    merged.close()
+    return saved
+
+
+def _merge_streaming(
+    input_files: list[Path],
+    specs: list[str],
+    output_path: Path,
+    inputs: list[MergeInput],
+    cancel: CancelToken | None,
+    step: Callable[[int], None],
+    page_step: Callable[[int, int], None],
+    batch_size: int,
+    deduplicate: bool,
+    append: bool = False,
+) -> int:
+    """
+    Merge with PyMuPDF, which copies a page's objects when it is inserted,
+    so each input is closed right after. Every batch_size inputs (or 256 MB)
+    the output is saved, as an incremental update after the first batch,
+    and reopened: only the batch being added is held in memory. Objects of
+    a batch are also shared with identical ones of earlier batches.
+    With append, output_path already exists and every batch is an update.
+    """
+    batch_size = max(1, batch_size)
+    saved = 0
+    seen: dict[Hashable, Hashable] = {}
+    doc = fitz.open(str(output_path)) if append else fitz.open()
+    first_new = doc.xref_length() if append else 1  # first object not saved yet
+    batch = batch_bytes = 0
+
+    def flush() -> None:
+        nonlocal saved
+        if deduplicate:
+            saved += _share_duplicates_fitz(doc, first_new, seen)
+        check_cancelled(cancel)
+        if first_new > 1:
+            # Appends only the new objects; the pages already written stay on disk.
+            doc.saveIncr()
+        else:
+            doc.save(str(output_path))
+
+    try:
+        for done, (pdf_path, spec) in enumerate(zip(input_files, specs, strict=True), 1):
+            check_cancelled(cancel)
+            item = MergeInput(pdf_path)
+            inputs.append(item)
+            first_page = doc.page_count
+            try:
+                with fitz.open(str(pdf_path)) as src:
+                    if not src.is_pdf or src.needs_pass:
+                        raise ValueError(
+                            "\u4e0d\u662f PDF \u6a94\u6848\u6216\u9700\u8981\u5bc6\u78bc"
+                        )
+                    _insert_pages(doc, src, select_pages(spec, src.page_count), page_step)
+                item.page_count = doc.page_count - first_page
+                batch += 1
+                batch_bytes += pdf_path.stat().st_size
+            except OperationCancelledError:
+                raise
+            except Exception as exc:
+                if doc.page_count > first_page:
+                    doc.delete_pages(first_page, doc.page_count - 1)
+                item.error = str(exc) or type(exc).__name__
+            if (
+                batch
+                and done < len(input_files)
+                and (batch >= batch_size or batch_bytes >= _BATCH_BYTES)
+            ):
+                flush()
+                doc.close()
+                doc = fitz.open(str(output_path))
+                first_new = doc.xref_length()
+                batch = batch_bytes = 0
+            step(done)
+        if batch:
+            flush()
+    finally:
+        doc.close()
+    return saved
+
+
+# Pages of an input inserted by PyMuPDF per call; resources shared between
+# them are still copied once, as the source's copy map is kept until its last.
+_PAGE_CHUNK = 32
+
+
+def _insert_pages(
+    doc: fitz.Document,
+    src: fitz.Document,
+    ranges: list[tuple[int, int]],
+    page_step: Callable[[int, int], None],
+) -> None:
+    """Insert the pages of src in ranges (0-based, inclusive), range by range."""
+    chunks = [
+        (first, min(first + _PAGE_CHUNK - 1, end))
+        for start, end in ranges
+        for first in range(start, end + 1, _PAGE_CHUNK)
+    ]
+    count = sum(last - first + 1 for first, last in chunks)
+    copied = 0
+    for number, (first, last) in enumerate(chunks, 1):
+        doc.insert_pdf(src, from_page=first, to_page=last, final=number == len(chunks))
+        copied += last - first + 1
+        page_step(copied, count)
+
+
+# -- Sharing identical objects --
+
+
+def _find_duplicates(
+    keyed: Iterable[tuple[Hashable, bytes]], seen: dict[Hashable, Hashable]
+) -> tuple[dict[Hashable, Hashable], dict[Hashable, Hashable]]:
+    """
+    Map each object to the first one with the same key, either kept from an
+    earlier batch (in seen) or earlier in keyed. Returns the duplicates and
+    the keys of the objects of keyed that are kept.
+    """
+    kept: dict[Hashable, Hashable] = {}
+    duplicates: dict[Hashable, Hashable] = {}
+    for obj_id, key in keyed:
+        target = seen.get(key)
+        if target is None:
+            target = kept.setdefault(key, obj_id)
+        if target != obj_id:
+            duplicates[obj_id] = target
+    return duplicates, kept
+
+
+def _share_duplicates_pikepdf(pdf: pikepdf.Pdf) -> int:
+    """Share identical objects of pdf; return the bytes no longer written."""
+    saved = 0
+    dropped: set[tuple[int, int]] = set()
+    digests: dict[tuple[int, int], bytes] = {}
+
+    def keyed() -> Iterable[tuple[tuple[int, int], bytes]]:
+        for obj in pdf.objects:
+            if obj.objgen in dropped:
+                continue
+            if isinstance(obj, pikepdf.Stream):
+                text = obj.stream_dict.unparse()
+                if obj.objgen not in digests:
+                    digests[obj.objgen] = hashlib.sha256(obj.read_raw_bytes()).digest()
+                text += digests[obj.objgen]
+            else:
+                text = obj.unparse(resolved=True)
+            if not _UNSHARED.search(text):
+                yield obj.objgen, text
+
+    while True:
+        duplicates, _ = _find_duplicates(keyed(), {})
+        if not duplicates:
+            return saved
+        replacement = {}
+        for objgen, target in duplicates.items():
+            obj = pdf.get_object(objgen)
+            if isinstance(obj, pikepdf.Stream):
+                saved += _saved_stream_size(obj) + len(obj.stream_dict.unparse())
+            else:
+                saved += len(obj.unparse(resolved=True))
+            replacement[objgen] = pdf.get_object(target)
+        dropped.update(duplicates)
+        # Objects nothing refers to any more are left out when pdf is saved.
+        for obj in pdf.objects:
+            if obj.objgen not in dropped:
+                _replace_references(obj, replacement)
+        _replace_references(pdf.trailer, replacement)
+
+
+def _saved_stream_size(stream: pikepdf.Stream) -> int:
+    """Bytes of stream data pdf.save() writes: streams without a filter are deflated."""
+    raw = stream.read_raw_bytes()
+    if "/Filter" in stream.stream_dict:
+        return len(raw)
+    return len(zlib.compress(raw))
+
+
+def _replace_references(
+    container: pikepdf.Object, replacement: dict[tuple[int, int], pikepdf.Object]
+) -> None:
+    if isinstance(container, pikepdf.Array):
+        slots: Iterable[int | str] = range(len(container))
+    elif isinstance(container, (pikepdf.Dictionary, pikepdf.Stream)):
+        slots = list(container.keys())
+    else:
+        return
+    for slot in slots:
+        value = container[slot]
+        if not isinstance(value, pikepdf.Object):
+            continue  # numbers and booleans come back as Python values
+        if value.is_indirect:
+            if value.objgen in replacement:
+                container[slot] = replacement[value.objgen]
+        else:
+            _replace_references(value, replacement)
+
+
+def _share_duplicates_fitz(
+    doc: fitz.Document, first_new: int, seen: dict[Hashable, Hashable]
+) -> int:
+    """
+    Share identical objects among those doc got since first_new and with the
+    kept objects of earlier batches (seen, updated here); return the bytes
+    no longer written. Duplicates become null objects.
+    """
+    saved = 0
+    live = list(range(first_new, doc.xref_length()))
+    texts: dict[int, str] = {}  # dropped when the object is rewritten
+    digests: dict[int, bytes] = {}  # of stream data, which is never rewritten
+
+    def text_of(xref: int) -> str:
+        if xref not in texts:
+            texts[xref] = doc.xref_object(xref, compressed=True)
+        return texts[xref]
+
+    def keyed() -> Iterable[tuple[int, bytes]]:
+        for xref in live:
+            text = text_of(xref).encode()
+            if text == b"null" or _UNSHARED.search(text):
+                continue
+            if xref not in digests:
+                raw = doc.xref_stream_raw(xref) if doc.xref_is_stream(xref) else None
+                digests[xref] = hashlib.sha256(raw).digest() if raw is not None else b""
+            yield xref, text + digests[xref]
+
+    while True:
+        duplicates, kept = _find_duplicates(keyed(), seen)
+        if not duplicates:
+            seen.update(kept)
+            return saved
+        for xref in duplicates:
+            saved += len(texts[xref])
+            if digests[xref]:
+                saved += len(doc.xref_stream_raw(xref))
+            doc.update_object(xref, "null")
+        live = [xref for xref in live if xref not in duplicates]
+
+        for xref in live:
+            text = text_of(xref)
+            if not any(int(m[1]) in duplicates for m in _REFERENCE.finditer(text)):
+                continue
+            del texts[xref]
+            if digests.get(xref):
+                # Rewriting the whole object would drop its stream data.
+                for name in doc.xref_get_keys(xref):
+                    kind, value = doc.xref_get_key(xref, name)
+                    if kind in ("xref", "array", "dict"):
+                        new = _repoint(value, duplicates)
+                        if new != value:
+                            doc.xref_set_key(xref, name, new)
+            else:
+                doc.update_object(xref, _repoint(text, duplicates))
+
+
+def _repoint(text: str, duplicates: dict[int, int]) -> str:
+    """Replace references to duplicates in PDF object syntax."""
+    return _REFERENCE.sub(lambda m: f"{duplicates.get(int(m[1]), int(m[1]))} 0 R", text)
@@ -0,0 +1,235 @@
+"""
+Multi-step pipelines: several operations applied to one open document.
+
+A pipeline opens the source once with PyMuPDF, lets every step modify the
+document in memory and saves it once at the end, instead of parsing and
+writing an intermediate file per operation.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import fitz  # PyMuPDF
+
+from pdf_toolbox.core.cancel import CancelToken, check_cancelled, remove_partial
+from pdf_toolbox.core.compress import CompressionLevel, pymupdf_save_options
+from pdf_toolbox.core.watermark import WatermarkConfig, watermark_document
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class PipelineStep:
+    """
+    One operation of a pipeline. apply() changes the open document in place;
+    steps that only affect how the document is written update save_options,
+    the keyword arguments later passed to fitz.Document.save().
+    """
+
+    label: ClassVar[str] = ""
+
+    def apply(
+        self,
+        doc: fitz.Document,
+        save_options: dict[str, Any],
+        cancel: CancelToken | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+
+@dataclass
+class UnlockStep(PipelineStep):
+    """Open with a password (if needed) and save without encryption."""
+
+    label: ClassVar[str] = "\u89e3\u9396"
+
+    password: str | None = None
+
+    def apply(
+        self,
+        doc: fitz.Document,
+        save_options: dict[str, Any],
+        cancel: CancelToken | None = None,
+    ) -> None:
+        if doc.needs_pass and not doc.authenticate(self.password or ""):
+            raise ValueError("\u5bc6\u78bc\u932f\u8aa4\uff0c\u7121\u6cd5\u89e3\u9396")
+        save_options["encryption"] = fitz.PDF_ENCRYPT_NONE
+
+
+@dataclass
+class RotateStep(PipelineStep):
+    """Rotate pages by 90, 180 or 270 degrees (page_indices None = all pages)."""
+
+    label: ClassVar[str] = "\u65cb\u8f49"
+
+    degrees: int = 90
+    page_indices: list[int] | None = None
+
+    def apply(
+        self,
+        doc: fitz.Document,
+        save_options: dict[str, Any],
+        cancel: CancelToken | None = None,
+    ) -> None:
+        if self.degrees not in (90, 180, 270):
+            raise ValueError(f"\u7121\u6548\u7684\u65cb\u8f49\u89d2\u5ea6: {self.degrees}")
+        total = len(doc)
+        targets = self.page_indices if self.page_indices is not None else range(total)
+        for idx in targets:
+            check_cancelled(cancel)
+            if 0 <= idx < total:
+                page = doc[idx]
+                page.set_rotation((page.rotation + self.degrees) % 360)
+
+
+@dataclass
+class ReorderStep(PipelineStep):
+    """Reorder pages; new_order holds 0-based indices, None reverses the document."""
+
+    label: ClassVar[str] = "\u91cd\u6392\u5e8f"
+
+    new_order: list[int] | None = None
+
+    def apply(
+        self,
+        doc: fitz.Document,
+        save_options: dict[str, Any],
+        cancel: CancelToken | None = None,
+    ) -> None:
+        total = len(doc)
+        order = self.new_order if self.new_order is not None else list(range(total))[::-1]
+        if any(not 0 <= idx < total for idx in order):
+            raise ValueError("\u9801\u78bc\u8d85\u51fa\u7bc4\u570d")
+        check_cancelled(cancel)
+        doc.select(order)
+
+
+@dataclass
+class WatermarkStep(PipelineStep):
+    """Add a text or image watermark (see core.watermark)."""
+
+    label: ClassVar[str] = "\u6d6e\u6c34\u5370"
+
+    config: WatermarkConfig = field(default_factory=WatermarkConfig)
+    page_indices: list[int] | None = None
+
+    def apply(
+        self,
+        doc: fitz.Document,
+        save_options: dict[str, Any],
+        cancel: CancelToken | None = None,
+    ) -> None:
+        watermark_document(doc, self.config, self.page_indices, cancel=cancel)
+
+
+@dataclass
+class CompressStep(PipelineStep):
+    """
+    Compress when saving. A pipeline never leaves memory, so this uses the
+    PyMuPDF settings of core.compress rather than Ghostscript.
+    """
+
+    label: ClassVar[str] = "\u58d3\u7e2e"
+
+    level: CompressionLevel = CompressionLevel.MEDIUM
+    remove_metadata: bool = True
+
+    def apply(
+        self,
+        doc: fitz.Document,
+        save_options: dict[str, Any],
+        cancel: CancelToken | None = None,
+    ) -> None:
+        if self.remove_metadata:
+            doc.set_metadata({})
+        save_options.update(pymupdf_save_options(self.level))
+
+
+@dataclass
+class PipelineResult:
+    """Result of running a pipeline on one file."""
+
+    success: bool
+    message: str
+    output_path: Path | None = None
+    steps: list[str] = field(default_factory=list)
+
+
+def run_pipeline(
+    src: Path,
+    dst: Path,
+    steps: list[PipelineStep],
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+) -> PipelineResult:
+    """
+    Apply steps in order to src and write the result to dst once.
+    on_progress(done, total) is called after every step and after saving
+    (total = len(steps) + 1).
+    cancel is checked between steps; raises OperationCancelledError and
+    leaves no output behind.
+    """
+    if not steps:
+        return PipelineResult(False, "\u672a\u8a2d\u5b9a\u4efb\u4f55\u6b65\u9a5f")
+
+    total = len(steps) + 1
+    save_options: dict[str, Any] = {}
+    done_labels: list[str] = []
+    doc = fitz.open(str(src))
+    try:
+        for done, step in enumerate(steps, 1):
+            check_cancelled(cancel)
+            step.apply(doc, save_options, cancel)
+            done_labels.append(step.label)
+            if on_progress:
+                on_progress(done, total)
+
+        check_cancelled(cancel)
+        try:
+            doc.save(str(dst), **save_options)
+        except BaseException:
+            remove_partial(dst)
+            raise
+        if on_progress:
+            on_progress(total, total)
+    finally:
+        doc.close()
+
+    return PipelineResult(
+        True,
+        f"\u8655\u7406\u5b8c\u6210\uff01{' \u2192 '.join(done_labels)}",
+        dst,
+        done_labels,
+    )
+
+
+@dataclass
+class Pipeline:
+    """A reusable recipe: an ordered list of steps."""
+
+    steps: list[PipelineStep] = field(default_factory=list)
+
+    def add(self, step: PipelineStep) -> Pipeline:
+        """Append a step; returns the pipeline so calls can be chained."""
+        self.steps.append(step)
+        return self
+
+    def run(
+        self,
+        src: Path,
+        dst: Path,
+        on_progress: Callable[[int, int], None] | None = None,
+        cancel: CancelToken | None = None,
+    ) -> PipelineResult:
+        return run_pipeline(src, dst, self.steps, on_progress, cancel)
+
+
+def generate_output_path(src: Path, output_dir: Path | None = None) -> Path:
+    """Output path for a pipeline result (adds _processed suffix)."""
+    from pdf_toolbox.core.utils import ensure_unique_path
+
+    parent = output_dir or src.parent
+    return ensure_unique_path(parent / f"{src.stem}_processed{src.suffix}")
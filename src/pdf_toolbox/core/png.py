@@ -0,0 +1,191 @@
+"""
+Streaming PNG encoder.
+
+Rows are compressed as they arrive, so an image can be written band by band
+without ever holding the whole bitmap: memory use is one band plus the
+compressor's window, however large the image.
+
+Like libpng, every row gets the PNG filter (None, Sub, Up, Average or Paeth)
+whose output has the smallest sum of absolute values, which lets deflate
+find far more repeats in anti-aliased text and photos. The filters run as
+Pillow image operations over a few rows at a time, not byte by byte in
+Python.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from array import array
+from typing import TYPE_CHECKING
+
+from PIL import Image, ImageChops
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import TracebackType
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG color type by samples per pixel: gray, RGB, RGBA.
+_COLOR_TYPES = {1: 0, 3: 2, 4: 6}
+# Compressed data is written out in IDAT chunks of about this size.
+_IDAT_SIZE = 1 << 20
+_INCH = 0.0254  # meters
+# Rows filtered together; filtering holds about twenty scratch images of
+# this many rows.
+_FILTER_ROWS = 64
+# Lookup table turning zero into 255 and everything else into zero.
+_ZERO_TO_255 = [255] + [0] * 255
+
+
+def _not_greater(x: Image.Image, y: Image.Image) -> Image.Image:
+    """Mask, 255 where x <= y."""
+    return ImageChops.subtract(x, y).point(_ZERO_TO_255)
+
+
+def _paeth(a: Image.Image, b: Image.Image, c: Image.Image) -> Image.Image:
+    """
+    The Paeth predictor of left a, up b and upper-left c, on whole images:
+    whichever of a, b, c is closest to a + b - c, ties going to a, then b.
+    """
+    pa = ImageChops.difference(b, c)
+    pb = ImageChops.difference(a, c)
+    # pc = |(a - c) + (b - c)|, from the clipped positive and negative parts.
+    # Clipping pc at 255 changes no comparison, as pa and pb never exceed it.
+    above = ImageChops.add(ImageChops.subtract(a, c), ImageChops.subtract(b, c))
+    below = ImageChops.add(ImageChops.subtract(c, a), ImageChops.subtract(c, b))
+    pc = ImageChops.difference(above, below)
+    use_a = ImageChops.darker(_not_greater(pa, pb), _not_greater(pa, pc))
+    return Image.composite(a, Image.composite(b, c, _not_greater(pb, pc)), use_a)
+
+
+def _row_costs(filtered: Image.Image) -> array:
+    """Per row, the mean of |byte| with the filtered bytes read as signed."""
+    magnitude = ImageChops.darker(filtered, ImageChops.invert(filtered))
+    means = magnitude.convert("F").resize((1, filtered.height), Image.Resampling.BOX)
+    return array("f", means.tobytes())
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)))
+    )
+
+
+class PngWriter:
+    """
+    Write an 8-bit PNG of a known size row by row.
+
+    Use as a context manager and pass write_rows() whole rows, top to
+    bottom, of channels samples per pixel (the layout of a PyMuPDF pixmap
+    without alpha padding). The file is complete once every row has been
+    written and the writer is closed.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        width: int,
+        height: int,
+        channels: int = 3,
+        level: int = 6,
+        dpi: int | None = None,
+    ) -> None:
+        if channels not in _COLOR_TYPES:
+            raise ValueError(f"unsupported channel count: {channels}")
+        self.width = width
+        self.height = height
+        self.row_bytes = width * channels
+        self._channels = channels
+        self._prior = bytes(self.row_bytes)  # the row above the next one; zeros at the top
+        self._rows = 0
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+        self._compressor = zlib.compressobj(level)
+        self._file = open(path, "wb")  # noqa: SIM115
+        header = struct.pack(">IIBBBBB", width, height, 8, _COLOR_TYPES[channels], 0, 0, 0)
+        self._file.write(_SIGNATURE + _chunk(b"IHDR", header))
+        if dpi:
+            per_meter = round(dpi / _INCH)
+            self._file.write(_chunk(b"pHYs", struct.pack(">IIB", per_meter, per_meter, 1)))
+
+    def write_rows(self, samples: bytes | bytearray | memoryview) -> None:
+        """Append one or more whole rows."""
+        view = memoryview(samples).cast("B")
+        count, rest = divmod(len(view), self.row_bytes)
+        if rest or self._rows + count > self.height:
+            raise ValueError("samples do not fit the remaining rows")
+        chunk = _FILTER_ROWS * self.row_bytes
+        for start in range(0, len(view), chunk):
+            self._queue(self._compressor.compress(self._filter(view[start : start + chunk])))
+        self._rows += count
+
+    def _filter(self, rows: memoryview) -> bytes:
+        """Filter whole rows, each prefixed with the type of the filter chosen."""
+        size = (self.row_bytes, len(rows) // self.row_bytes)
+        raw = Image.frombytes("L", size, bytes(rows))
+        up = Image.frombytes("L", size, self._prior + rows[: -self.row_bytes])
+        left = Image.new("L", size)
+        left.paste(raw, (self._channels, 0))
+        up_left = Image.new("L", size)
+        up_left.paste(up, (self._channels, 0))
+        candidates = [
+            raw,
+            ImageChops.subtract_modulo(raw, left),
+            ImageChops.subtract_modulo(raw, up),
+            ImageChops.subtract_modulo(raw, ImageChops.add(left, up, scale=2)),
+            ImageChops.subtract_modulo(raw, _paeth(left, up, up_left)),
+        ]
+        costs = [_row_costs(image) for image in candidates]
+        data = [image.tobytes() for image in candidates]
+        out = bytearray()
+        for row in range(size[1]):
+            kind = min(range(len(candidates)), key=lambda k: costs[k][row])
+            start = row * self.row_bytes
+            out.append(kind)
+            out += data[kind][start : start + self.row_bytes]
+        self._prior = bytes(rows[-self.row_bytes :])
+        return bytes(out)
+
+    def close(self) -> None:
+        """Finish the image; raises ValueError if rows are missing."""
+        if self._file.closed:
+            return
+        try:
+            if self._rows != self.height:
+                raise ValueError(f"{self._rows} of {self.height} rows written")
+            self._queue(self._compressor.flush())
+            self._flush_idat()
+            self._file.write(_chunk(b"IEND", b""))
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> PngWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+    def _queue(self, data: bytes) -> None:
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+            if self._pending_size >= _IDAT_SIZE:
+                self._flush_idat()
+
+    def _flush_idat(self) -> None:
+        if self._pending:
+            self._file.write(_chunk(b"IDAT", b"".join(self._pending)))
+            self._pending.clear()
+            self._pending_size = 0
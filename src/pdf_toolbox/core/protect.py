@@ -8,10 +8,21 @@ from __future__ import annotations
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pikepdf
 from PyPDF2 import PdfReader, PdfWriter
 
+from pdf_toolbox.core.cancel import (
+    CancelToken,
+    OperationCancelledError,
+    check_cancelled,
+    remove_partial,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 @dataclass
 class ProtectResult:
@@ -27,18 +38,23 @@ def protect_pdf(
     dst: Path,
     user_password: str = "",
     owner_password: str = "",
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
 ) -> ProtectResult:
     """
     Apply dual-layer encryption to disable copy.
 
     Layer 1 (pikepdf): Set extract=False permission.
     Layer 2 (PyPDF2): Encrypt with permissions_flag=2052 (allow print, deny copy).
+    on_progress(done, total) is called for every page copied into layer 2.
+    cancel is checked between layers and for every page; raises OperationCancelledError.
     """
     # Use a proper temporary file instead of hardcoded "temp_p.pdf"
     with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
         temp_path = Path(tmp.name)
 
     try:
+        check_cancelled(cancel)
         # Layer 1: pikepdf
         with pikepdf.open(str(src)) as pdf:
             permissions = pikepdf.Permissions(extract=False)
@@ -54,8 +70,12 @@ def protect_pdf(
         # Layer 2: PyPDF2
         reader = PdfReader(str(temp_path))
         writer = PdfWriter()
-        for page in reader.pages:
+        page_total = len(reader.pages)
+        for done, page in enumerate(reader.pages, 1):
+            check_cancelled(cancel)
             writer.add_page(page)
+            if on_progress:
+                on_progress(done, page_total)
 
         # permissions_flag=2052: allow printing, deny copying
         writer.encrypt(user_password, owner_password, permissions_flag=2052)
@@ -69,6 +89,9 @@ def protect_pdf(
             dst,
         )
 
+    except OperationCancelledError:
+        remove_partial(dst)
+        raise
     finally:
         if temp_path.exists():
             temp_path.unlink()
@@ -0,0 +1,148 @@
+"""
+Image file formats for rendered pages.
+
+Encoders only read the samples of a rendered page, never the renderer, so
+they can run on other threads while the next page is rendered. PNG goes
+through the streaming PngWriter (zlib releases the GIL); JPEG, WebP and
+TIFF go through Pillow, whose encoders release it as well.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+from PIL import Image, TiffImagePlugin
+
+from pdf_toolbox.core.cancel import remove_partial
+from pdf_toolbox.core.png import PngWriter
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import TracebackType
+
+    import fitz
+
+DEFAULT_PNG_LEVEL = 6
+DEFAULT_QUALITY = 90
+
+
+class ImageFormat(Enum):
+    """Output formats for rendered pages; the value is the file extension."""
+
+    PNG = "png"
+    JPEG = "jpg"
+    WEBP = "webp"
+    TIFF = "tif"  # one multi-page file per document
+
+    @property
+    def multi_page(self) -> bool:
+        return self is ImageFormat.TIFF
+
+
+@dataclass(frozen=True)
+class Encoding:
+    """How rendered pages are written."""
+
+    format: ImageFormat = ImageFormat.PNG
+    png_level: int = DEFAULT_PNG_LEVEL  # zlib level, 0 (fastest) to 9 (smallest)
+    quality: int = DEFAULT_QUALITY  # JPEG and WebP, 1 to 100
+
+
+DEFAULT_ENCODING = Encoding()
+
+
+@dataclass
+class PageImage:
+    """
+    RGB samples of a rendered page. Holds on to the pixmap the samples
+    belong to, so they stay valid while an encoder reads them.
+    """
+
+    width: int
+    height: int
+    samples: memoryview
+    dpi: int
+    pixmap: Any = None
+
+    @classmethod
+    def from_pixmap(cls, pix: fitz.Pixmap, dpi: int) -> PageImage:
+        return cls(pix.width, pix.height, pix.samples_mv, dpi, pix)
+
+    def to_pil(self) -> Image.Image:
+        return Image.frombuffer("RGB", (self.width, self.height), self.samples, "raw", "RGB", 0, 1)
+
+    def scaled(self, dpi: int) -> PageImage:
+        """A copy downscaled to dpi (below this image's), Lanczos-filtered."""
+        size = (
+            max(1, round(self.width * dpi / self.dpi)),
+            max(1, round(self.height * dpi / self.dpi)),
+        )
+        # reducing_gap box-reduces by whole factors first, then resamples the rest.
+        image = self.to_pil().resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        return PageImage(image.width, image.height, memoryview(image.tobytes()), dpi)
+
+
+def encode_page(image: PageImage, dst: Path, encoding: Encoding) -> Path:
+    """Write image to dst (a single-page format); a failed write leaves no file."""
+    try:
+        if encoding.format is ImageFormat.PNG:
+            with PngWriter(
+                dst, image.width, image.height, level=encoding.png_level, dpi=image.dpi
+            ) as png:
+                png.write_rows(image.samples)
+        elif encoding.format is ImageFormat.JPEG:
+            image.to_pil().save(dst, "JPEG", quality=encoding.quality, dpi=(image.dpi, image.dpi))
+        elif encoding.format is ImageFormat.WEBP:
+            image.to_pil().save(dst, "WEBP", quality=encoding.quality)
+        else:
+            raise ValueError(f"{encoding.format.name} is a multi-page format")
+    except BaseException:
+        remove_partial(dst)
+        raise
+    return dst
+
+
+class TiffWriter:
+    """
+    Multi-page TIFF written one page at a time (deflate-compressed), so only
+    the page being added is held in memory. Pages must be added in order.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.pages = 0
+        self._file = open(path, "w+b")  # noqa: SIM115
+        self._tiff: TiffImagePlugin.AppendingTiffWriter | None = (
+            TiffImagePlugin.AppendingTiffWriter(self._file)
+        )
+
+    def add(self, image: PageImage) -> Path:
+        image.to_pil().save(
+            self._tiff, "TIFF", compression="tiff_deflate", dpi=(image.dpi, image.dpi)
+        )
+        self._tiff.newFrame()
+        self.pages += 1
+        return self.path
+
+    def close(self) -> None:
+        if not self._file.closed:
+            # Finishes the last page. Pillow's writer finishes again when it
+            # is collected, so it must go before the file is closed.
+            self._tiff.close()
+            self._tiff = None
+            self._file.close()
+
+    def __enter__(self) -> TiffWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+        if exc_type is not None:
+            remove_partial(self.path)
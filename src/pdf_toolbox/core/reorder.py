@@ -6,9 +6,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pikepdf
 
+from pdf_toolbox.core.cancel import CancelToken, check_cancelled
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 @dataclass
 class ReorderResult:
@@ -23,11 +29,15 @@ def reorder_pdf(
     src: Path,
     dst: Path,
     new_order: list[int],
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
 ) -> ReorderResult:
     """
     Reorder pages of a PDF according to new_order.
     new_order: list of 0-based page indices in desired order.
     e.g. [2, 0, 1] means: page 3 first, then page 1, then page 2.
+    on_progress: called as (done, total) after every copied page.
+    cancel: checked for every page; raises OperationCancelledError before saving.
     """
     with pikepdf.open(str(src)) as pdf:
         total = len(pdf.pages)
@@ -42,8 +52,11 @@ def reorder_pdf(
                 )
 
         new_pdf = pikepdf.Pdf.new()
-        for idx in new_order:
+        for done, idx in enumerate(new_order, 1):
+            check_cancelled(cancel)
             new_pdf.pages.append(pdf.pages[idx])
+            if on_progress:
+                on_progress(done, len(new_order))
         new_pdf.save(str(dst))
         new_pdf.close()
 
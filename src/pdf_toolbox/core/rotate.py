@@ -6,9 +6,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pikepdf
 
+from pdf_toolbox.core.cancel import CancelToken, check_cancelled
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 @dataclass
 class RotateResult:
@@ -24,11 +30,15 @@ def rotate_pdf(
     dst: Path,
     degrees: int,
     page_indices: list[int] | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
 ) -> RotateResult:
     """
     Rotate pages of a PDF by the specified degrees.
     page_indices: 0-based list of pages to rotate. None = all pages.
     degrees: must be 90, 180, or 270.
+    on_progress: called as (done, total) after every target page.
+    cancel: checked for every page; raises OperationCancelledError before saving.
     """
     if degrees not in (90, 180, 270):
         return RotateResult(False, f"\u7121\u6548\u7684\u65cb\u8f49\u89d2\u5ea6: {degrees}")
@@ -38,12 +48,15 @@ def rotate_pdf(
         targets = page_indices if page_indices is not None else list(range(total))
         rotated_count = 0
 
-        for idx in targets:
+        for done, idx in enumerate(targets, 1):
+            check_cancelled(cancel)
             if 0 <= idx < total:
                 page = pdf.pages[idx]
                 current = int(page.get("/Rotate", 0))
                 page["/Rotate"] = (current + degrees) % 360
                 rotated_count += 1
+            if on_progress:
+                on_progress(done, len(targets))
 
         pdf.save(str(dst))
 
@@ -7,9 +7,22 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+import fitz  # PyMuPDF
 import pikepdf
 
+from pdf_toolbox.core.batch import FileJob, iter_parallel
+from pdf_toolbox.core.cancel import (
+    CancelToken,
+    OperationCancelledError,
+    check_cancelled,
+    remove_partial,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 class SplitMode(Enum):
     """How to split the PDF."""
@@ -64,57 +77,223 @@ def split_pdf(
     page_ranges: str = "",
     pages_per_split: int = 1,
     page_numbers: list[int] | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+    max_workers: int = 1,
 ) -> SplitResult:
-    """Split a PDF according to the specified mode."""
+    """
+    Split a PDF according to the specified mode.
+    Each output file gets its pages as whole ranges copied by PyMuPDF, which
+    carries over the resources they use once per file.
+    With max_workers > 1, the output files of BY_RANGE and EVERY_N_PAGES are
+    dealt out in consecutive shards to up to max_workers processes, each
+    opening the source once and writing its files while the others write
+    theirs; documents too small to repay starting the processes are split
+    in this process.
+    on_progress(done, total) is called for every page, once the file holding
+    it is saved.
+    cancel is checked between files; on cancellation the files written so
+    far are removed and OperationCancelledError is raised.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
     output_files: list[Path] = []
+    try:
+        return _split(
+            src,
+            output_dir,
+            mode,
+            page_ranges,
+            pages_per_split,
+            page_numbers,
+            on_progress,
+            cancel,
+            max_workers,
+            output_files,
+        )
+    except OperationCancelledError:
+        remove_partial(*output_files)
+        raise
 
-    with pikepdf.open(str(src)) as pdf:
-        total = len(pdf.pages)
+
+def _split(
+    src: Path,
+    output_dir: Path,
+    mode: SplitMode,
+    page_ranges: str,
+    pages_per_split: int,
+    page_numbers: list[int] | None,
+    on_progress: Callable[[int, int], None] | None,
+    cancel: CancelToken | None,
+    max_workers: int,
+    output_files: list[Path],
+) -> SplitResult:
+    """split_pdf body; appends each written file to output_files."""
+    with fitz.open(str(src)) as doc:
+        if not doc.is_pdf or doc.needs_pass:
+            raise ValueError("\u4e0d\u662f PDF \u6a94\u6848\u6216\u9700\u8981\u5bc6\u78bc")
+        total = doc.page_count
 
         if mode == SplitMode.BY_RANGE:
             ranges = parse_page_ranges(page_ranges, total)
             if not ranges:
                 return SplitResult(False, "\u7121\u6548\u7684\u9801\u78bc\u7bc4\u570d\u3002")
-            for start, end in ranges:
-                out_pdf = pikepdf.Pdf.new()
-                for page_idx in range(start, end + 1):
-                    out_pdf.pages.append(pdf.pages[page_idx])
-                out_path = output_dir / f"{src.stem}_p{start + 1}-{end + 1}.pdf"
-                out_pdf.save(str(out_path))
-                out_pdf.close()
-                output_files.append(out_path)
+            parts = [
+                _Part(start, end, output_dir / f"{src.stem}_p{start + 1}-{end + 1}.pdf")
+                for start, end in ranges
+            ]
 
         elif mode == SplitMode.EVERY_N_PAGES:
             n = max(1, pages_per_split)
-            for chunk_start in range(0, total, n):
-                chunk_end = min(chunk_start + n, total)
-                out_pdf = pikepdf.Pdf.new()
-                for page_idx in range(chunk_start, chunk_end):
-                    out_pdf.pages.append(pdf.pages[page_idx])
-                out_path = output_dir / f"{src.stem}_p{chunk_start + 1}-{chunk_end}.pdf"
-                out_pdf.save(str(out_path))
-                out_pdf.close()
-                output_files.append(out_path)
+            parts = []
+            for start in range(0, total, n):
+                end = min(start + n, total)
+                parts.append(
+                    _Part(start, end - 1, output_dir / f"{src.stem}_p{start + 1}-{end}.pdf")
+                )
 
-        elif mode == SplitMode.EXTRACT_PAGES:
+        else:
+            # One file of the pages picked, written here.
+            parts = []
             indices = page_numbers or []
             if not indices:
                 return SplitResult(
                     False, "\u672a\u6307\u5b9a\u8981\u63d0\u53d6\u7684\u9801\u78bc\u3002"
                 )
-            out_pdf = pikepdf.Pdf.new()
             valid_pages = [p for p in indices if 0 <= p < total]
-            for page_idx in valid_pages:
-                out_pdf.pages.append(pdf.pages[page_idx])
+            if not valid_pages:
+                return SplitResult(
+                    False,
+                    "\u6307\u5b9a\u7684\u9801\u78bc\u8d85\u51fa\u6587\u4ef6\u7bc4\u570d\u3002",
+                )
             pages_str = ",".join(str(p + 1) for p in valid_pages)
             out_path = output_dir / f"{src.stem}_extracted_p{pages_str}.pdf"
-            out_pdf.save(str(out_path))
-            out_pdf.close()
+            check_cancelled(cancel)
+            with fitz.open() as out_pdf:
+                for first, last in _runs(valid_pages):
+                    out_pdf.insert_pdf(doc, from_page=first, to_page=last, final=False)
+                out_pdf.save(str(out_path))
             output_files.append(out_path)
+            if on_progress:
+                for page in range(1, len(valid_pages) + 1):
+                    on_progress(page, len(valid_pages))
+
+        planned = sum(part.page_count for part in parts)
+        done = 0
+
+        def written(pages: int) -> None:
+            nonlocal done
+            for _ in range(pages):
+                done += 1
+                if on_progress:
+                    on_progress(done, planned)
+
+        workers = min(max_workers, len(parts), planned // _MIN_PAGES_PER_WORKER)
+        if workers > 1:
+            _write_sharded(src, parts, workers, cancel, output_files, written)
+        else:
+            _write_parts(doc, parts, cancel, output_files, written)
 
     return SplitResult(
         True,
         f"\u62c6\u5206\u5b8c\u6210\uff0c\u7522\u751f {len(output_files)} \u500b\u6a94\u6848\u3002",
         output_files,
     )
+
+
+# A parallel split gives every process at least this many pages to write,
+# which outweighs starting it, and deals out this many shards per process,
+# so one that writes larger pages than the others holds up less.
+_MIN_PAGES_PER_WORKER = 256
+_SHARDS_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class _Part:
+    """One output file: pages first..last (0-based, inclusive) of the source."""
+
+    first: int
+    last: int
+    path: Path
+
+    @property
+    def page_count(self) -> int:
+        return self.last - self.first + 1
+
+
+def _runs(pages: list[int]) -> list[tuple[int, int]]:
+    """Group pages into (first, last) runs of consecutive ascending pages, in order."""
+    runs: list[tuple[int, int]] = []
+    for page in pages:
+        if runs and page == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+
+def _write_parts(
+    doc: fitz.Document,
+    parts: list[_Part],
+    cancel: CancelToken | None,
+    output_files: list[Path],
+    on_written: Callable[[int], None] | None = None,
+) -> None:
+    for part in parts:
+        check_cancelled(cancel)
+        with fitz.open() as out_pdf:
+            out_pdf.insert_pdf(doc, from_page=part.first, to_page=part.last)
+            out_pdf.save(str(part.path))
+        output_files.append(part.path)
+        if on_written:
+            on_written(part.page_count)
+
+
+# The source a worker process has open, by (path, size, mtime): shards of
+# the same split that land on the process reuse it instead of opening it
+# again. It is closed with the process.
+_shard_source: tuple[tuple[str, int, int], fitz.Document] | None = None
+
+
+def _open_shard_source(src: Path) -> fitz.Document:
+    global _shard_source
+    stat = src.stat()
+    key = (str(src), stat.st_size, stat.st_mtime_ns)
+    if _shard_source is None or _shard_source[0] != key:
+        if _shard_source is not None:
+            _shard_source[1].close()
+        _shard_source = (key, fitz.open(str(src)))
+    return _shard_source[1]
+
+
+def _write_shard(src: Path, parts: list[_Part], cancel: CancelToken | None = None) -> list[Path]:
+    """Write parts of src in a worker process; a cancelled shard removes its files."""
+    output_files: list[Path] = []
+    try:
+        _write_parts(_open_shard_source(src), parts, cancel, output_files)
+    except OperationCancelledError:
+        remove_partial(*output_files)
+        raise
+    return output_files
+
+
+def _write_sharded(
+    src: Path,
+    parts: list[_Part],
+    max_workers: int,
+    cancel: CancelToken | None,
+    output_files: list[Path],
+    on_written: Callable[[int], None],
+) -> None:
+    size = -(-len(parts) // min(len(parts), max_workers * _SHARDS_PER_WORKER))
+    shards = [parts[start : start + size] for start in range(0, len(parts), size)]
+    jobs = (
+        FileJob(src, _write_shard, {"src": src, "parts": shard, "cancel": cancel})
+        for shard in shards
+    )
+    for job, outcome in iter_parallel(jobs, max_workers, cancel):
+        if isinstance(outcome, BaseException):
+            raise outcome
+        output_files.extend(outcome)
+        on_written(sum(part.page_count for part in job.kwargs["parts"]))
+    # Shards not started when cancel was triggered are dropped, not yielded.
+    check_cancelled(cancel)
@@ -5,14 +5,30 @@ Ported from pdf_unlocker_007_(work).py, stripped of all UI and pip logic.
 
 from __future__ import annotations
 
+import functools
 import shutil
-import subprocess
-import sys
 from dataclasses import dataclass
 from enum import Enum, auto
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from pdf_toolbox.core.cancel import (
+    CancelToken,
+    OperationCancelledError,
+    check_cancelled,
+    remove_partial,
+    run_process,
+)
+from pdf_toolbox.core.capabilities import (
+    GHOSTSCRIPT,
+    PIKEPDF,
+    PYMUPDF,
+    PYPDF2,
+    get_registry,
+    ghostscript_command,
+)
+from pdf_toolbox.core.ghostscript import session_for
+
 if TYPE_CHECKING:
     from collections.abc import Callable
 
@@ -37,7 +53,9 @@ class RepairResult:
     output_path: Path | None = None
 
 
-def _repair_with_pymupdf(src: Path, dst: Path, password: str | None = None) -> RepairResult:
+def _repair_with_pymupdf(
+    src: Path, dst: Path, password: str | None = None, cancel: CancelToken | None = None
+) -> RepairResult:
     """Repair using PyMuPDF (fitz)."""
     import fitz
 
@@ -47,6 +65,7 @@ def _repair_with_pymupdf(src: Path, dst: Path, password: str | None = None) -> R
             doc.authenticate(password or "")
         new_doc = fitz.open()
         new_doc.insert_pdf(doc)
+        check_cancelled(cancel)
         new_doc.save(str(dst))
         new_doc.close()
     finally:
@@ -54,7 +73,9 @@ def _repair_with_pymupdf(src: Path, dst: Path, password: str | None = None) -> R
     return RepairResult(True, RepairEngine.PYMUPDF, "PyMuPDF \u4fee\u5fa9\u6210\u529f", dst)
 
 
-def _repair_with_pypdf2(src: Path, dst: Path, password: str | None = None) -> RepairResult:
+def _repair_with_pypdf2(
+    src: Path, dst: Path, password: str | None = None, cancel: CancelToken | None = None
+) -> RepairResult:
     """Repair using PyPDF2."""
     from PyPDF2 import PdfReader, PdfWriter
 
@@ -64,13 +85,16 @@ def _repair_with_pypdf2(src: Path, dst: Path, password: str | None = None) -> Re
             reader.decrypt(password or "")
         writer = PdfWriter()
         for page in reader.pages:
+            check_cancelled(cancel)
             writer.add_page(page)
         with open(dst, "wb") as out:
             writer.write(out)
     return RepairResult(True, RepairEngine.PYPDF2, "PyPDF2 \u4fee\u5fa9\u6210\u529f", dst)
 
 
-def _repair_with_pikepdf(src: Path, dst: Path, password: str | None = None) -> RepairResult:
+def _repair_with_pikepdf(
+    src: Path, dst: Path, password: str | None = None, cancel: CancelToken | None = None
+) -> RepairResult:
     """Repair using pikepdf."""
     import pikepdf
 
@@ -79,86 +103,69 @@ def _repair_with_pikepdf(src: Path, dst: Path, password: str | None = None) -> R
     return RepairResult(True, RepairEngine.PIKEPDF, "pikepdf \u4fee\u5fa9\u6210\u529f", dst)
 
 
-def _find_ghostscript() -> str | None:
-    """Find the Ghostscript command on this system."""
-    gs_commands = ["gs", "gswin64c", "gswin32c", "ghostscript"]
-    for cmd in gs_commands:
-        try:
-            subprocess.run(
-                [cmd, "--version"],
-                capture_output=True,
-                check=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
-            )
-            return cmd
-        except FileNotFoundError, subprocess.CalledProcessError:
-            continue
-    return None
-
-
-def _repair_with_ghostscript(src: Path, dst: Path, password: str | None = None) -> RepairResult:
-    """Repair using Ghostscript."""
-    gs_cmd = _find_ghostscript()
+def _repair_with_ghostscript(
+    src: Path,
+    dst: Path,
+    password: str | None = None,
+    cancel: CancelToken | None = None,
+    batched: bool = False,
+) -> RepairResult:
+    """Repair using Ghostscript (in this thread's long-lived session if batched)."""
+    gs_cmd = ghostscript_command()
     if not gs_cmd:
         return RepairResult(False, RepairEngine.GHOSTSCRIPT, "Ghostscript \u672a\u5b89\u88dd")
 
-    cmd = [
-        gs_cmd,
-        "-sDEVICE=pdfwrite",
-        "-dCompatibilityLevel=1.4",
-        "-dPDFSETTINGS=/prepress",
-        "-dNOPAUSE",
-        "-dQUIET",
-        "-dBATCH",
-        f"-sOutputFile={dst}",
-        str(src),
-    ]
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
-    )
-    if result.returncode == 0 and dst.exists() and dst.stat().st_size > 0:
+    device_args = ["-dCompatibilityLevel=1.4", "-dPDFSETTINGS=/prepress"]
+    if batched:
+        outcome = session_for(gs_cmd, device_args, src, dst).convert(src, dst, cancel=cancel)
+        ok, errors = outcome.success, outcome.output
+    else:
+        cmd = [
+            gs_cmd,
+            "-sDEVICE=pdfwrite",
+            *device_args,
+            "-dNOPAUSE",
+            "-dQUIET",
+            "-dBATCH",
+            f"-sOutputFile={dst}",
+            str(src),
+        ]
+        result = run_process(cmd, cancel)
+        ok, errors = result.returncode == 0, result.stderr
+    if ok and dst.exists() and dst.stat().st_size > 0:
         return RepairResult(
             True, RepairEngine.GHOSTSCRIPT, "Ghostscript \u4fee\u5fa9\u6210\u529f", dst
         )
     return RepairResult(
-        False, RepairEngine.GHOSTSCRIPT, f"Ghostscript \u5931\u6557: {result.stderr.strip()}"
+        False, RepairEngine.GHOSTSCRIPT, f"Ghostscript \u5931\u6557: {errors.strip()}"
     )
 
 
-def _repair_with_copy(src: Path, dst: Path, password: str | None = None) -> RepairResult:
+def _repair_with_copy(
+    src: Path, dst: Path, password: str | None = None, cancel: CancelToken | None = None
+) -> RepairResult:
     """Last resort: simple file copy."""
     shutil.copy2(src, dst)
     return RepairResult(True, RepairEngine.SIMPLE_COPY, "\u7c21\u55ae\u8907\u88fd\u5b8c\u6210", dst)
 
 
-def available_engines() -> list[RepairEngine]:
-    """Detect which engines are importable / installed."""
-    engines: list[RepairEngine] = []
-    try:
-        import fitz  # noqa: F401
-
-        engines.append(RepairEngine.PYMUPDF)
-    except ImportError:
-        pass
-    try:
-        import PyPDF2  # noqa: F401
+# Capability each engine needs (simple copy needs none).
+_ENGINE_CAPABILITIES = {
+    RepairEngine.PYMUPDF: PYMUPDF,
+    RepairEngine.PYPDF2: PYPDF2,
+    RepairEngine.PIKEPDF: PIKEPDF,
+    RepairEngine.GHOSTSCRIPT: GHOSTSCRIPT,
+}
 
-        engines.append(RepairEngine.PYPDF2)
-    except ImportError:
-        pass
-    try:
-        import pikepdf  # noqa: F401
 
-        engines.append(RepairEngine.PIKEPDF)
-    except ImportError:
-        pass
-    if _find_ghostscript():
-        engines.append(RepairEngine.GHOSTSCRIPT)
-    engines.append(RepairEngine.SIMPLE_COPY)
-    return engines
+def available_engines() -> list[RepairEngine]:
+    """Engines whose library or tool is installed, in the order they are tried."""
+    registry = get_registry()
+    return [
+        engine
+        for engine in RepairEngine
+        if engine not in _ENGINE_CAPABILITIES or registry.available(_ENGINE_CAPABILITIES[engine])
+    ]
 
 
 _ENGINE_FUNCS = {
@@ -176,26 +183,45 @@ def repair_pdf(
     password: str | None = None,
     engines: list[RepairEngine] | None = None,
     on_attempt: Callable[[str], None] | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+    batched: bool = False,
 ) -> RepairResult:
     """
     Try each available engine in order until one succeeds.
     Returns the first successful result, or a failure result.
+    on_progress(done, total) counts engine attempts; it reaches total on success.
+    cancel is checked between and inside engines; a cancelled repair removes
+    its partial output and raises OperationCancelledError.
+    batched sends the Ghostscript engine to a long-lived session (core.ghostscript).
     """
     if engines is None:
         engines = available_engines()
 
-    for engine in engines:
+    for step, engine in enumerate(engines):
         func = _ENGINE_FUNCS.get(engine)
         if func is None:
             continue
-
+        if engine is RepairEngine.GHOSTSCRIPT and batched:
+            func = functools.partial(func, batched=True)
+        if on_progress:
+            on_progress(step, len(engines))
+
+        if cancel is not None and cancel.is_cancelled:
+            remove_partial(dst)
+            raise OperationCancelledError
         if on_attempt:
             on_attempt(engine.name)
 
         try:
-            result = func(src, dst, password)
+            result = func(src, dst, password, cancel)
             if result.success and dst.exists() and dst.stat().st_size > 0:
+                if on_progress:
+                    on_progress(len(engines), len(engines))
                 return result
+        except OperationCancelledError:
+            remove_partial(dst)
+            raise
         except Exception as exc:
             if on_attempt:
                 on_attempt(f"{engine.name} \u5931\u6557: {exc}")
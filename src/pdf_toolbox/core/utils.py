@@ -4,15 +4,23 @@ Shared utility functions used across core modules.
 
 from __future__ import annotations
 
+import os
+import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from collections.abc import Set
 
-def ensure_unique_path(path: Path) -> Path:
+
+def ensure_unique_path(path: Path, reserved: Set[Path] | None = None) -> Path:
     """
     If path exists, append _1, _2, etc. before extension.
     "doc.pdf" -> "doc_1.pdf" -> "doc_2.pdf" ...
+    Paths in reserved (claimed by jobs that have not written yet) count as taken.
     """
-    if not path.exists():
+    taken = reserved or frozenset()
+    if not path.exists() and path not in taken:
         return path
     stem = path.stem
     ext = path.suffix
@@ -20,7 +28,7 @@ def ensure_unique_path(path: Path) -> Path:
     counter = 1
     while True:
         candidate = parent / f"{stem}_{counter}{ext}"
-        if not candidate.exists():
+        if not candidate.exists() and candidate not in taken:
             return candidate
         counter += 1
 
@@ -46,3 +54,18 @@ def human_readable_size(size_bytes: int) -> str:
             return f"{size_bytes:.1f} {unit}"
         size_bytes /= 1024
     return f"{size_bytes:.1f} TB"
+
+
+def app_data_dir() -> Path:
+    """
+    Per-user directory for the toolbox's own files (journals, caches).
+    PDF_TOOLBOX_HOME overrides the platform default.
+    """
+    override = os.environ.get("PDF_TOOLBOX_HOME")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / "PDF_Toolbox"
+    base = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    return Path(base) / "pdf_toolbox"
@@ -6,9 +6,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import fitz  # PyMuPDF
 
+from pdf_toolbox.core.cancel import CancelToken, check_cancelled
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 @dataclass
 class WatermarkConfig:
@@ -38,19 +44,46 @@ def add_watermark(
     dst: Path,
     config: WatermarkConfig,
     page_indices: list[int] | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
 ) -> WatermarkResult:
     """
     Add a text or image watermark to PDF pages.
     Uses PyMuPDF for both text and image watermarks.
+    on_progress(done, total) is called after every target page.
+    cancel is checked for every page; raises OperationCancelledError before saving.
     """
     doc = fitz.open(str(src))
     try:
-        total = len(doc)
-        targets = page_indices if page_indices is not None else list(range(total))
+        count = watermark_document(doc, config, page_indices, on_progress, cancel)
+        doc.save(str(dst))
+    finally:
+        doc.close()
+
+    return WatermarkResult(
+        True,
+        f"\u6d6e\u6c34\u5370\u65b0\u589e\u5b8c\u6210\uff01\u5171\u8655\u7406 {count} \u9801",
+        dst,
+    )
+
 
-        for idx in targets:
-            if idx < 0 or idx >= total:
-                continue
+def watermark_document(
+    doc: fitz.Document,
+    config: WatermarkConfig,
+    page_indices: list[int] | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancel: CancelToken | None = None,
+) -> int:
+    """
+    Watermark the pages of an open document in place (see add_watermark).
+    Returns the number of target pages.
+    """
+    total = len(doc)
+    targets = page_indices if page_indices is not None else list(range(total))
+
+    for done, idx in enumerate(targets, 1):
+        check_cancelled(cancel)
+        if 0 <= idx < total:
             page = doc[idx]
 
             if config.text:
@@ -58,15 +91,10 @@ def add_watermark(
             elif config.image_path and config.image_path.exists():
                 _add_image_watermark(page, config)
 
-        doc.save(str(dst))
-    finally:
-        doc.close()
+        if on_progress:
+            on_progress(done, len(targets))
 
-    return WatermarkResult(
-        True,
-        f"\u6d6e\u6c34\u5370\u65b0\u589e\u5b8c\u6210\uff01\u5171\u8655\u7406 {len(targets)} \u9801",
-        dst,
-    )
+    return len(targets)
 
 
 def _add_text_watermark(page: fitz.Page, config: WatermarkConfig) -> None:
@@ -27,4 +27,6 @@ PAGE_ICONS: list[tuple[str, str]] = [
     ("\U0001f4a7", "浮水印"),
     ("\U0001f4e6", "壓縮"),
     ("\u2195\ufe0f", "頁面重排序"),
+    ("\U0001f517", "多步驟流程"),
+    ("\U0001f4cb", "工作佇列"),
 ]
@@ -144,7 +144,9 @@ class MainWindow(QMainWindow):
         from pdf_toolbox.gui.pages.convert_page import ConvertPage
         from pdf_toolbox.gui.pages.home_page import HomePage
         from pdf_toolbox.gui.pages.merge_page import MergePage
+        from pdf_toolbox.gui.pages.pipeline_page import PipelinePage
         from pdf_toolbox.gui.pages.protect_page import ProtectPage
+        from pdf_toolbox.gui.pages.queue_page import JobQueuePage
         from pdf_toolbox.gui.pages.reorder_page import ReorderPage
         from pdf_toolbox.gui.pages.rotate_page import RotatePage
         from pdf_toolbox.gui.pages.split_page import SplitPage
@@ -162,6 +164,8 @@ class MainWindow(QMainWindow):
             WatermarkPage,  # 7: Watermark
             CompressPage,  # 8: Compress
             ReorderPage,  # 9: Reorder
+            PipelinePage,  # 10: Pipeline
+            JobQueuePage,  # 11: Job queue
         ]
 
         for page_cls in page_classes:
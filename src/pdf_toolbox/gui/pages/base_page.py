@@ -9,15 +9,20 @@ from pathlib import Path
 
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (
+    QCheckBox,
     QHBoxLayout,
     QLabel,
     QMessageBox,
     QPushButton,
     QScrollArea,
+    QSpinBox,
     QVBoxLayout,
     QWidget,
 )
 
+from pdf_toolbox.core.batch import default_max_workers
+from pdf_toolbox.core.cache import ResultCache, default_cache_dir
+from pdf_toolbox.core.journal import default_journal_path
 from pdf_toolbox.gui.theme import PALETTE
 from pdf_toolbox.gui.widgets.drop_zone import DropZone
 from pdf_toolbox.gui.widgets.file_list import FileListWidget
@@ -25,6 +30,7 @@ from pdf_toolbox.gui.widgets.log_panel import LogPanel
 from pdf_toolbox.gui.widgets.output_dir_selector import OutputDirSelector
 from pdf_toolbox.gui.widgets.progress_panel import ProgressPanel
 from pdf_toolbox.workers.base_worker import BaseWorker
+from pdf_toolbox.workers.scheduler import get_scheduler
 
 
 class BasePage(QWidget):
@@ -35,11 +41,17 @@ class BasePage(QWidget):
       [FileList]
       [Settings area]      <-- build_settings_area()
       [OutputDirSelector]
+      [Parallel / resume / cache]  <-- only if supports_parallel
       [ProgressPanel]
       [LogPanel]
       [Start / Cancel]
     """
 
+    # Whether the page's worker runs per-file jobs: it can spread files over a
+    # process pool, keeps a job journal that a batch can be resumed from and
+    # can reuse outputs from the result cache.
+    supports_parallel: bool = True
+
     def __init__(
         self,
         title: str,
@@ -50,7 +62,9 @@ class BasePage(QWidget):
         self._title_text = title
         self._description_text = description
         self._worker: BaseWorker | None = None
+        self._job_id: int | None = None
         self._setup_layout()
+        get_scheduler().job_cancelled.connect(self._on_job_cancelled)
 
     def _setup_layout(self) -> None:
         # Wrap content in scroll area for small screens
@@ -100,6 +114,36 @@ class BasePage(QWidget):
         self.output_dir_selector = OutputDirSelector()
         layout.addWidget(self.output_dir_selector)
 
+        # Parallel workers
+        self._jobs_spin = QSpinBox()
+        self._jobs_spin.setRange(1, max(1, default_max_workers()))
+        self._jobs_spin.setValue(1)
+        self._jobs_spin.setSuffix(" \u500b\u9032\u7a0b")
+        self._jobs_spin.setToolTip(
+            "\u540c\u6642\u8655\u7406\u7684\u6a94\u6848\u6578\uff0c1 \u8868\u793a\u4f9d\u5e8f\u8655\u7406"
+        )
+        self._resume_check = QCheckBox(
+            "\u7e8c\u50b3\uff1a\u7565\u904e\u5148\u524d\u5df2\u5b8c\u6210\u7684\u6a94\u6848"
+        )
+        self._resume_check.setToolTip(
+            "\u8f38\u5165\u6a94\u3001\u8a2d\u5b9a\u8207\u8f38\u51fa\u8cc7\u6599\u593e\u7686\u76f8\u540c"
+            "\u4e14\u8f38\u51fa\u4ecd\u5b58\u5728\u6642\uff0c\u4e0d\u518d\u91cd\u65b0\u8655\u7406"
+        )
+        self._cache_check = QCheckBox("\u7d50\u679c\u5feb\u53d6")
+        self._cache_check.setToolTip(
+            "\u5167\u5bb9\u8207\u8a2d\u5b9a\u7686\u76f8\u540c\u7684\u6a94\u6848\u76f4\u63a5"
+            "\u53d6\u7528\u5148\u524d\u7684\u8f38\u51fa\uff0c\u4e0d\u518d\u91cd\u65b0\u8655\u7406"
+        )
+        if self.supports_parallel:
+            jobs_row = QHBoxLayout()
+            jobs_row.addWidget(QLabel("\u4e26\u884c\u8655\u7406:"))
+            jobs_row.addWidget(self._jobs_spin)
+            jobs_row.addSpacing(16)
+            jobs_row.addWidget(self._resume_check)
+            jobs_row.addWidget(self._cache_check)
+            jobs_row.addStretch()
+            layout.addLayout(jobs_row)
+
         # Progress
         self.progress_panel = ProgressPanel()
         layout.addWidget(self.progress_panel)
@@ -161,20 +205,50 @@ class BasePage(QWidget):
             self._set_running(False)
             return
 
+        if self.supports_parallel:
+            self._worker.set_max_workers(self._jobs_spin.value())
+            self._worker.set_journal(
+                default_journal_path(type(self).__name__), resume=self._resume_check.isChecked()
+            )
+            if self._cache_check.isChecked():
+                self._worker.set_cache(ResultCache(default_cache_dir()))
         self._worker.progress_updated.connect(self.progress_panel.update_progress)
-        self._worker.log_message.connect(self.log_panel.append)
-        self._worker.file_completed.connect(self._on_file_completed)
+        self._worker.step_progress.connect(self.progress_panel.update_step)
+        self._worker.log_messages.connect(self.log_panel.append_many)
+        self._worker.files_completed.connect(self._on_files_completed)
         self._worker.task_finished.connect(self._on_task_finished)
-        self._worker.start()
+        self._worker.started.connect(self._on_worker_started)
+        self.progress_panel.update_progress(
+            0, 0, "\u6392\u968a\u4e2d\uff0c\u7b49\u5f85\u5176\u4ed6\u5de5\u4f5c\u5b8c\u6210..."
+        )
+        self._job_id = get_scheduler().submit(self._worker, self._title_text).job_id
 
     def _on_cancel_clicked(self) -> None:
-        if self._worker and self._worker.isRunning():
-            self._worker.cancel()
+        if self._worker is not None and not self._worker.isFinished():
+            get_scheduler().cancel(self._worker)
+
+    def _on_job_cancelled(self, job_id: int) -> None:
+        # The job was cancelled while queued; its worker never ran.
+        if job_id != self._job_id:
+            return
+        job = get_scheduler().job(job_id)
+        self._on_task_finished(False, job.summary if job is not None else "", [])
+
+    def _on_worker_started(self) -> None:
+        self.progress_panel.reset()
+        self.progress_panel.update_progress(0, 0, "\u958b\u59cb\u8655\u7406...")
+
+    def _on_files_completed(self, files: list) -> None:
+        for name, success, msg in files:
+            self._on_file_completed(name, success, msg)
 
     def _on_file_completed(self, name: str, success: bool, msg: str) -> None:
         """Can be overridden for per-file UI updates."""
 
     def _on_task_finished(self, success: bool, summary: str, results: list) -> None:
+        # The scheduler deletes the worker once its job ends.
+        self._worker = None
+        self._job_id = None
         self._set_running(False)
         self.progress_panel.set_finished(summary)
         if success:
@@ -187,6 +261,9 @@ class BasePage(QWidget):
         self.cancel_btn.setEnabled(running)
         self.drop_zone.setEnabled(not running)
         self.file_list.setEnabled(not running)
+        self._jobs_spin.setEnabled(not running)
+        self._resume_check.setEnabled(not running)
+        self._cache_check.setEnabled(not running)
 
     @staticmethod
     def _make_button(text: str, cls: str) -> QPushButton:
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from PySide6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QVBoxLayout
+from PySide6.QtWidgets import QCheckBox, QComboBox, QHBoxLayout, QLabel, QVBoxLayout
 
 from pdf_toolbox.core.compress import CompressionLevel
 from pdf_toolbox.gui.pages.base_page import BasePage
@@ -43,6 +43,13 @@ class CompressPage(BasePage):
             self._level_combo.addItem(label)
         self._level_combo.setCurrentIndex(1)  # Default to MEDIUM
         row.addWidget(self._level_combo)
+        row.addSpacing(16)
+        self._batch_check = QCheckBox("\u5927\u91cf\u5c0f\u6a94\u6a21\u5f0f")
+        self._batch_check.setToolTip(
+            "\u91cd\u8907\u4f7f\u7528\u540c\u4e00\u500b Ghostscript \u9032\u7a0b\u8655\u7406\u6240\u6709\u6a94\u6848\uff0c"
+            "\u7701\u53bb\u6bcf\u500b\u6a94\u6848\u7684\u555f\u52d5\u6642\u9593"
+        )
+        row.addWidget(self._batch_check)
         row.addStretch()
         layout.addLayout(row)
 
@@ -56,4 +63,6 @@ class CompressPage(BasePage):
     def create_worker(self, files: list[Path]) -> BaseWorker:
         _, level = _LEVELS[self._level_combo.currentIndex()]
         out_dir = self.output_dir_selector.get_output_dir(files[0] if files else None)
-        return CompressWorker(files, level=level, output_dir=out_dir)
+        return CompressWorker(
+            files, level=level, output_dir=out_dir, batched=self._batch_check.isChecked()
+        )
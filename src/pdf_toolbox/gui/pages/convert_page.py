@@ -6,12 +6,37 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from PySide6.QtWidgets import QHBoxLayout, QLabel, QPushButton, QSpinBox, QVBoxLayout
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+)
 
+from pdf_toolbox.core.convert import RenderEngine
+from pdf_toolbox.core.raster import DEFAULT_PNG_LEVEL, DEFAULT_QUALITY, ImageFormat
 from pdf_toolbox.gui.pages.base_page import BasePage
 from pdf_toolbox.workers.base_worker import BaseWorker
 from pdf_toolbox.workers.convert_worker import ConvertWorker
 
+_ENGINES = [
+    ("pdftoppm (poppler)", RenderEngine.PDFTOPPM),
+    ("PyMuPDF\uff08\u591a\u6838\u5fc3\u4e26\u884c\uff09", RenderEngine.PYMUPDF),
+]
+
+_FORMATS = [
+    ("PNG", ImageFormat.PNG),
+    ("JPEG", ImageFormat.JPEG),
+    ("WebP", ImageFormat.WEBP),
+    ("TIFF\uff08\u591a\u9801\uff09", ImageFormat.TIFF),
+]
+# Formats pdftoppm can write; the others need PyMuPDF.
+_PDFTOPPM_FORMATS = {ImageFormat.PNG, ImageFormat.JPEG}
+
 
 class ConvertPage(BasePage):
     """PDF to PNG conversion page with DPI settings."""
@@ -20,8 +45,8 @@ class ConvertPage(BasePage):
         super().__init__(
             title="\U0001f5bc\ufe0f PDF \u8f49 PNG",
             description=(
-                "\u4f7f\u7528 pdftoppm \u5c07 PDF \u9801\u9762\u8f49\u63db\u70ba"
-                "\u9ad8\u89e3\u6790\u5ea6 PNG \u5716\u7247\u3002"
+                "\u4f7f\u7528 pdftoppm \u6216 PyMuPDF \u5c07 PDF \u9801\u9762\u8f49\u63db\u70ba"
+                "\u9ad8\u89e3\u6790\u5ea6 PNG\u3001JPEG\u3001WebP \u6216 TIFF \u5716\u7247\u3002"
             ),
             parent=parent,
         )
@@ -50,6 +75,145 @@ class ConvertPage(BasePage):
 
         layout.addLayout(row)
 
+        engine_row = QHBoxLayout()
+        engine_row.addWidget(QLabel("\u8f49\u63db\u5f15\u64ce:"))
+        self._engine_combo = QComboBox()
+        for label, _ in _ENGINES:
+            self._engine_combo.addItem(label)
+        self._engine_combo.setToolTip(
+            "PyMuPDF \u4ee5\u300c\u4e26\u884c\u8655\u7406\u300d\u7684\u9032\u7a0b\u6578\u540c\u6642\u8f49\u63db\u540c\u4e00\u4efd\u6587\u4ef6\u7684\u591a\u500b\u9801\u9762"
+        )
+        self._engine_combo.currentIndexChanged.connect(self._on_engine_changed)
+        engine_row.addWidget(self._engine_combo)
+        self._split_check = QCheckBox("\u5206\u6bb5\u5e73\u884c\u8f49\u63db")
+        self._split_check.setToolTip(
+            "\u4ee5\u591a\u500b pdftoppm \u540c\u6642\u8f49\u63db\u540c\u4e00\u4efd\u6587\u4ef6\u7684\u4e0d\u540c\u9801\u6bb5\uff0c\u9069\u5408\u9801\u6578\u5f88\u591a\u7684\u5927\u578b\u6587\u4ef6"
+        )
+        engine_row.addWidget(self._split_check)
+        self._fallback_check = QCheckBox("PyMuPDF \u5931\u6557\u6642\u6539\u7528 pdftoppm")
+        self._fallback_check.setEnabled(False)
+        engine_row.addWidget(self._fallback_check)
+        engine_row.addStretch()
+        layout.addLayout(engine_row)
+
+        budget_row = QHBoxLayout()
+        budget_row.addWidget(QLabel("\u8a18\u61b6\u9ad4\u4e0a\u9650:"))
+        self._budget_spin = QSpinBox()
+        self._budget_spin.setRange(0, 65536)
+        self._budget_spin.setSingleStep(256)
+        self._budget_spin.setValue(1024)
+        self._budget_spin.setSuffix(" MB")
+        self._budget_spin.setSpecialValueText("\u4e0d\u9650\u5236")
+        self._budget_spin.setToolTip(
+            "PyMuPDF \u8f49\u63db\u6642\u540c\u6642\u4fdd\u7559\u7684\u9ede\u9663\u5716\u4e0a\u9650\uff1b\u8d85\u904e\u7684\u5927\u5716\u9762\uff08\u5982 A0 \u9ad8 DPI\uff09"
+            "\u6703\u5206\u6bb5\u7e6a\u88fd\u4e26\u9010\u5217\u5beb\u5165 PNG"
+        )
+        self._budget_spin.setEnabled(False)
+        budget_row.addWidget(self._budget_spin)
+        budget_row.addStretch()
+        layout.addLayout(budget_row)
+
+        format_row = QHBoxLayout()
+        format_row.addWidget(QLabel("\u8f38\u51fa\u683c\u5f0f:"))
+        self._format_combo = QComboBox()
+        for label, _ in _FORMATS:
+            self._format_combo.addItem(label)
+        self._format_combo.currentIndexChanged.connect(self._update_format_options)
+        format_row.addWidget(self._format_combo)
+        format_row.addWidget(QLabel("PNG \u58d3\u7e2e:"))
+        self._png_level_spin = QSpinBox()
+        self._png_level_spin.setRange(0, 9)
+        self._png_level_spin.setValue(DEFAULT_PNG_LEVEL)
+        self._png_level_spin.setToolTip(
+            "0 \u6700\u5feb\u3001\u6a94\u6848\u6700\u5927\uff1b9 \u6700\u6162\u3001\u6a94\u6848\u6700\u5c0f"
+        )
+        format_row.addWidget(self._png_level_spin)
+        format_row.addWidget(QLabel("\u54c1\u8cea:"))
+        self._quality_spin = QSpinBox()
+        self._quality_spin.setRange(1, 100)
+        self._quality_spin.setValue(DEFAULT_QUALITY)
+        self._quality_spin.setToolTip("JPEG \u8207 WebP \u7684\u58d3\u7e2e\u54c1\u8cea")
+        format_row.addWidget(self._quality_spin)
+        format_row.addStretch()
+        layout.addLayout(format_row)
+
+        output_row = QHBoxLayout()
+        self._subdir_check = QCheckBox(
+            "\u6bcf\u4efd\u6587\u4ef6\u5404\u81ea\u4e00\u500b\u8cc7\u6599\u593e"
+        )
+        self._subdir_check.setToolTip(
+            "\u5728\u8f38\u51fa\u8cc7\u6599\u593e\u4e2d\u4ee5 PDF \u6a94\u540d\u5efa\u7acb\u5b50\u8cc7\u6599\u593e\uff0c\u5b58\u653e\u8a72\u6587\u4ef6\u7684\u6240\u6709\u9801\u9762"
+        )
+        output_row.addWidget(self._subdir_check)
+        self._manifest_check = QCheckBox("\u8f38\u51fa\u6e05\u55ae (JSON)")
+        self._manifest_check.setToolTip(
+            "\u53e6\u5b58 <\u6a94\u540d>.manifest.json\uff0c\u8a18\u9304\u6bcf\u4e00\u9801\u5c0d\u61c9\u7684\u5716\u7247\u6a94"
+        )
+        output_row.addWidget(self._manifest_check)
+        self._incremental_check = QCheckBox(
+            "\u53ea\u8f49\u63db\u65b0\u589e\u6216\u8b8a\u66f4\u7684\u9801\u9762"
+        )
+        self._incremental_check.setToolTip(
+            "\u4f9d\u4e0a\u6b21\u8f38\u51fa\u7684\u6e05\u55ae (JSON) \u7565\u904e PDF \u8207\u8a2d\u5b9a\u7686\u672a\u8b8a\u66f4\u3001\u4e14\u5716\u7247\u4ecd\u5728\u7684\u9801\u9762"
+        )
+        self._incremental_check.toggled.connect(self._on_incremental_toggled)
+        output_row.addWidget(self._incremental_check)
+        output_row.addWidget(QLabel("\u7e2e\u5c0f\u7248\u672c DPI:"))
+        self._pyramid_input = QLineEdit()
+        self._pyramid_input.setPlaceholderText("\u7121 (\u4f8b: 300,72)")
+        self._pyramid_input.setToolTip(
+            "\u6bcf\u9801\u53ea\u4ee5\u4e0a\u65b9 DPI \u7e6a\u88fd\u4e00\u6b21\uff0c\u518d\u7e2e\u5c0f\u6210\u9019\u4e9b\u89e3\u6790\u5ea6\uff0c\u5206\u5225\u5b58\u5165\u300c<DPI>dpi\u300d\u8cc7\u6599\u593e\uff08\u50c5\u9650 PyMuPDF\uff09"
+        )
+        output_row.addWidget(self._pyramid_input)
+        output_row.addStretch()
+        layout.addLayout(output_row)
+        self._update_format_options()
+        self._on_engine_changed(self._engine_combo.currentIndex())
+
+    def _on_engine_changed(self, index: int) -> None:
+        pymupdf = _ENGINES[index][1] is RenderEngine.PYMUPDF
+        self._fallback_check.setEnabled(pymupdf)
+        self._budget_spin.setEnabled(pymupdf)
+        self._split_check.setEnabled(not pymupdf)
+        self._pyramid_input.setEnabled(pymupdf)
+        # pdftoppm writes neither WebP nor multi-page TIFF.
+        model = self._format_combo.model()
+        for row, (_, fmt) in enumerate(_FORMATS):
+            model.item(row).setEnabled(pymupdf or fmt in _PDFTOPPM_FORMATS)
+        if not pymupdf and _FORMATS[self._format_combo.currentIndex()][1] not in _PDFTOPPM_FORMATS:
+            self._format_combo.setCurrentIndex(0)
+
+    def _on_incremental_toggled(self, checked: bool) -> None:
+        # The manifest is the record the next run compares against.
+        if checked:
+            self._manifest_check.setChecked(True)
+        self._manifest_check.setEnabled(not checked)
+
+    def _update_format_options(self) -> None:
+        _, fmt = _FORMATS[self._format_combo.currentIndex()]
+        self._png_level_spin.setEnabled(fmt is ImageFormat.PNG)
+        self._quality_spin.setEnabled(fmt in (ImageFormat.JPEG, ImageFormat.WEBP))
+
     def create_worker(self, files: list[Path]) -> BaseWorker:
         out_dir = self.output_dir_selector.get_output_dir(files[0] if files else None)
-        return ConvertWorker(files, dpi=self._dpi_spin.value(), output_dir=out_dir)
+        _, engine = _ENGINES[self._engine_combo.currentIndex()]
+        budget_mb = self._budget_spin.value()
+        _, image_format = _FORMATS[self._format_combo.currentIndex()]
+        pyramid_str = self._pyramid_input.text().strip()
+        pyramid = [int(x.strip()) for x in pyramid_str.split(",") if x.strip().isdigit()]
+        return ConvertWorker(
+            files,
+            dpi=self._dpi_spin.value(),
+            output_dir=out_dir,
+            render_engine=engine,
+            fallback=self._fallback_check.isChecked(),
+            split_pages=self._split_check.isChecked(),
+            memory_budget=budget_mb * 1024 * 1024 if budget_mb else None,
+            image_format=image_format,
+            png_level=self._png_level_spin.value(),
+            quality=self._quality_spin.value(),
+            subdirectory=self._subdir_check.isChecked(),
+            write_manifest=self._manifest_check.isChecked(),
+            pyramid=pyramid if engine is RenderEngine.PYMUPDF else [],
+            incremental=self._incremental_check.isChecked(),
+        )
@@ -56,6 +56,8 @@ class HomePage(QWidget):
             "浮水印 — 添加文字或圖片浮水印",
             "壓縮 — 縮小 PDF 檔案大小",
             "頁面重排序 — 調整頁面順序",
+            "多步驟流程 — 一次讀寫完成解鎖、旋轉、浮水印、壓縮等多個步驟",
+            "工作佇列 — 檢視所有排隊與執行中的工作",
         ]
 
         feature_text = "\n".join(f"  \u2022  {f}" for f in features)
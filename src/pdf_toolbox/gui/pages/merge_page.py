@@ -6,8 +6,19 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from PySide6.QtWidgets import QLabel, QVBoxLayout
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+)
 
+from pdf_toolbox.core.batch import default_max_workers
+from pdf_toolbox.core.merge import DEFAULT_FAN_IN, parse_merge_input
+from pdf_toolbox.core.utils import ensure_unique_path
 from pdf_toolbox.gui.pages.base_page import BasePage
 from pdf_toolbox.gui.widgets.file_list import FileListWidget
 from pdf_toolbox.workers.base_worker import BaseWorker
@@ -17,6 +28,8 @@ from pdf_toolbox.workers.merge_worker import MergeWorker
 class MergePage(BasePage):
     """PDF merge page with drag-reorder file list."""
 
+    supports_parallel = False
+
     def __init__(self, parent: BasePage | None = None) -> None:
         super().__init__(
             title="\U0001f4ce PDF \u5408\u4f75",
@@ -32,7 +45,7 @@ class MergePage(BasePage):
         idx = layout.indexOf(old_list)
         old_list.setParent(None)
         old_list.deleteLater()
-        self.file_list = FileListWidget(allow_reorder=True)
+        self.file_list = FileListWidget(allow_reorder=True, editable=True)
         layout.insertWidget(idx, self.file_list)
         self.drop_zone.files_dropped.connect(self._on_files_dropped_merge)
 
@@ -47,11 +60,74 @@ class MergePage(BasePage):
                 "\u4f86\u8abf\u6574\u5408\u4f75\u9806\u5e8f\u3002"
             )
         )
+        layout.addWidget(
+            QLabel(
+                "\u96d9\u64ca\u9805\u76ee\u53ef\u5728\u6a94\u540d\u5f8c\u52a0\u4e0a\u8981\u5408\u4f75\u7684\u9801\u9762\uff0c"
+                "\u4f8b\u5982 a.pdf[1-3,7]\u3001b.pdf[all]\u3001c.pdf[-2:]\uff08\u6700\u5f8c\u5169\u9801\uff09\u3002"
+            )
+        )
+        row = QHBoxLayout()
+        row.addWidget(QLabel("\u5206\u7d44\u4e26\u884c\u5408\u4f75:"))
+        self._merge_jobs_spin = QSpinBox()
+        self._merge_jobs_spin.setRange(1, max(1, default_max_workers()))
+        self._merge_jobs_spin.setValue(max(1, default_max_workers()))
+        self._merge_jobs_spin.setSuffix(" \u500b\u9032\u7a0b")
+        self._merge_jobs_spin.setToolTip(
+            f"\u8d85\u904e {DEFAULT_FAN_IN} \u500b\u6a94\u6848\u6642\uff0c\u5148\u4ee5\u591a\u500b\u9032\u7a0b\u5206\u7d44\u5408\u4f75\uff0c"
+            "\u518d\u4f9d\u5e8f\u5408\u4f75\u5404\u7d44\u7d50\u679c\uff1b1 \u8868\u793a\u4f9d\u5e8f\u5408\u4f75"
+        )
+        row.addWidget(self._merge_jobs_spin)
+        row.addStretch()
+        layout.addLayout(row)
+
+        append_row = QHBoxLayout()
+        self._append_check = QCheckBox("\u9644\u52a0\u5230\u73fe\u6709 PDF:")
+        self._append_check.setToolTip(
+            "\u4ee5\u589e\u91cf\u66f4\u65b0\u628a\u65b0\u9801\u9762\u5beb\u5728\u73fe\u6709\u6a94\u6848\u4e4b\u5f8c\uff0c\u4e0d\u5fc5\u91cd\u5beb\u539f\u6709\u9801\u9762\uff1b"
+            "\u5931\u6557\u6216\u53d6\u6d88\u6642\u6a94\u6848\u6062\u5fa9\u539f\u72c0"
+        )
+        append_row.addWidget(self._append_check)
+        self._archive_path: Path | None = None
+        self._archive_label = QLabel("\u672a\u9078\u64c7\u6a94\u6848")
+        append_row.addWidget(self._archive_label, 1)
+        self._archive_btn = QPushButton("\u700f\u89bd")
+        self._archive_btn.clicked.connect(self._browse_archive)
+        append_row.addWidget(self._archive_btn)
+        layout.addLayout(append_row)
+
+    def _browse_archive(self) -> None:
+        f, _ = QFileDialog.getOpenFileName(
+            self, "\u9078\u64c7\u8981\u9644\u52a0\u7684 PDF", "", "PDF (*.pdf)"
+        )
+        if f:
+            self._archive_path = Path(f)
+            self._archive_label.setText(f)
+            self._append_check.setChecked(True)
+
+    def validate_before_start(self) -> str | None:
+        error = super().validate_before_start()
+        if error is None:
+            try:
+                sources = [parse_merge_input(str(f)) for f in self.file_list.get_all_files()]
+            except ValueError as exc:
+                return str(exc)
+        if error is None and self._append_check.isChecked():
+            if self._archive_path is None or not self._archive_path.is_file():
+                return (
+                    "\u8acb\u5148\u9078\u64c7\u8981\u9644\u52a0\u5230\u7684 PDF \u6a94\u6848\u3002"
+                )
+            if any(path == self._archive_path for path, _spec in sources):
+                return "\u8981\u9644\u52a0\u5230\u7684\u6a94\u6848\u4e0d\u80fd\u540c\u6642\u662f\u8f38\u5165\u6a94\u6848\u3002"
+        return error
 
     def create_worker(self, files: list[Path]) -> BaseWorker:
+        sources = [parse_merge_input(str(f)) for f in files]
+        files = [path for path, _spec in sources]
+        pages = [spec for _path, spec in sources]
+        if self._append_check.isChecked() and self._archive_path is not None:
+            return MergeWorker(files, output_path=self._archive_path, append=True, pages=pages)
         out_dir = self.output_dir_selector.get_output_dir(files[0] if files else None)
-        output_path = out_dir / "merged.pdf"
-        from pdf_toolbox.core.utils import ensure_unique_path
-
-        output_path = ensure_unique_path(output_path)
-        return MergeWorker(files, output_path=output_path)
+        output_path = ensure_unique_path(out_dir / "merged.pdf")
+        worker = MergeWorker(files, output_path=output_path, pages=pages)
+        worker.set_max_workers(self._merge_jobs_spin.value())
+        return worker
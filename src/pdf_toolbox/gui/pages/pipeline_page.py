@@ -0,0 +1,148 @@
+"""
+Multi-step pipeline page.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDoubleSpinBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QVBoxLayout,
+)
+
+from pdf_toolbox.core.compress import CompressionLevel
+from pdf_toolbox.core.pipeline import (
+    CompressStep,
+    PipelineStep,
+    ReorderStep,
+    RotateStep,
+    UnlockStep,
+    WatermarkStep,
+)
+from pdf_toolbox.core.watermark import WatermarkConfig
+from pdf_toolbox.gui.pages.base_page import BasePage
+from pdf_toolbox.gui.theme import PALETTE
+from pdf_toolbox.workers.base_worker import BaseWorker
+from pdf_toolbox.workers.pipeline_worker import PipelineWorker
+
+_LEVELS = [
+    ("\u4f4e\u58d3\u7e2e", CompressionLevel.LOW),
+    ("\u4e2d\u7b49\u58d3\u7e2e", CompressionLevel.MEDIUM),
+    ("\u9ad8\u58d3\u7e2e", CompressionLevel.HIGH),
+    ("\u6700\u5927\u58d3\u7e2e", CompressionLevel.MAXIMUM),
+]
+
+
+class PipelinePage(BasePage):
+    """Chain several operations; each file is read once and written once."""
+
+    def __init__(self, parent: BasePage | None = None) -> None:
+        super().__init__(
+            title="\U0001f517 \u591a\u6b65\u9a5f\u6d41\u7a0b",
+            description=(
+                "\u4f9d\u5e8f\u57f7\u884c\u591a\u500b\u64cd\u4f5c\uff08\u89e3\u9396 \u2192 \u65cb\u8f49 \u2192 \u91cd\u6392\u5e8f \u2192 \u6d6e\u6c34\u5370 \u2192 \u58d3\u7e2e\uff09\uff0c"
+                "\u6bcf\u500b\u6a94\u6848\u53ea\u8b80\u53d6\u8207\u5beb\u5165\u4e00\u6b21\uff0c\u4e0d\u7522\u751f\u4e2d\u9593\u6a94\u6848\u3002"
+            ),
+            parent=parent,
+        )
+
+    def build_settings_area(self, layout: QVBoxLayout) -> None:
+        # Unlock
+        row = QHBoxLayout()
+        self._unlock_check = QCheckBox("\u89e3\u9396")
+        self._unlock_check.setChecked(True)
+        row.addWidget(self._unlock_check)
+        row.addWidget(QLabel("\u5bc6\u78bc:"))
+        self._password_input = QLineEdit()
+        self._password_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self._password_input.setPlaceholderText("\u7121\u5bc6\u78bc\u53ef\u7559\u7a7a")
+        row.addWidget(self._password_input)
+        layout.addLayout(row)
+
+        # Rotate
+        row = QHBoxLayout()
+        self._rotate_check = QCheckBox("\u65cb\u8f49")
+        row.addWidget(self._rotate_check)
+        self._degrees_combo = QComboBox()
+        self._degrees_combo.addItems(["90\u00b0", "180\u00b0", "270\u00b0"])
+        row.addWidget(self._degrees_combo)
+        row.addStretch()
+        layout.addLayout(row)
+
+        # Reorder
+        row = QHBoxLayout()
+        self._reverse_check = QCheckBox("\u53cd\u8f49\u9801\u9762\u9806\u5e8f")
+        row.addWidget(self._reverse_check)
+        row.addStretch()
+        layout.addLayout(row)
+
+        # Watermark
+        row = QHBoxLayout()
+        self._watermark_check = QCheckBox("\u6587\u5b57\u6d6e\u6c34\u5370")
+        row.addWidget(self._watermark_check)
+        self._watermark_input = QLineEdit()
+        self._watermark_input.setPlaceholderText("\u4f8b: CONFIDENTIAL")
+        row.addWidget(self._watermark_input)
+        row.addWidget(QLabel("\u900f\u660e\u5ea6:"))
+        self._opacity_spin = QDoubleSpinBox()
+        self._opacity_spin.setRange(0.01, 1.0)
+        self._opacity_spin.setValue(0.3)
+        self._opacity_spin.setSingleStep(0.05)
+        row.addWidget(self._opacity_spin)
+        layout.addLayout(row)
+
+        # Compress
+        row = QHBoxLayout()
+        self._compress_check = QCheckBox("\u58d3\u7e2e")
+        row.addWidget(self._compress_check)
+        self._level_combo = QComboBox()
+        for label, _ in _LEVELS:
+            self._level_combo.addItem(label)
+        self._level_combo.setCurrentIndex(1)
+        row.addWidget(self._level_combo)
+        row.addStretch()
+        layout.addLayout(row)
+
+        info = QLabel(
+            "\u2139\ufe0f \u6d41\u7a0b\u4e2d\u7684\u58d3\u7e2e\u4f7f\u7528 PyMuPDF\uff0c\u4e0d\u7d93\u904e Ghostscript"
+        )
+        info.setStyleSheet(f"color: {PALETTE.yellow}; padding: 4px;")
+        layout.addWidget(info)
+
+    def _build_steps(self) -> list[PipelineStep]:
+        steps: list[PipelineStep] = []
+        if self._unlock_check.isChecked():
+            steps.append(UnlockStep(self._password_input.text() or None))
+        if self._rotate_check.isChecked():
+            steps.append(RotateStep((self._degrees_combo.currentIndex() + 1) * 90))
+        if self._reverse_check.isChecked():
+            steps.append(ReorderStep())
+        if self._watermark_check.isChecked():
+            config = WatermarkConfig(
+                text=self._watermark_input.text(), opacity=self._opacity_spin.value()
+            )
+            steps.append(WatermarkStep(config))
+        if self._compress_check.isChecked():
+            _, level = _LEVELS[self._level_combo.currentIndex()]
+            steps.append(CompressStep(level))
+        return steps
+
+    def validate_before_start(self) -> str | None:
+        error = super().validate_before_start()
+        if error:
+            return error
+        if not self._build_steps():
+            return "\u8acb\u81f3\u5c11\u52fe\u9078\u4e00\u500b\u6b65\u9a5f\u3002"
+        if self._watermark_check.isChecked() and not self._watermark_input.text():
+            return "\u8acb\u8f38\u5165\u6d6e\u6c34\u5370\u6587\u5b57\u3002"
+        return None
+
+    def create_worker(self, files: list[Path]) -> BaseWorker:
+        out_dir = self.output_dir_selector.get_output_dir(files[0] if files else None)
+        return PipelineWorker(files, steps=self._build_steps(), output_dir=out_dir)
@@ -0,0 +1,164 @@
+"""
+Job queue page: jobs from all feature pages and the shared process budget.
+"""
+
+from __future__ import annotations
+
+from PySide6.QtGui import QColor, QFont
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QSpinBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from pdf_toolbox.core.batch import default_max_workers
+from pdf_toolbox.gui.theme import PALETTE
+from pdf_toolbox.workers.scheduler import JobState, get_scheduler
+
+_STATE_LABELS = {
+    JobState.QUEUED: ("\u6392\u968a\u4e2d", PALETTE.yellow),
+    JobState.RUNNING: ("\u57f7\u884c\u4e2d", PALETTE.blue),
+    JobState.DONE: ("\u5df2\u5b8c\u6210", PALETTE.green),
+    JobState.CANCELLED: ("\u5df2\u53d6\u6d88", PALETTE.red),
+}
+
+_COLUMNS = [
+    "#",
+    "\u529f\u80fd",
+    "\u6a94\u6848\u6578",
+    "\u9032\u7a0b",
+    "\u72c0\u614b",
+    "\u6458\u8981",
+]
+
+
+class JobQueuePage(QWidget):
+    """Shows every submitted job and lets the user tune the global budget."""
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._scheduler = get_scheduler()
+        self._rows: dict[int, int] = {}
+        self._setup_ui()
+        self._scheduler.job_added.connect(self._on_job_added)
+        self._scheduler.job_changed.connect(self._refresh_row)
+        for job in self._scheduler.jobs:
+            self._on_job_added(job.job_id)
+
+    def _setup_ui(self) -> None:
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+        layout.setContentsMargins(24, 24, 24, 24)
+
+        title = QLabel("\U0001f4cb \u5de5\u4f5c\u4f47\u5217")
+        title.setFont(QFont("Microsoft JhengHei", 18, QFont.Weight.Bold))
+        title.setStyleSheet(f"color: {PALETTE.text};")
+        layout.addWidget(title)
+
+        desc = QLabel(
+            "\u6240\u6709\u529f\u80fd\u9801\u9762\u7684\u5de5\u4f5c\u90fd\u5728\u6b64\u6392\u968a\uff0c"
+            "\u4f9d\u5171\u7528\u7684\u9032\u7a0b\u9810\u7b97\u8207\u5404\u5f15\u64ce\u4e0a\u9650\u4f9d\u5e8f\u57f7\u884c\u3002"
+        )
+        desc.setWordWrap(True)
+        desc.setStyleSheet(f"color: {PALETTE.subtext0};")
+        layout.addWidget(desc)
+
+        # Budget settings
+        row = QHBoxLayout()
+        row.addWidget(QLabel("\u540c\u6642\u57f7\u884c\u7684\u9032\u7a0b\u4e0a\u9650:"))
+        self._slots_spin = QSpinBox()
+        self._slots_spin.setRange(1, max(1, default_max_workers()) * 2)
+        self._slots_spin.setValue(self._scheduler.max_slots)
+        self._slots_spin.valueChanged.connect(self._scheduler.set_max_slots)
+        row.addWidget(self._slots_spin)
+
+        row.addWidget(QLabel("Ghostscript \u4e0a\u9650:"))
+        self._gs_spin = QSpinBox()
+        self._gs_spin.setRange(1, 64)
+        self._gs_spin.setValue(self._scheduler.engine_limit("ghostscript") or 1)
+        self._gs_spin.valueChanged.connect(
+            lambda n: self._scheduler.set_engine_limit("ghostscript", n)
+        )
+        row.addWidget(self._gs_spin)
+
+        row.addWidget(QLabel("pdftoppm \u4e0a\u9650:"))
+        self._pdftoppm_spin = QSpinBox()
+        self._pdftoppm_spin.setRange(1, 64)
+        self._pdftoppm_spin.setValue(self._scheduler.engine_limit("pdftoppm") or 1)
+        self._pdftoppm_spin.valueChanged.connect(
+            lambda n: self._scheduler.set_engine_limit("pdftoppm", n)
+        )
+        row.addWidget(self._pdftoppm_spin)
+        row.addStretch()
+        layout.addLayout(row)
+
+        # Job table
+        self._table = QTableWidget(0, len(_COLUMNS))
+        self._table.setHorizontalHeaderLabels(_COLUMNS)
+        self._table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._table.verticalHeader().setVisible(False)
+        self._table.horizontalHeader().setSectionResizeMode(
+            len(_COLUMNS) - 1, QHeaderView.ResizeMode.Stretch
+        )
+        layout.addWidget(self._table, 1)
+
+        # Actions
+        btn_row = QHBoxLayout()
+        self._cancel_btn = QPushButton("\u274c \u53d6\u6d88\u9078\u53d6\u7684\u5de5\u4f5c")
+        self._cancel_btn.clicked.connect(self._cancel_selected)
+        self._clear_btn = QPushButton(
+            "\U0001f5d1\ufe0f \u6e05\u9664\u5df2\u7d50\u675f\u7684\u5de5\u4f5c"
+        )
+        self._clear_btn.clicked.connect(self._clear_finished)
+        btn_row.addWidget(self._cancel_btn)
+        btn_row.addWidget(self._clear_btn)
+        btn_row.addStretch()
+        layout.addLayout(btn_row)
+
+    def _on_job_added(self, job_id: int) -> None:
+        row = self._table.rowCount()
+        self._table.insertRow(row)
+        self._rows[job_id] = row
+        self._refresh_row(job_id)
+
+    def _refresh_row(self, job_id: int) -> None:
+        job = self._scheduler.job(job_id)
+        row = self._rows.get(job_id)
+        if job is None or row is None:
+            return
+        label, color = _STATE_LABELS[job.state]
+        values = [
+            str(job.job_id),
+            job.title,
+            str(job.file_count),
+            str(job.slots) if job.state == JobState.RUNNING else "",
+            label,
+            job.summary,
+        ]
+        for col, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            if col == 4:
+                item.setForeground(QColor(color))
+            self._table.setItem(row, col, item)
+
+    def _cancel_selected(self) -> None:
+        for index in self._table.selectionModel().selectedRows():
+            job_id = next((jid for jid, row in self._rows.items() if row == index.row()), None)
+            job = self._scheduler.job(job_id) if job_id is not None else None
+            if job is not None and job.state in (JobState.QUEUED, JobState.RUNNING):
+                self._scheduler.cancel(job.worker)
+
+    def _clear_finished(self) -> None:
+        self._scheduler.clear_finished()
+        self._table.setRowCount(0)
+        self._rows.clear()
+        for job in self._scheduler.jobs:
+            self._on_job_added(job.job_id)
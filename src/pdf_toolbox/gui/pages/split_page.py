@@ -8,6 +8,7 @@ from pathlib import Path
 
 from PySide6.QtWidgets import (
     QButtonGroup,
+    QCheckBox,
     QHBoxLayout,
     QLineEdit,
     QRadioButton,
@@ -58,6 +59,11 @@ class SplitPage(BasePage):
         self._n_spin.setValue(1)
         self._n_spin.setSuffix(" \u9801")
         row2.addWidget(self._n_spin)
+        self._shard_check = QCheckBox("\u5206\u6bb5\u5e73\u884c\u5beb\u51fa")
+        self._shard_check.setToolTip(
+            "\u4ee5\u300c\u4e26\u884c\u8655\u7406\u300d\u7684\u9032\u7a0b\u6578\u540c\u6642\u5beb\u51fa\u540c\u4e00\u4efd\u6587\u4ef6\u7684\u5404\u500b\u90e8\u5206\uff0c\u9069\u5408\u9801\u6578\u5f88\u591a\u7684\u5927\u578b\u6383\u63cf\u6a94"
+        )
+        row2.addWidget(self._shard_check)
         row2.addStretch()
         layout.addLayout(row2)
 
@@ -87,4 +93,5 @@ class SplitPage(BasePage):
             page_ranges=self._range_input.text(),
             pages_per_split=self._n_spin.value(),
             page_numbers_str=self._pages_input.text(),
+            shard_parts=self._shard_check.isChecked() and mode != SplitMode.EXTRACT_PAGES,
         )
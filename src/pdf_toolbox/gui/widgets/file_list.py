@@ -13,6 +13,7 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QListWidget,
+    QListWidgetItem,
     QPushButton,
     QVBoxLayout,
     QWidget,
@@ -27,13 +28,17 @@ class FileListWidget(QWidget):
         - Add files / folders via buttons
         - Delete selected via button or Delete key
         - Drag-and-drop reorder (internal, optional)
+        - Editing entries in place by double-click (optional)
         - File count label
     """
 
-    def __init__(self, allow_reorder: bool = False, parent: QWidget | None = None) -> None:
+    def __init__(
+        self, allow_reorder: bool = False, editable: bool = False, parent: QWidget | None = None
+    ) -> None:
         super().__init__(parent)
         self._files: list[Path] = []
         self._allow_reorder = allow_reorder
+        self._editable = editable
         self._setup_ui()
 
     def _setup_ui(self) -> None:
@@ -63,6 +68,9 @@ class FileListWidget(QWidget):
         self.list_widget.setMinimumHeight(120)
         if self._allow_reorder:
             self.list_widget.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        # Keep _files in display order and in step with edited entries.
+        self.list_widget.itemChanged.connect(self._sync_files)
+        self.list_widget.model().rowsMoved.connect(self._sync_files)
         layout.addWidget(self.list_widget)
 
         # Count label
@@ -75,10 +83,13 @@ class FileListWidget(QWidget):
     # -- Public API --
 
     def add_file(self, path: Path) -> None:
-        """Add a single file to the list (no duplicates)."""
+        """Add a single file to the list (no duplicate entries, page specs included)."""
         if path not in self._files:
             self._files.append(path)
-            self.list_widget.addItem(str(path))
+            item = QListWidgetItem(str(path))
+            if self._editable:
+                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
+            self.list_widget.addItem(item)
             self._update_count()
 
     def add_files(self, paths: list[Path]) -> None:
@@ -105,9 +116,7 @@ class FileListWidget(QWidget):
         return len(self._files)
 
     def get_all_files(self) -> list[Path]:
-        """Return files in current display order (respects reorder)."""
-        if self._allow_reorder:
-            return [Path(self.list_widget.item(i).text()) for i in range(self.list_widget.count())]
+        """Return files in current display order (respects reorder and edits)."""
         return list(self._files)
 
     # -- Internal --
@@ -128,6 +137,11 @@ class FileListWidget(QWidget):
             for pdf in Path(folder).rglob("*.pdf"):
                 self.add_file(pdf)
 
+    def _sync_files(self, *_args: object) -> None:
+        self._files = [
+            Path(self.list_widget.item(i).text()) for i in range(self.list_widget.count())
+        ]
+
     def _update_count(self) -> None:
         n = self.count()
         self._count_label.setText(f"\u5df2\u9078\u64c7 {n} \u500b\u6a94\u6848")
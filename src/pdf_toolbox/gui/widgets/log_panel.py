@@ -4,8 +4,12 @@ Scrollable log output panel.
 
 from __future__ import annotations
 
+from PySide6.QtGui import QTextCursor
 from PySide6.QtWidgets import QGroupBox, QTextEdit, QVBoxLayout, QWidget
 
+# Oldest lines are dropped beyond this, so huge batches keep appending cheap.
+MAX_LOG_LINES = 5000
+
 
 class LogPanel(QWidget):
     """Read-only log display in a group box."""
@@ -21,6 +25,7 @@ class LogPanel(QWidget):
         self._text = QTextEdit()
         self._text.setReadOnly(True)
         self._text.setMinimumHeight(120)
+        self._text.document().setMaximumBlockCount(MAX_LOG_LINES)
         group_layout.addWidget(self._text)
 
         layout.addWidget(group)
@@ -31,6 +36,19 @@ class LogPanel(QWidget):
         sb = self._text.verticalScrollBar()
         sb.setValue(sb.maximum())
 
+    def append_many(self, messages: list[str]) -> None:
+        """Append several log messages with a single update of the view."""
+        if not messages:
+            return
+        text = "\n".join(messages)
+        if not self._text.document().isEmpty():
+            text = "\n" + text
+        cursor = self._text.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+        sb = self._text.verticalScrollBar()
+        sb.setValue(sb.maximum())
+
     def clear(self) -> None:
         """Clear all log messages."""
         self._text.clear()
@@ -4,9 +4,14 @@ Unified progress bar + status label panel.
 
 from __future__ import annotations
 
+import time
+
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QGroupBox, QLabel, QProgressBar, QVBoxLayout, QWidget
 
+# Don't show an ETA before this fraction of the work is done; early rates are noise.
+_ETA_MIN_FRACTION = 0.02
+
 
 class ProgressPanel(QWidget):
     """Progress bar with status message in a group box."""
@@ -29,16 +34,47 @@ class ProgressPanel(QWidget):
 
         layout.addWidget(group)
 
+        self._started = time.monotonic()
+        self._current = 0
+        self._total = 0
+        self._message = ""
+        self._step_done = 0
+        self._step_total = 0
+
     def update_progress(self, current: int, total: int, message: str) -> None:
         """Update the progress bar and status label."""
+        self._current = current
+        self._total = total
+        self._message = message
+        self._step_done = 0
+        self._step_total = 0
         percentage = int((current / total) * 100) if total > 0 else 0
         self._bar.setValue(percentage)
         self._label.setText(f"{message}  ({current}/{total})")
 
+    def update_step(self, done: int, total: int) -> None:
+        """Refine the bar with page/step progress inside the current file."""
+        if self._total <= 0 or total <= 0:
+            return
+        self._step_done = done
+        self._step_total = total
+        fraction = (max(self._current - 1, 0) + done / total) / self._total
+        self._bar.setValue(int(fraction * 100))
+
+        text = f"{self._message}  ({self._current}/{self._total})  [{done}/{total}]"
+        if fraction >= _ETA_MIN_FRACTION:
+            elapsed = time.monotonic() - self._started
+            remaining = int(elapsed * (1 - fraction) / fraction)
+            text += f"  \u00b7 \u5269\u9918\u7d04 {remaining // 60:d}:{remaining % 60:02d}"
+        self._label.setText(text)
+
     def reset(self) -> None:
         """Reset to initial state."""
         self._bar.setValue(0)
         self._label.setText("\u6e96\u5099\u5c31\u7dd2")
+        self._started = time.monotonic()
+        self._current = 0
+        self._total = 0
 
     def set_finished(self, summary: str) -> None:
         """Set the panel to finished state."""
@@ -5,16 +5,22 @@ Base worker class providing unified progress reporting and cancellation.
 from __future__ import annotations
 
 import traceback
-from abc import abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from PySide6.QtCore import QThread, Signal
 
+from pdf_toolbox.core.batch import FileJob, iter_parallel
+from pdf_toolbox.core.cache import CacheHit, ResultCache
+from pdf_toolbox.core.cancel import CancelToken, OperationCancelledError
+from pdf_toolbox.core.journal import JobJournal, JobStatus, JournalRecord
+from pdf_toolbox.core.utils import ensure_unique_path
+from pdf_toolbox.workers.coalescer import SignalCoalescer, UpdateBatch
+
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterator, Sequence
 
 
 class TaskStatus(Enum):
@@ -23,6 +29,7 @@ class TaskStatus(Enum):
     SUCCESS = auto()
     FAILED = auto()
     CANCELLED = auto()
+    SKIPPED = auto()  # done by an earlier run (resume mode)
 
 
 @dataclass
@@ -34,109 +41,419 @@ class FileResult:
     status: TaskStatus
     message: str
     engine: str = ""
+    outputs: list[Path] = field(default_factory=list)
 
 
 class BaseWorker(QThread):
     """
     Abstract base for all background workers.
 
+    Per-file workers implement build_job(); the base class runs the jobs either
+    one at a time in this thread or, after set_max_workers(n > 1), on a process
+    pool. Signals are emitted in file order in both modes.
+
+    Updates go through log(), report_progress() and report_step(), which are
+    coalesced and delivered at most every coalescer.FLUSH_INTERVAL seconds, so
+    a batch of many small files cannot flood the GUI thread. Progress signals
+    carry only the latest value of each interval.
+
+    With set_journal(), every finished file is appended to a job journal, and
+    a resumed batch skips the files an earlier run already completed. With
+    set_cache(), files whose content was already processed with the same
+    settings get the cached output instead of being processed again.
+
     Signals (unified across all workers):
         progress_updated(current: int, total: int, message: str)
-        file_completed(source_name: str, success: bool, message: str)
-        log_message(message: str)
+        step_progress(done: int, total: int)  -- pages/steps within the current file
+        files_completed(files: list[tuple[str, bool, str]])  -- (name, success, message)
+        log_messages(messages: list[str])
         task_finished(success: bool, summary: str, results: list)
     """
 
     progress_updated = Signal(int, int, str)
-    file_completed = Signal(str, bool, str)
-    log_message = Signal(str)
+    step_progress = Signal(int, int)
+    files_completed = Signal(list)
+    log_messages = Signal(list)
     task_finished = Signal(bool, str, list)
 
+    # External engine the worker mainly drives; the job scheduler caps
+    # concurrent processes per engine.
+    engine: str = ""
+
     def __init__(self, files: Sequence[Path], parent: QThread | None = None) -> None:
         super().__init__(parent)
         self._files: list[Path] = list(files)
         self._is_cancelled: bool = False
+        self._cancel_token = CancelToken()
         self._results: list[FileResult] = []
+        self._max_workers: int = 1
+        self._journal_path: Path | None = None
+        self._journal: JobJournal | None = None
+        self._resume: bool = False
+        self._cache: ResultCache | None = None
+        self._updates = SignalCoalescer(self._deliver)
 
     def cancel(self) -> None:
-        """Request cancellation."""
+        """Request cancellation; running core operations stop at their next check."""
         self._is_cancelled = True
+        self._cancel_token.cancel()
 
     @property
     def is_cancelled(self) -> bool:
         return self._is_cancelled
 
+    @property
+    def cancel_token(self) -> CancelToken:
+        """Token passed to core functions so cancel() reaches into them."""
+        return self._cancel_token
+
+    @property
+    def files(self) -> list[Path]:
+        return list(self._files)
+
     @property
     def results(self) -> list[FileResult]:
         return list(self._results)
 
+    def set_max_workers(self, count: int) -> None:
+        """
+        Set how many processes run per-file work in parallel.
+        1 (the default) processes files one at a time in this thread.
+        """
+        self._max_workers = max(1, count)
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def set_journal(self, path: Path | None, resume: bool = False) -> None:
+        """
+        Record every finished file in the job journal at path (None disables it).
+        With resume, files the journal lists as done with the same settings
+        are skipped. Needs build_job().
+        """
+        self._journal_path = path
+        self._resume = resume and path is not None
+
+    def set_cache(self, cache: ResultCache | None) -> None:
+        """Reuse and store outputs in cache (None disables it). Needs build_job()."""
+        self._cache = cache
+
+    # -- Updates --
+
+    def log(self, message: str) -> None:
+        """Queue a log line for the GUI."""
+        self._updates.log(message)
+
+    def report_progress(self, current: int, total: int, message: str) -> None:
+        """Queue a file-level progress update."""
+        self._updates.progress(current, total, message)
+
+    def report_step(self, done: int, total: int) -> None:
+        """Queue page/step progress within the current file (an on_progress callback)."""
+        self._updates.step(done, total)
+
+    def finish(self, success: bool, summary: str, results: list) -> None:
+        """Deliver pending updates, then emit task_finished."""
+        self._updates.flush()
+        self.task_finished.emit(success, summary, results)
+
+    def _deliver(self, batch: UpdateBatch) -> None:
+        if batch.progress is not None:
+            self.progress_updated.emit(*batch.progress)
+        if batch.step is not None:
+            self.step_progress.emit(*batch.step)
+        if batch.logs:
+            self.log_messages.emit(batch.logs)
+        if batch.files:
+            self.files_completed.emit(batch.files)
+
     def run(self) -> None:
-        """Template method: iterates files and calls process_file for each."""
+        """Template method: iterates files and runs each one's job (or process_file)."""
         total = len(self._files)
         if total == 0:
-            self.task_finished.emit(
-                False, "\u6c92\u6709\u6a94\u6848\u9700\u8981\u8655\u7406\u3002", []
-            )
+            self.finish(False, "\u6c92\u6709\u6a94\u6848\u9700\u8981\u8655\u7406\u3002", [])
             return
 
-        self.log_message.emit(
-            f"\u958b\u59cb\u8655\u7406\uff0c\u5171 {total} \u500b\u6a94\u6848\u3002"
-        )
+        self.log(f"\u958b\u59cb\u8655\u7406\uff0c\u5171 {total} \u500b\u6a94\u6848\u3002")
         success_count = 0
+        skipped_count = 0
 
         try:
-            for i, file_path in enumerate(self._files):
-                if self._is_cancelled:
-                    self.log_message.emit("\u4f7f\u7528\u8005\u5df2\u53d6\u6d88\u64cd\u4f5c\u3002")
-                    break
-
-                self.progress_updated.emit(i + 1, total, f"\u8655\u7406\u4e2d: {file_path.name}")
-
-                try:
-                    result = self.process_file(file_path, i, total)
-                    self._results.append(result)
+            if self._journal_path is not None:
+                self._journal = JobJournal(self._journal_path)
+                if self._resume:
+                    self.log(
+                        f"\u7e8c\u50b3\u6a21\u5f0f\uff1a\u65e5\u8a8c\u4e2d\u6709 "
+                        f"{len(self._journal)} \u7b46\u7d00\u9304"
+                    )
+            if self._max_workers > 1:
+                outcomes = self._iter_parallel(total)
+            else:
+                outcomes = self._iter_serial(total)
 
-                    ok = result.status == TaskStatus.SUCCESS
-                    if ok:
-                        success_count += 1
-                    self.file_completed.emit(file_path.name, ok, result.message)
-                    self.log_message.emit(result.message)
+            for file_path, result, detail in outcomes:
+                self._results.append(result)
+                ok = result.status in (TaskStatus.SUCCESS, TaskStatus.SKIPPED)
+                if ok:
+                    success_count += 1
+                if result.status == TaskStatus.SKIPPED:
+                    skipped_count += 1
+                self.log(result.message)
+                if detail:
+                    self.log(detail)
+                self._updates.file_completed(file_path.name, ok, result.message)
 
-                except Exception as exc:
-                    msg = f"\u8655\u7406 {file_path.name} \u6642\u767c\u751f\u932f\u8aa4: {exc}"
-                    self.log_message.emit(msg)
-                    self.log_message.emit(traceback.format_exc())
-                    self._results.append(
-                        FileResult(
-                            source=file_path,
-                            output=None,
-                            status=TaskStatus.FAILED,
-                            message=msg,
-                        )
-                    )
-                    self.file_completed.emit(file_path.name, False, msg)
+            if self._is_cancelled:
+                self.log("\u4f7f\u7528\u8005\u5df2\u53d6\u6d88\u64cd\u4f5c\u3002")
 
         except Exception as exc:
-            self.log_message.emit(f"\u56b4\u91cd\u932f\u8aa4: {exc}")
-            self.task_finished.emit(False, f"\u56b4\u91cd\u932f\u8aa4: {exc}", self._results)
+            self.log(f"\u56b4\u91cd\u932f\u8aa4: {exc}")
+            self.finish(False, f"\u56b4\u91cd\u932f\u8aa4: {exc}", self._results)
             return
+        finally:
+            if self._journal is not None:
+                self._journal.close()
+            if self._cache is not None:
+                self._cache.evict()
 
         if self._is_cancelled:
             summary = (
                 f"\u5df2\u53d6\u6d88\u3002\u53d6\u6d88\u524d\u5b8c\u6210 "
                 f"{success_count}/{total} \u500b\u6a94\u6848\u3002"
             )
-            self.task_finished.emit(False, summary, self._results)
+            self.finish(False, summary, self._results)
         else:
             summary = (
                 f"\u5b8c\u6210\uff01\u6210\u529f {success_count}/{total} \u500b\u6a94\u6848\u3002"
             )
-            self.task_finished.emit(success_count > 0, summary, self._results)
+            if skipped_count:
+                summary += (
+                    f"\u5176\u4e2d {skipped_count} \u500b\u5148\u524d\u5df2\u5b8c\u6210"
+                    f"\uff0c\u5df2\u7565\u904e\u3002"
+                )
+            if self._cache is not None:
+                stats = self._cache.stats
+                summary += (
+                    f"\u7d50\u679c\u5feb\u53d6\uff1a\u547d\u4e2d {stats.hits}\u3001"
+                    f"\u672a\u547d\u4e2d {stats.misses}\u3002"
+                )
+            self.finish(success_count > 0, summary, self._results)
+
+    def _iter_serial(self, total: int) -> Iterator[tuple[Path, FileResult, str]]:
+        """Process files one at a time in this thread."""
+        for i, file_path in enumerate(self._files):
+            if self._is_cancelled:
+                break
+
+            self.report_progress(i + 1, total, f"\u8655\u7406\u4e2d: {file_path.name}")
+
+            job = self._lookup_job(file_path, i, total)
+            record = self._completed_record(job)
+            if record is not None:
+                yield file_path, self._skipped_result(file_path, record), ""
+                continue
+            hit = self._cached(job)
+            if hit is not None:
+                result = self._cached_result(file_path, hit)
+                self._journal_record(job, result)
+                yield file_path, result, ""
+                continue
+
+            detail = ""
+            try:
+                if job is None:
+                    result = self.process_file(file_path, i, total)
+                else:
+                    result = self.run_job(file_path, job)
+            except OperationCancelledError:
+                result = self._cancelled_result(file_path)
+            except Exception as exc:
+                result, detail = self._error_result(file_path, exc), traceback.format_exc()
+            self._journal_record(job, result)
+            self._cache_store(job, result)
+            yield file_path, result, detail
+
+    def _iter_parallel(self, total: int) -> Iterator[tuple[Path, FileResult, str]]:
+        """Send build_job work to a process pool; results arrive in file order."""
+        reserved: set[Path] = set()
+
+        def jobs() -> Iterator[FileJob]:
+            for i, file_path in enumerate(self._files):
+                try:
+                    job = self._make_job(file_path, i, total)
+                except Exception as exc:
+                    yield FileJob.failed(file_path, exc)
+                    continue
+                record = self._completed_record(job)
+                if record is not None:
+                    yield FileJob.completed(file_path, self._skipped_result(file_path, record))
+                    continue
+                # Outputs are named before any of them is written, so claim each one
+                # to keep ensure_unique_path from handing the same name out twice.
+                dst = job.output
+                if dst is not None:
+                    dst = ensure_unique_path(dst, reserved)
+                    job.kwargs["dst"] = dst
+                    reserved.add(dst)
+                hit = self._cached(job)
+                if hit is not None:
+                    result = self._cached_result(file_path, hit)
+                    self._journal_record(job, result)
+                    yield FileJob.completed(file_path, result)
+                    continue
+                yield job
+
+        self.log(f"\u4e26\u884c\u8655\u7406\uff1a{self._max_workers} \u500b\u9032\u7a0b")
+        outcomes = iter_parallel(jobs(), self._max_workers, self._cancel_token)
+        for i, (job, outcome) in enumerate(outcomes):
+            file_path = job.source
+            self.report_progress(i + 1, total, f"\u5df2\u5b8c\u6210: {file_path.name}")
+
+            if isinstance(outcome, FileResult):
+                # Skipped or served from the cache while the jobs were built.
+                yield file_path, outcome, ""
+                continue
+
+            detail = ""
+            if isinstance(outcome, OperationCancelledError):
+                result = self._cancelled_result(file_path)
+            elif isinstance(outcome, BaseException):
+                result = self._error_result(file_path, outcome)
+                detail = "".join(traceback.format_exception(outcome))
+            else:
+                try:
+                    result = self.make_result(file_path, outcome)
+                except Exception as exc:
+                    result, detail = self._error_result(file_path, exc), traceback.format_exc()
+            self._journal_record(job, result)
+            self._cache_store(job, result)
+            yield file_path, result, detail
+
+    # -- Journal and cache --
+
+    def _lookup_job(self, file_path: Path, index: int, total: int) -> FileJob | None:
+        """
+        The job describing file_path, for journal and cache lookups in serial
+        mode; it is also the job that then runs, so build_job() runs once.
+        """
+        if self._journal is None and self._cache is None:
+            return None
+        try:
+            return self._make_job(file_path, index, total, in_process=True)
+        except Exception:
+            return None
+
+    def _completed_record(self, job: FileJob | None) -> JournalRecord | None:
+        if job is None or self._journal is None or not self._resume:
+            return None
+        return self._journal.lookup(job)
+
+    def _journal_record(self, job: FileJob | None, result: FileResult) -> None:
+        if job is None or self._journal is None or job.func is None:
+            return
+        status = {
+            TaskStatus.SUCCESS: JobStatus.SUCCESS,
+            TaskStatus.CANCELLED: JobStatus.CANCELLED,
+        }.get(result.status, JobStatus.FAILED)
+        self._journal.record(job, status, result.outputs, result.message)
+
+    def _cached(self, job: FileJob | None) -> CacheHit | None:
+        if job is None or self._cache is None:
+            return None
+        return self._cache.fetch(job)
+
+    def _cache_store(self, job: FileJob | None, result: FileResult) -> None:
+        if job is None or self._cache is None or result.status != TaskStatus.SUCCESS:
+            return
+        self._cache.store(job, result.outputs)
+
+    @staticmethod
+    def _cached_result(file_path: Path, hit: CacheHit) -> FileResult:
+        return FileResult(
+            source=file_path,
+            output=hit.outputs[0],
+            status=TaskStatus.SUCCESS,
+            message=f"\u2713 {file_path.name} \u2192 \u53d6\u81ea\u7d50\u679c\u5feb\u53d6",
+            engine="cache",
+            outputs=hit.outputs,
+        )
+
+    @staticmethod
+    def _skipped_result(file_path: Path, record: JournalRecord) -> FileResult:
+        outputs = record.output_paths
+        return FileResult(
+            source=file_path,
+            output=outputs[0] if outputs else None,
+            status=TaskStatus.SKIPPED,
+            message=f"\u21b7 {file_path.name} \u2192 \u5148\u524d\u5df2\u5b8c\u6210\uff0c\u7565\u904e",
+            outputs=outputs,
+        )
+
+    @staticmethod
+    def _error_result(file_path: Path, exc: BaseException) -> FileResult:
+        return FileResult(
+            source=file_path,
+            output=None,
+            status=TaskStatus.FAILED,
+            message=f"\u8655\u7406 {file_path.name} \u6642\u767c\u751f\u932f\u8aa4: {exc}",
+        )
+
+    @staticmethod
+    def _cancelled_result(file_path: Path) -> FileResult:
+        return FileResult(
+            source=file_path,
+            output=None,
+            status=TaskStatus.CANCELLED,
+            message=f"\u2717 {file_path.name} \u2192 \u5df2\u53d6\u6d88",
+        )
+
+    def _make_job(
+        self, file_path: Path, index: int, total: int, in_process: bool = False
+    ) -> FileJob:
+        """
+        build_job() plus the worker's cancellation token. Jobs run in this
+        process also report page progress; a pool process cannot emit signals.
+        """
+        job = self.build_job(file_path, index, total)
+        job.kwargs["cancel"] = self._cancel_token
+        if in_process:
+            job.kwargs["on_progress"] = self.report_step
+        return job
+
+    def build_job(self, file_path: Path, index: int, total: int) -> FileJob:
+        """
+        Describe the core call for a single file. Implemented by each per-file
+        worker; the job must be picklable so it can run in a worker process.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support per-file jobs.")
+
+    def make_result(self, file_path: Path, result: Any) -> FileResult:
+        """Turn the core function's result object into a FileResult."""
+        output = getattr(result, "output_path", None)
+        outputs = [output] if output is not None else list(getattr(result, "output_files", []))
+        if output is None and outputs:
+            output = outputs[0]
+        return FileResult(
+            source=file_path,
+            output=output if result.success else None,
+            status=TaskStatus.SUCCESS if result.success else TaskStatus.FAILED,
+            message=(
+                f"\u2713 {file_path.name} \u2192 {result.message}"
+                if result.success
+                else f"\u2717 {file_path.name} \u2192 {result.message}"
+            ),
+            outputs=outputs if result.success else [],
+        )
 
-    @abstractmethod
     def process_file(self, file_path: Path, index: int, total: int) -> FileResult:
         """
-        Process a single file. Must be implemented by each worker subclass.
+        Process a single file in this thread.
         Should NOT catch exceptions -- the base class handles that.
         """
-        ...
+        job = self._make_job(file_path, index, total, in_process=True)
+        return self.run_job(file_path, job)
+
+    def run_job(self, file_path: Path, job: FileJob) -> FileResult:
+        """Run a job built for this thread and turn its outcome into a FileResult."""
+        return self.make_result(file_path, job.run())
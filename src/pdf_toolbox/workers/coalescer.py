@@ -0,0 +1,103 @@
+"""
+Rate-limited batching of worker-to-GUI updates.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Minimum time between two deliveries (seconds); 25 Hz is smooth enough for a
+# progress bar and keeps the GUI thread's share of a large batch small.
+FLUSH_INTERVAL = 0.04
+
+
+@dataclass
+class UpdateBatch:
+    """Updates collected since the previous delivery."""
+
+    logs: list[str] = field(default_factory=list)
+    files: list[tuple[str, bool, str]] = field(default_factory=list)
+    progress: tuple[int, int, str] | None = None
+    step: tuple[int, int] | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.logs or self.files or self.progress or self.step)
+
+
+class SignalCoalescer:
+    """
+    Collects updates posted from a worker thread and hands them to deliver()
+    in batches, at most once per interval.
+
+    The first update after a quiet period is delivered at once; later ones are
+    held until interval has passed since the previous delivery, and a timer
+    makes sure they are delivered even if the worker posts nothing else. Log
+    lines and file results are kept in order; progress values only keep the
+    latest one. Batches are delivered in the order they were collected.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[UpdateBatch], None],
+        interval: float = FLUSH_INTERVAL,
+    ) -> None:
+        self._deliver = deliver
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = UpdateBatch()
+        self._timer: threading.Timer | None = None
+        self._last_flush = -math.inf
+
+    def log(self, message: str) -> None:
+        self._post(lambda batch: batch.logs.append(message))
+
+    def file_completed(self, name: str, success: bool, message: str) -> None:
+        self._post(lambda batch: batch.files.append((name, success, message)))
+
+    def progress(self, current: int, total: int, message: str) -> None:
+        def update(batch: UpdateBatch) -> None:
+            batch.progress = (current, total, message)
+            # Step progress belongs to the previous file now.
+            batch.step = None
+
+        self._post(update)
+
+    def step(self, done: int, total: int) -> None:
+        def update(batch: UpdateBatch) -> None:
+            batch.step = (done, total)
+
+        self._post(update)
+
+    def flush(self) -> None:
+        """Deliver everything collected so far, regardless of the rate limit."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, UpdateBatch()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                self._last_flush = time.monotonic()
+            if not batch.is_empty:
+                self._deliver(batch)
+
+    def _post(self, update: Callable[[UpdateBatch], None]) -> None:
+        with self._lock:
+            update(self._pending)
+            if self._timer is not None:
+                return
+            delay = self._last_flush + self._interval - time.monotonic()
+            if delay > 0:
+                self._timer = threading.Timer(delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.flush()
@@ -7,9 +7,10 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from pdf_toolbox.core.batch import FileJob
 from pdf_toolbox.core.compress import CompressionLevel, compress_pdf
 from pdf_toolbox.core.utils import ensure_unique_path
-from pdf_toolbox.workers.base_worker import BaseWorker, FileResult, TaskStatus
+from pdf_toolbox.workers.base_worker import BaseWorker
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -18,32 +19,31 @@ if TYPE_CHECKING:
 class CompressWorker(BaseWorker):
     """Background worker for PDF compression."""
 
+    engine = "ghostscript"
+
     def __init__(
         self,
         files: Sequence[Path],
         level: CompressionLevel = CompressionLevel.MEDIUM,
         output_dir: Path | None = None,
+        batched: bool = False,
         parent: BaseWorker | None = None,
     ) -> None:
         super().__init__(files, parent)
         self._level = level
         self._output_dir = output_dir
+        self._batched = batched
 
-    def process_file(self, file_path: Path, index: int, total: int) -> FileResult:
+    def build_job(self, file_path: Path, index: int, total: int) -> FileJob:
         parent = self._output_dir or file_path.parent
         output_path = ensure_unique_path(parent / f"{file_path.stem}_compressed{file_path.suffix}")
-        result = compress_pdf(
-            src=file_path,
-            dst=output_path,
-            level=self._level,
-        )
-        return FileResult(
-            source=file_path,
-            output=output_path if result.success else None,
-            status=TaskStatus.SUCCESS if result.success else TaskStatus.FAILED,
-            message=(
-                f"\u2713 {file_path.name} \u2192 {result.message}"
-                if result.success
-                else f"\u2717 {file_path.name} \u2192 {result.message}"
-            ),
+        return FileJob(
+            file_path,
+            compress_pdf,
+            {
+                "src": file_path,
+                "dst": output_path,
+                "level": self._level,
+                "batched": self._batched,
+            },
         )
@@ -1,5 +1,5 @@
 """
-Worker for PDF to PNG conversion.
+Worker for PDF to image conversion.
 """
 
 from __future__ import annotations
@@ -7,40 +7,102 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from pdf_toolbox.core.convert import convert_pdf_to_png
-from pdf_toolbox.workers.base_worker import BaseWorker, FileResult, TaskStatus
+from pdf_toolbox.core.batch import FileJob
+from pdf_toolbox.core.convert import RenderEngine, convert_pdf_to_png
+from pdf_toolbox.core.raster import DEFAULT_PNG_LEVEL, DEFAULT_QUALITY, ImageFormat
+from pdf_toolbox.workers.base_worker import BaseWorker, FileResult
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from pdf_toolbox.core.convert import ConvertResult
+
 
 class ConvertWorker(BaseWorker):
-    """Background worker for PDF to PNG conversion."""
+    """
+    Background worker for PDF to image conversion.
+
+    With the PyMuPDF engine, or pdftoppm with split_pages, the worker's
+    processes render the pages of one document at a time rather than
+    separate documents, which is what speeds up a large drawing set; files
+    are then converted one after another.
+    """
+
+    engine = "pdftoppm"
 
     def __init__(
         self,
         files: Sequence[Path],
         dpi: int = 1200,
         output_dir: Path | None = None,
+        render_engine: RenderEngine = RenderEngine.PDFTOPPM,
+        fallback: bool = False,
+        split_pages: bool = False,
+        memory_budget: int | None = None,
+        image_format: ImageFormat = ImageFormat.PNG,
+        png_level: int = DEFAULT_PNG_LEVEL,
+        quality: int = DEFAULT_QUALITY,
+        encode_workers: int = 2,
+        subdirectory: bool = False,
+        write_manifest: bool = False,
+        pyramid: Sequence[int] = (),
+        incremental: bool = False,
         parent: BaseWorker | None = None,
     ) -> None:
         super().__init__(files, parent)
         self._dpi = dpi
         self._output_dir = output_dir
+        self._render_engine = render_engine
+        self._fallback = fallback
+        self._memory_budget = memory_budget
+        self._image_format = image_format
+        self._png_level = png_level
+        self._quality = quality
+        self._encode_workers = encode_workers
+        self._subdirectory = subdirectory
+        self._write_manifest = write_manifest
+        self._pyramid = tuple(pyramid)
+        self._incremental = incremental
+        self._split_pages = split_pages or render_engine is RenderEngine.PYMUPDF
+        self._render_workers = 1
+        if render_engine is RenderEngine.PYMUPDF:
+            self.engine = "pymupdf"
+
+    def set_max_workers(self, count: int) -> None:
+        if self._split_pages:
+            self._render_workers = max(1, count)
+            count = 1
+        super().set_max_workers(count)
 
-    def process_file(self, file_path: Path, index: int, total: int) -> FileResult:
-        result = convert_pdf_to_png(
+    @property
+    def max_workers(self) -> int:
+        return max(super().max_workers, self._render_workers)
+
+    def build_job(self, file_path: Path, index: int, total: int) -> FileJob:
+        return FileJob(
             file_path,
-            output_dir=self._output_dir,
-            dpi=self._dpi,
-        )
-        return FileResult(
-            source=file_path,
-            output=result.output_files[0] if result.output_files else None,
-            status=TaskStatus.SUCCESS if result.success else TaskStatus.FAILED,
-            message=(
-                f"\u2713 {file_path.name} \u2192 {result.message}"
-                if result.success
-                else f"\u2717 {file_path.name} \u2192 {result.message}"
-            ),
+            convert_pdf_to_png,
+            {
+                "pdf_path": file_path,
+                "output_dir": self._output_dir,
+                "dpi": self._dpi,
+                "engine": self._render_engine,
+                "max_workers": self._render_workers,
+                "fallback": self._fallback,
+                "memory_budget": self._memory_budget,
+                "image_format": self._image_format,
+                "png_level": self._png_level,
+                "quality": self._quality,
+                "encode_workers": self._encode_workers,
+                "subdirectory": self._subdirectory,
+                "write_manifest": self._write_manifest,
+                "pyramid": self._pyramid,
+                "incremental": self._incremental,
+            },
         )
+
+    def make_result(self, file_path: Path, result: ConvertResult) -> FileResult:
+        file_result = super().make_result(file_path, result)
+        if file_result.outputs and result.manifest_file is not None:
+            file_result.outputs.append(result.manifest_file)
+        return file_result
@@ -7,39 +7,152 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from pdf_toolbox.core.merge import merge_pdfs
-from pdf_toolbox.workers.base_worker import BaseWorker, FileResult
+from pdf_toolbox.core.cancel import OperationCancelledError
+from pdf_toolbox.core.merge import (
+    DEFAULT_FAN_IN,
+    MergeInput,
+    append_pdfs,
+    merge_pdfs,
+    merge_pdfs_tree,
+)
+from pdf_toolbox.workers.base_worker import BaseWorker, FileResult, TaskStatus
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
 
 class MergeWorker(BaseWorker):
-    """Background worker for PDF merge. Overrides run() for batch operation."""
+    """
+    Background worker for PDF merge. Overrides run() for batch operation.
+    Progress counts inputs, step progress the pages of the current one;
+    results hold one FileResult per input. After set_max_workers(n > 1),
+    large merges run as a tree merge (merge_pdfs_tree) and progress counts
+    the groups merged in each of its stages. With append, output_path is an
+    existing PDF the inputs are appended to (append_pdfs). pages holds a
+    page spec per input (see select_pages), "" for all of its pages.
+    """
+
+    engine = "pikepdf"
 
     def __init__(
         self,
         files: Sequence[Path],
         output_path: Path,
+        append: bool = False,
+        pages: Sequence[str] | None = None,
         parent: BaseWorker | None = None,
     ) -> None:
         super().__init__(files, parent)
         self._output_path = output_path
+        self._append = append
+        self._pages = list(pages) if pages is not None else None
+        self._stage = ""
 
     def run(self) -> None:
         """Override: merge is a single-batch operation."""
-        self.log_message.emit(f"\u6b63\u5728\u5408\u4f75 {len(self._files)} \u500b\u6a94\u6848...")
-        self.progress_updated.emit(0, 1, "\u5408\u4f75\u4e2d...")
+        total = len(self._files)
+        if total == 0:
+            self.finish(False, "\u6c92\u6709\u6a94\u6848\u9700\u8981\u5408\u4f75\u3002", [])
+            return
+
+        self.log(f"\u6b63\u5728\u5408\u4f75 {total} \u500b\u6a94\u6848...")
+        self.report_progress(1, total, f"\u5408\u4f75\u4e2d: {self._files[0].name}")
+
+        def on_progress(done: int, steps: int) -> None:
+            if done < total:
+                self.report_progress(
+                    done + 1, total, f"\u5408\u4f75\u4e2d: {self._files[done].name}"
+                )
+            elif done == total:
+                self.report_progress(total, total, "\u5beb\u5165\u5408\u4f75\u6a94\u6848...")
 
         try:
-            result = merge_pdfs(self._files, self._output_path)
-            self.progress_updated.emit(1, 1, result.message)
-            self.log_message.emit(result.message)
-            self.task_finished.emit(result.success, result.message, [])
+            if self._append:
+                self.log(f"\u9644\u52a0\u5230 {self._output_path.name}")
+                result = append_pdfs(
+                    self._output_path,
+                    self._files,
+                    on_progress=on_progress,
+                    cancel=self.cancel_token,
+                    on_page=self.report_step,
+                    pages=self._pages,
+                )
+            elif self._max_workers > 1 and total > DEFAULT_FAN_IN:
+                result = merge_pdfs_tree(
+                    self._files,
+                    self._output_path,
+                    self._max_workers,
+                    on_progress=self._report_tree_progress,
+                    cancel=self.cancel_token,
+                    on_page=self.report_step,
+                    on_stage=self._start_stage,
+                    pages=self._pages,
+                )
+            else:
+                result = merge_pdfs(
+                    self._files,
+                    self._output_path,
+                    on_progress=on_progress,
+                    cancel=self.cancel_token,
+                    on_page=self.report_step,
+                    pages=self._pages,
+                )
+        except OperationCancelledError:
+            self._results = [self._cancelled_result(path) for path in self._files]
+            msg = (
+                f"\u5df2\u53d6\u6d88\u9644\u52a0\uff0c{self._output_path.name} \u7dad\u6301\u539f\u72c0\u3002"
+                if self._append
+                else "\u5df2\u53d6\u6d88\u5408\u4f75\uff0c\u672a\u5beb\u5165\u8f38\u51fa\u6a94\u6848\u3002"
+            )
+            self.log(msg)
+            self.finish(False, msg, self._results)
+            return
         except Exception as exc:
             msg = f"\u5408\u4f75\u5931\u6557: {exc}"
-            self.log_message.emit(msg)
-            self.task_finished.emit(False, msg, [])
+            self.log(msg)
+            self.finish(False, msg, [])
+            return
+
+        self._results = [self._input_result(item, result.output_path) for item in result.inputs]
+        for item, file_result in zip(result.inputs, self._results, strict=True):
+            if not item.merged:
+                self.log(file_result.message)
+            self._updates.file_completed(
+                item.source.name, file_result.status == TaskStatus.SUCCESS, file_result.message
+            )
+        self.report_progress(total, total, result.message)
+        self.log(result.message)
+        self.finish(result.success, result.message, self._results)
+
+    def _start_stage(self, stage: int, stages: int) -> None:
+        self._stage = f"\u7b2c {stage}/{stages} \u968e\u6bb5"
+        if stage == stages:
+            self.log(f"{self._stage}\uff1a\u5408\u4f75\u5404\u7d44\u7d50\u679c")
+        else:
+            self.log(
+                f"{self._stage}\uff1a\u4ee5 {self._max_workers} \u500b\u9032\u7a0b\u5206\u7d44\u5408\u4f75"
+            )
+
+    def _report_tree_progress(self, done: int, steps: int) -> None:
+        self.report_progress(done, steps, f"{self._stage or '\u5408\u4f75\u4e2d'} ({done}/{steps})")
+
+    def _input_result(self, item: MergeInput, output: Path | None) -> FileResult:
+        if item.merged and output is not None:
+            return FileResult(
+                source=item.source,
+                output=output,
+                status=TaskStatus.SUCCESS,
+                message=f"\u2713 {item.source.name} \u2192 {item.page_count} \u9801",
+                engine=self.engine,
+                outputs=[output],
+            )
+        return FileResult(
+            source=item.source,
+            output=None,
+            status=TaskStatus.FAILED,
+            message=f"\u2717 {item.source.name} \u2192 {item.error or '\u672a\u5beb\u5165\u5408\u4f75\u6a94\u6848'}",
+            engine=self.engine,
+        )
 
     def process_file(self, file_path: Path, index: int, total: int) -> FileResult:
         raise NotImplementedError("MergeWorker uses batch run().")
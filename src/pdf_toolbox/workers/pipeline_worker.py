@@ -0,0 +1,42 @@
+"""
+Worker for multi-step pipelines.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pdf_toolbox.core.batch import FileJob
+from pdf_toolbox.core.pipeline import generate_output_path, run_pipeline
+from pdf_toolbox.workers.base_worker import BaseWorker
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from pdf_toolbox.core.pipeline import PipelineStep
+
+
+class PipelineWorker(BaseWorker):
+    """Background worker running the same pipeline on every file."""
+
+    engine = "pymupdf"
+
+    def __init__(
+        self,
+        files: Sequence[Path],
+        steps: list[PipelineStep],
+        output_dir: Path | None = None,
+        parent: BaseWorker | None = None,
+    ) -> None:
+        super().__init__(files, parent)
+        self._steps = list(steps)
+        self._output_dir = output_dir
+
+    def build_job(self, file_path: Path, index: int, total: int) -> FileJob:
+        output_path = generate_output_path(file_path, self._output_dir)
+        return FileJob(
+            file_path,
+            run_pipeline,
+            {"src": file_path, "dst": output_path, "steps": self._steps},
+        )
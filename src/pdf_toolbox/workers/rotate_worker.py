@@ -7,9 +7,10 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from pdf_toolbox.core.batch import FileJob
 from pdf_toolbox.core.rotate import rotate_pdf
 from pdf_toolbox.core.utils import ensure_unique_path
-from pdf_toolbox.workers.base_worker import BaseWorker, FileResult, TaskStatus
+from pdf_toolbox.workers.base_worker import BaseWorker
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -18,6 +19,8 @@ if TYPE_CHECKING:
 class RotateWorker(BaseWorker):
     """Background worker for PDF rotation."""
 
+    engine = "pikepdf"
+
     def __init__(
         self,
         files: Sequence[Path],
@@ -31,22 +34,16 @@ class RotateWorker(BaseWorker):
         self._page_indices = page_indices
         self._output_dir = output_dir
 
-    def process_file(self, file_path: Path, index: int, total: int) -> FileResult:
+    def build_job(self, file_path: Path, index: int, total: int) -> FileJob:
         parent = self._output_dir or file_path.parent
         output_path = ensure_unique_path(parent / f"{file_path.stem}_rotated{file_path.suffix}")
-        result = rotate_pdf(
-            src=file_path,
-            dst=output_path,
-            degrees=self._degrees,
-            page_indices=self._page_indices,
-        )
-        return FileResult(
-            source=file_path,
-            output=output_path if result.success else None,
-            status=TaskStatus.SUCCESS if result.success else TaskStatus.FAILED,
-            message=(
-                f"\u2713 {file_path.name} \u2192 {result.message}"
-                if result.success
-                else f"\u2717 {file_path.name} \u2192 {result.message}"
-            ),
+        return FileJob(
+            file_path,
+            rotate_pdf,
+            {
+                "src": file_path,
+                "dst": output_path,
+                "degrees": self._degrees,
+                "page_indices": self._page_indices,
+            },
         )
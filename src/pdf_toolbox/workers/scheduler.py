@@ -0,0 +1,214 @@
+"""
+Application-wide job scheduler shared by all feature pages.
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from pdf_toolbox.core.batch import default_max_workers
+
+if TYPE_CHECKING:
+    from pdf_toolbox.workers.base_worker import BaseWorker
+
+
+class JobState(Enum):
+    """Lifecycle of a scheduled job."""
+
+    QUEUED = auto()
+    RUNNING = auto()
+    DONE = auto()
+    CANCELLED = auto()
+
+
+# Default cap on concurrent processes per external engine.
+DEFAULT_ENGINE_LIMITS: dict[str, int] = {
+    "ghostscript": 2,
+    "pdftoppm": 2,
+}
+
+
+@dataclass
+class Job:
+    """
+    A worker submitted to the scheduler. Once the job is done or cancelled
+    the worker is released (worker is None); the other fields stay for the
+    queue page.
+    """
+
+    job_id: int
+    title: str
+    worker: BaseWorker | None
+    engine: str
+    file_count: int
+    state: JobState = JobState.QUEUED
+    summary: str = ""
+    slots: int = 1
+
+
+class JobScheduler(QObject):
+    """
+    Queue for BaseWorker jobs with a global process budget.
+
+    A running job occupies as many slots as its worker has processes. Jobs
+    start in submission order whenever the global budget and the limit of
+    their engine allow it; a job blocked on a busy engine does not hold back
+    later jobs that use a different one. A job asking for more processes
+    than its limits allow is started with fewer.
+
+    The scheduler owns submitted workers and deletes each one once its job
+    is done or cancelled, so a long session does not keep every finished
+    worker and its results alive.
+
+    Signals:
+        job_added(job_id: int)
+        job_changed(job_id: int)
+        job_cancelled(job_id: int)  -- a queued job was cancelled before it started;
+                                       its worker never emits task_finished
+    """
+
+    job_added = Signal(int)
+    job_changed = Signal(int)
+    job_cancelled = Signal(int)
+
+    def __init__(
+        self,
+        max_slots: int | None = None,
+        engine_limits: dict[str, int] | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._max_slots = max(1, max_slots or default_max_workers())
+        self._engine_limits = dict(
+            DEFAULT_ENGINE_LIMITS if engine_limits is None else engine_limits
+        )
+        self._jobs: list[Job] = []
+        self._ids = itertools.count(1)
+
+    # -- Configuration --
+
+    @property
+    def max_slots(self) -> int:
+        return self._max_slots
+
+    def set_max_slots(self, slots: int) -> None:
+        """Change the global process budget; queued jobs may start right away."""
+        self._max_slots = max(1, slots)
+        self._start_ready()
+
+    def engine_limit(self, engine: str) -> int | None:
+        return self._engine_limits.get(engine)
+
+    def set_engine_limit(self, engine: str, limit: int | None) -> None:
+        """Cap the processes of one engine (None removes the cap)."""
+        if limit is None:
+            self._engine_limits.pop(engine, None)
+        else:
+            self._engine_limits[engine] = max(1, limit)
+        self._start_ready()
+
+    # -- Jobs --
+
+    @property
+    def jobs(self) -> list[Job]:
+        return list(self._jobs)
+
+    def job(self, job_id: int) -> Job | None:
+        return next((j for j in self._jobs if j.job_id == job_id), None)
+
+    def submit(self, worker: BaseWorker, title: str) -> Job:
+        """Queue a worker; it is started by the scheduler, never by the caller."""
+        job = Job(next(self._ids), title, worker, worker.engine, len(worker.files))
+        worker.setParent(self)
+        # Bound slots (not lambdas) so the calls are queued to this object's thread.
+        worker.finished.connect(self._on_worker_finished)
+        worker.task_finished.connect(self._on_task_finished)
+        self._jobs.append(job)
+        self.job_added.emit(job.job_id)
+        self._start_ready()
+        return job
+
+    def cancel(self, worker: BaseWorker) -> None:
+        """Cancel a job: running workers are asked to stop, queued ones never start."""
+        job = next((j for j in self._jobs if j.worker is worker), None)
+        worker.cancel()
+        if job is None or job.state != JobState.QUEUED:
+            return
+        job.state = JobState.CANCELLED
+        job.summary = "\u5df2\u53d6\u6d88\uff08\u5c1a\u672a\u958b\u59cb\uff09"
+        self._release(job)
+        self.job_changed.emit(job.job_id)
+        self.job_cancelled.emit(job.job_id)
+
+    def clear_finished(self) -> None:
+        """Forget jobs that are done or cancelled."""
+        self._jobs = [j for j in self._jobs if j.state in (JobState.QUEUED, JobState.RUNNING)]
+
+    # -- Internal --
+
+    @staticmethod
+    def _release(job: Job) -> None:
+        """Let go of a finished job's worker; Qt deletes it from the event loop."""
+        worker, job.worker = job.worker, None
+        if worker is not None:
+            worker.deleteLater()
+
+    def _used_slots(self, engine: str | None = None) -> int:
+        return sum(
+            j.slots
+            for j in self._jobs
+            if j.state == JobState.RUNNING and (engine is None or j.engine == engine)
+        )
+
+    def _start_ready(self) -> None:
+        for job in self._jobs:
+            if job.state != JobState.QUEUED:
+                continue
+            free = self._max_slots - self._used_slots()
+            limit = self._engine_limits.get(job.engine)
+            if limit is not None:
+                free = min(free, limit - self._used_slots(job.engine))
+            if free <= 0:
+                continue
+            job.slots = min(job.worker.max_workers, free)
+            job.worker.set_max_workers(job.slots)
+            job.state = JobState.RUNNING
+            self.job_changed.emit(job.job_id)
+            job.worker.start()
+
+    def _job_for_sender(self) -> Job | None:
+        worker = self.sender()
+        return next((j for j in self._jobs if j.worker is worker), None)
+
+    @Slot(bool, str, list)
+    def _on_task_finished(self, _success: bool, summary: str, _results: list) -> None:
+        job = self._job_for_sender()
+        if job is None or job.state != JobState.RUNNING:
+            return
+        job.summary = summary
+        self.job_changed.emit(job.job_id)
+
+    @Slot()
+    def _on_worker_finished(self) -> None:
+        job = self._job_for_sender()
+        if job is not None and job.state == JobState.RUNNING:
+            job.state = JobState.CANCELLED if job.worker.is_cancelled else JobState.DONE
+            self._release(job)
+            self.job_changed.emit(job.job_id)
+        self._start_ready()
+
+
+_scheduler: JobScheduler | None = None
+
+
+def get_scheduler() -> JobScheduler:
+    """Return the application-wide scheduler, creating it on first use."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+    return _scheduler
@@ -7,15 +7,24 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from pdf_toolbox.core.batch import FileJob
 from pdf_toolbox.core.split import SplitMode, split_pdf
-from pdf_toolbox.workers.base_worker import BaseWorker, FileResult, TaskStatus
+from pdf_toolbox.workers.base_worker import BaseWorker
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
 
 class SplitWorker(BaseWorker):
-    """Background worker for PDF split."""
+    """
+    Background worker for PDF split.
+
+    With shard_parts, the worker's processes write the parts of one document
+    at a time rather than separate documents, which is what speeds up
+    splitting a long scan; files are then split one after another.
+    """
+
+    engine = "pymupdf"
 
     def __init__(
         self,
@@ -25,6 +34,7 @@ class SplitWorker(BaseWorker):
         page_ranges: str = "",
         pages_per_split: int = 1,
         page_numbers_str: str = "",
+        shard_parts: bool = False,
         parent: BaseWorker | None = None,
     ) -> None:
         super().__init__(files, parent)
@@ -33,29 +43,36 @@ class SplitWorker(BaseWorker):
         self._page_ranges = page_ranges
         self._pages_per_split = pages_per_split
         self._page_numbers_str = page_numbers_str
+        self._shard_parts = shard_parts
+        self._shard_workers = 1
+
+    def set_max_workers(self, count: int) -> None:
+        if self._shard_parts:
+            self._shard_workers = max(1, count)
+            count = 1
+        super().set_max_workers(count)
 
-    def process_file(self, file_path: Path, index: int, total: int) -> FileResult:
+    @property
+    def max_workers(self) -> int:
+        return max(super().max_workers, self._shard_workers)
+
+    def build_job(self, file_path: Path, index: int, total: int) -> FileJob:
         page_numbers = None
         if self._mode == SplitMode.EXTRACT_PAGES and self._page_numbers_str:
             page_numbers = [
                 int(x.strip()) - 1 for x in self._page_numbers_str.split(",") if x.strip().isdigit()
             ]
 
-        result = split_pdf(
-            src=file_path,
-            output_dir=self._output_dir,
-            mode=self._mode,
-            page_ranges=self._page_ranges,
-            pages_per_split=self._pages_per_split,
-            page_numbers=page_numbers,
-        )
-        return FileResult(
-            source=file_path,
-            output=result.output_files[0] if result.output_files else None,
-            status=TaskStatus.SUCCESS if result.success else TaskStatus.FAILED,
-            message=(
-                f"\u2713 {file_path.name} \u2192 {result.message}"
-                if result.success
-                else f"\u2717 {file_path.name} \u2192 {result.message}"
-            ),
+        return FileJob(
+            file_path,
+            split_pdf,
+            {
+                "src": file_path,
+                "output_dir": self._output_dir,
+                "mode": self._mode,
+                "page_ranges": self._page_ranges,
+                "pages_per_split": self._pages_per_split,
+                "page_numbers": page_numbers,
+                "max_workers": self._shard_workers,
+            },
         )
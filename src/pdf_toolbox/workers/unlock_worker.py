@@ -7,41 +7,65 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from pdf_toolbox.core.unlock import generate_output_path, repair_pdf
-from pdf_toolbox.workers.base_worker import BaseWorker, FileResult, TaskStatus
+from pdf_toolbox.core.batch import FileJob
+from pdf_toolbox.core.unlock import (
+    RepairEngine,
+    available_engines,
+    generate_output_path,
+    repair_pdf,
+)
+from pdf_toolbox.workers.base_worker import BaseWorker, FileResult
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from pdf_toolbox.core.unlock import RepairResult
+
 
 class UnlockWorker(BaseWorker):
-    """Background worker for PDF unlock/repair."""
+    """
+    Background worker for PDF unlock/repair.
+
+    The repair chain falls through to Ghostscript when it is installed (as
+    long-lived sessions with batched), so the job then counts against the
+    scheduler's Ghostscript limit.
+    """
+
+    engine = "pymupdf"
 
     def __init__(
         self,
         files: Sequence[Path],
         password: str | None = None,
+        batched: bool = False,
         parent: BaseWorker | None = None,
     ) -> None:
         super().__init__(files, parent)
         self._password = password
+        self._batched = batched
+        if RepairEngine.GHOSTSCRIPT in available_engines():
+            self.engine = "ghostscript"
 
-    def process_file(self, file_path: Path, index: int, total: int) -> FileResult:
+    def build_job(self, file_path: Path, index: int, total: int) -> FileJob:
         output_path = generate_output_path(file_path)
-        result = repair_pdf(
-            src=file_path,
-            dst=output_path,
-            password=self._password,
-            on_attempt=lambda name: self.log_message.emit(f"  \u5617\u8a66 {name}..."),
-        )
-        return FileResult(
-            source=file_path,
-            output=output_path if result.success else None,
-            status=TaskStatus.SUCCESS if result.success else TaskStatus.FAILED,
-            message=(
-                f"\u2713 {file_path.name} \u2192 {result.message}"
-                if result.success
-                else f"\u2717 {file_path.name} \u2192 {result.message}"
-            ),
-            engine=result.engine.name if result.engine else "",
+        return FileJob(
+            file_path,
+            repair_pdf,
+            {
+                "src": file_path,
+                "dst": output_path,
+                "password": self._password,
+                "batched": self._batched,
+            },
         )
+
+    def run_job(self, file_path: Path, job: FileJob) -> FileResult:
+        # Engine attempts are only logged when running in this thread; a lambda
+        # cannot be sent to a worker process.
+        job.kwargs["on_attempt"] = lambda name: self.log(f"  \u5617\u8a66 {name}...")
+        return self.make_result(file_path, job.run())
+
+    def make_result(self, file_path: Path, result: RepairResult) -> FileResult:
+        file_result = super().make_result(file_path, result)
+        file_result.engine = result.engine.name if result.engine else ""
+        return file_result
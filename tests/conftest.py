@@ -0,0 +1,44 @@
+"""Shared test fixtures."""
+
+from pathlib import Path
+
+import fitz
+import pytest
+
+from tests.helpers import MakePdf
+
+
+def _make_pdf(
+    path: Path,
+    pages: int = 1,
+    *,
+    text: str | None = "page {n}",
+    size: tuple[float, float] | None = None,
+    user_pw: str = "",
+) -> Path:
+    """
+    Write a PDF with pages pages to path (creating its folder) and return path.
+
+    Each page shows text formatted with {stem} (the file name without suffix),
+    {i} (0-based page index) and {n} (1-based page number); None leaves the
+    pages blank. size is (width, height) in points, A4 if omitted. A user_pw
+    encrypts the file with AES-256 (owner password "owner").
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(**({"width": size[0], "height": size[1]} if size else {}))
+        if text is not None:
+            page.insert_text((20, 100), text.format(stem=path.stem, i=i, n=i + 1))
+    if user_pw:
+        doc.save(str(path), encryption=fitz.PDF_ENCRYPT_AES_256, user_pw=user_pw, owner_pw="owner")
+    else:
+        doc.save(str(path))
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def make_pdf() -> MakePdf:
+    """Factory for test PDFs: make_pdf(path, pages=1, *, text, size, user_pw)."""
+    return _make_pdf
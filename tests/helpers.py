@@ -0,0 +1,27 @@
+"""Helpers shared by the test modules."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+from PySide6.QtCore import QThread
+
+from pdf_toolbox.workers.base_worker import BaseWorker, FileResult
+
+# The make_pdf fixture (tests/conftest.py): make_pdf(path, pages=1, *, text, size, user_pw).
+type MakePdf = Callable[..., Path]
+
+
+class SleepWorker(BaseWorker):
+    """A one-file worker that sleeps for millis, then reports success."""
+
+    def __init__(self, engine: str = "", millis: int = 50) -> None:
+        super().__init__([Path("a.pdf")])
+        self.engine = engine
+        self._millis = millis
+
+    def run(self) -> None:
+        QThread.msleep(self._millis)
+        self.task_finished.emit(True, "ok", [])
+
+    def process_file(self, file_path: Path, index: int, total: int) -> FileResult:
+        raise NotImplementedError
@@ -0,0 +1,118 @@
+"""Tests for the headless command-line runner."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pikepdf
+import pytest
+
+import pdf_toolbox
+from pdf_toolbox.cli import EXIT_FAILED, EXIT_OK, collect_inputs, main
+from tests.helpers import MakePdf
+
+
+class TestCli:
+    def test_does_not_import_qt(self) -> None:
+        code = "import sys, pdf_toolbox.cli; sys.exit('PySide6' in sys.modules)"
+        env = {**os.environ, "PYTHONPATH": str(Path(pdf_toolbox.__file__).parents[1])}
+        result = subprocess.run([sys.executable, "-c", code], env=env, check=False)
+        assert result.returncode == 0
+
+    def test_collect_inputs_expands_directories(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        make_pdf(tmp_path / "b.pdf", 2)
+        make_pdf(tmp_path / "a.pdf", 2)
+        (tmp_path / "notes.txt").write_text("x")
+        assert collect_inputs([tmp_path]) == [tmp_path / "a.pdf", tmp_path / "b.pdf"]
+
+    def test_rotate_directory(self, tmp_path: Path, capsys, make_pdf: MakePdf) -> None:
+        src = tmp_path / "in"
+        src.mkdir()
+        for name in ("a", "b", "c"):
+            make_pdf(src / f"{name}.pdf", 2)
+        out = tmp_path / "out"
+
+        code = main(["run", "rotate", "--degrees", "90", "-j", "1", "-q", str(src), str(out)])
+
+        summary = json.loads(capsys.readouterr().out)
+        assert code == EXIT_OK
+        assert summary["succeeded"] == 3
+        assert summary["failed"] == 0
+        assert sorted(p.name for p in out.iterdir()) == [
+            "a_rotated.pdf",
+            "b_rotated.pdf",
+            "c_rotated.pdf",
+        ]
+
+    def test_failure_sets_exit_status(self, tmp_path: Path, capsys, make_pdf: MakePdf) -> None:
+        good = make_pdf(tmp_path / "good.pdf", 2)
+        bad = tmp_path / "bad.pdf"
+        bad.write_text("not a pdf")
+
+        code = main(["run", "rotate", "-j", "1", "-q", str(good), str(bad), str(tmp_path / "out")])
+
+        summary = json.loads(capsys.readouterr().out)
+        assert code == EXIT_FAILED
+        assert [f["status"] for f in summary["files"]] == ["success", "failed"]
+
+    def test_merge_writes_single_file(self, tmp_path: Path, capsys, make_pdf: MakePdf) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf") for i in range(3)]
+        output = tmp_path / "merged.pdf"
+
+        code = main(["run", "merge", "-q", *map(str, inputs), str(output)])
+
+        assert code == EXIT_OK
+        assert json.loads(capsys.readouterr().out)["files"][0]["outputs"] == [str(output)]
+        with pikepdf.open(output) as pdf:
+            assert len(pdf.pages) == 3
+
+    def test_merge_append_extends_existing_file(
+        self, tmp_path: Path, capsys, make_pdf: MakePdf
+    ) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf") for i in range(2)]
+        output = make_pdf(tmp_path / "archive.pdf", 3)
+        original = output.read_bytes()
+
+        code = main(["run", "merge", "-q", "--append", *map(str, inputs), str(output)])
+
+        assert code == EXIT_OK
+        assert output.read_bytes().startswith(original)
+        with pikepdf.open(output) as pdf:
+            assert len(pdf.pages) == 5
+
+    def test_merge_picks_pages_per_input(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        a = make_pdf(tmp_path / "a.pdf", 5)
+        b = make_pdf(tmp_path / "b.pdf", 4)
+        output = tmp_path / "merged.pdf"
+
+        code = main(["run", "merge", "-q", f"{a}[1-2,5]", f"{b}[-2:]", str(output)])
+
+        assert code == EXIT_OK
+        with pikepdf.open(output) as pdf:
+            assert len(pdf.pages) == 5
+
+    def test_merge_rejects_malformed_page_spec(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        a = make_pdf(tmp_path / "a.pdf", 2)
+        with pytest.raises(SystemExit):
+            main(["run", "merge", "-q", f"{a}[1;2]", str(tmp_path / "merged.pdf")])
+
+    def test_merge_reports_inputs_left_out(self, tmp_path: Path, capsys, make_pdf: MakePdf) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf") for i in range(2)]
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+        output = tmp_path / "merged.pdf"
+
+        code = main(
+            ["run", "merge", "-q", str(inputs[0]), str(broken), str(inputs[1]), str(output)]
+        )
+
+        assert code == EXIT_FAILED
+        summary = json.loads(capsys.readouterr().out)
+        assert [(f["source"], f["status"]) for f in summary["files"]] == [
+            (str(output), "success"),
+            (str(broken), "failed"),
+        ]
+        with pikepdf.open(output) as pdf:
+            assert len(pdf.pages) == 2
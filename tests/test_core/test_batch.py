@@ -0,0 +1,49 @@
+"""Tests for core batch module."""
+
+from pathlib import Path
+
+from pdf_toolbox.core.batch import FileJob, iter_parallel
+from pdf_toolbox.core.cancel import CancelToken
+from pdf_toolbox.core.utils import human_readable_size
+
+
+def _jobs(sizes: list[int]) -> list[FileJob]:
+    return [
+        FileJob(Path(f"{size}.pdf"), human_readable_size, {"size_bytes": size}) for size in sizes
+    ]
+
+
+class TestFileJob:
+    def test_run_in_process(self) -> None:
+        job = FileJob(Path("a.pdf"), human_readable_size, {"size_bytes": 2048})
+        assert job.run() == "2.0 KB"
+
+    def test_output_is_dst_kwarg(self) -> None:
+        job = FileJob(Path("a.pdf"), human_readable_size, {"dst": Path("b.pdf")})
+        assert job.output == Path("b.pdf")
+
+
+class TestIterParallel:
+    def test_results_in_submission_order(self) -> None:
+        sizes = [500, 1536, 2 * 1024 * 1024, 10, 4096]
+        outcomes = list(iter_parallel(_jobs(sizes), max_workers=2))
+        assert [job.source.name for job, _ in outcomes] == [f"{s}.pdf" for s in sizes]
+        assert [out for _, out in outcomes] == [human_readable_size(s) for s in sizes]
+
+    def test_failed_job_yields_error(self) -> None:
+        error = ValueError("bad spec")
+        jobs = [*_jobs([1]), FileJob.failed(Path("x.pdf"), error), *_jobs([2])]
+        outcomes = [out for _, out in iter_parallel(jobs, max_workers=2)]
+        assert outcomes[1] is error
+        assert outcomes[2] == human_readable_size(2)
+
+    def test_exception_in_worker_is_returned(self) -> None:
+        jobs = [FileJob(Path("x.pdf"), human_readable_size, {"size_bytes": "x"})]
+        (_, outcome), *_ = iter_parallel(jobs, max_workers=2)
+        assert isinstance(outcome, TypeError)
+
+    def test_cancel_before_start_schedules_nothing(self) -> None:
+        token = CancelToken()
+        token.cancel()
+        outcomes = list(iter_parallel(_jobs([1, 2, 3]), max_workers=2, cancel=token))
+        assert outcomes == []
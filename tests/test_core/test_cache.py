@@ -0,0 +1,130 @@
+"""Tests for core cache module."""
+
+import os
+from pathlib import Path
+
+from pdf_toolbox.core.batch import FileJob
+from pdf_toolbox.core.cache import ResultCache
+from pdf_toolbox.core.utils import human_readable_size
+from pdf_toolbox.core.watermark import WatermarkConfig
+
+
+def _job(src: Path, dst: Path, size: int = 1) -> FileJob:
+    return FileJob(src, human_readable_size, {"src": src, "dst": dst, "size_bytes": size})
+
+
+def _dir_job(src: Path, out_dir: Path) -> FileJob:
+    return FileJob(src, human_readable_size, {"pdf_path": src, "output_dir": out_dir})
+
+
+def _store(cache: ResultCache, job: FileJob, content: bytes) -> Path:
+    job.output.write_bytes(content)
+    cache.store(job, [job.output])
+    return job.output
+
+
+class TestResultCache:
+    def test_hit_for_same_content_under_another_name(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path / "cache")
+        a = tmp_path / "a.pdf"
+        a.write_bytes(b"%PDF-1.4 same")
+        b = tmp_path / "b.pdf"
+        b.write_bytes(b"%PDF-1.4 same")
+
+        assert cache.fetch(_job(a, tmp_path / "a_out.pdf")) is None
+        _store(cache, _job(a, tmp_path / "a_out.pdf"), b"result")
+
+        hit = cache.fetch(_job(b, tmp_path / "b_out.pdf"))
+        assert hit is not None
+        assert hit.outputs == [tmp_path / "b_out.pdf"]
+        assert (tmp_path / "b_out.pdf").read_bytes() == b"result"
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_other_settings_or_content_miss(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path / "cache")
+        src = tmp_path / "in.pdf"
+        src.write_bytes(b"%PDF-1.4 one")
+        _store(cache, _job(src, tmp_path / "out.pdf"), b"result")
+
+        assert cache.fetch(_job(src, tmp_path / "x.pdf", size=2)) is None
+        src.write_bytes(b"%PDF-1.4 two")
+        assert cache.fetch(_job(src, tmp_path / "y.pdf")) is None
+
+    def test_replaced_setting_file_misses(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path / "cache")
+        src = tmp_path / "in.pdf"
+        src.write_bytes(b"%PDF-1.4")
+        logo = tmp_path / "logo.png"
+        logo.write_bytes(b"old logo")
+
+        def job(dst: Path) -> FileJob:
+            config = WatermarkConfig(image_path=logo)
+            return FileJob(src, human_readable_size, {"src": src, "dst": dst, "config": config})
+
+        _store(cache, job(tmp_path / "out.pdf"), b"result")
+        assert cache.fetch(job(tmp_path / "same.pdf")) is not None
+        logo.write_bytes(b"new logo")
+        assert cache.fetch(job(tmp_path / "new.pdf")) is None
+
+    def test_output_edited_in_place_invalidates_entry(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path / "cache")
+        src = tmp_path / "in.pdf"
+        src.write_bytes(b"%PDF-1.4")
+        out = _store(cache, _job(src, tmp_path / "out.pdf"), b"result")
+        with open(out, "ab") as f:
+            f.write(b" appended")
+
+        assert cache.fetch(_job(src, tmp_path / "again.pdf")) is None
+        assert cache.size() == 0
+
+    def test_output_dir_jobs_restore_file_names(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path / "cache")
+        src = tmp_path / "doc.pdf"
+        src.write_bytes(b"%PDF-1.4")
+        first = tmp_path / "first"
+        first.mkdir()
+        pages = [first / "doc-1.png", first / "doc-2.png"]
+        for page in pages:
+            page.write_bytes(page.name.encode())
+        cache.store(_dir_job(src, first), pages)
+
+        hit = cache.fetch(_dir_job(src, tmp_path / "second"))
+        assert hit is not None
+        assert [p.name for p in hit.outputs] == ["doc-1.png", "doc-2.png"]
+        assert (tmp_path / "second" / "doc-2.png").read_bytes() == b"doc-2.png"
+
+    def test_output_dir_jobs_restore_subfolders(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path / "cache")
+        src = tmp_path / "doc.pdf"
+        src.write_bytes(b"%PDF-1.4")
+        folder = tmp_path / "first" / "doc"
+        folder.mkdir(parents=True)
+        page = folder / "doc-1.png"
+        page.write_bytes(b"png")
+        cache.store(_dir_job(src, tmp_path / "first"), [page])
+
+        hit = cache.fetch(_dir_job(src, tmp_path / "second"))
+        assert hit is not None
+        assert hit.outputs == [tmp_path / "second" / "doc" / "doc-1.png"]
+        assert hit.outputs[0].read_bytes() == b"png"
+
+    def test_evict_removes_least_recently_used(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path / "cache", max_bytes=1500)
+        jobs = []
+        for i in range(3):
+            src = tmp_path / f"{i}.pdf"
+            src.write_bytes(f"%PDF-1.4 {i}".encode())
+            jobs.append(_job(src, tmp_path / f"{i}_out.pdf"))
+            _store(cache, jobs[-1], b"x" * 600)
+        # Distinct use times even on coarse file system clocks.
+        entries = sorted((tmp_path / "cache" / "objects").glob("*/*/entry.json"))
+        for n, meta in enumerate(entries):
+            os.utime(meta, ns=(n * 10**9, n * 10**9))
+        # Use the entry that would otherwise be evicted first.
+        oldest = entries[0].parent
+        used = next(j for j in jobs if cache.key(j) == oldest.name)
+        assert cache.fetch(_job(used.source, tmp_path / "reused.pdf")) is not None
+
+        assert cache.evict() == 1
+        assert oldest.exists()
+        assert cache.size() <= 1500
@@ -0,0 +1,56 @@
+"""Tests for core cancel module."""
+
+import pickle
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from pdf_toolbox.core.cancel import CancelToken, OperationCancelledError, run_process
+from pdf_toolbox.core.split import SplitMode, split_pdf
+from tests.helpers import MakePdf
+
+
+class TestCancelToken:
+    def test_initially_not_cancelled(self) -> None:
+        token = CancelToken()
+        assert not token.is_cancelled
+        token.raise_if_cancelled()
+
+    def test_cancel_raises(self) -> None:
+        token = CancelToken()
+        token.cancel()
+        with pytest.raises(OperationCancelledError):
+            token.raise_if_cancelled()
+
+    def test_pickles_outside_pool(self) -> None:
+        token = pickle.loads(pickle.dumps(CancelToken()))
+        assert isinstance(token, CancelToken)
+
+
+class TestRunProcess:
+    def test_completed(self) -> None:
+        result = run_process([sys.executable, "-c", "print('ok')"], CancelToken())
+        assert result.returncode == 0
+        assert result.stdout.strip() == "ok"
+
+    def test_cancel_terminates_child(self) -> None:
+        token = CancelToken()
+        threading.Timer(0.1, token.cancel).start()
+        started = time.monotonic()
+        with pytest.raises(OperationCancelledError):
+            run_process([sys.executable, "-c", "import time; time.sleep(30)"], token)
+        assert time.monotonic() - started < 1.0
+
+
+class TestCancelledSplit:
+    def test_no_partial_outputs(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "doc.pdf", 4)
+        out_dir = tmp_path / "out"
+        token = CancelToken()
+        token.cancel()
+        with pytest.raises(OperationCancelledError):
+            split_pdf(src, out_dir, SplitMode.EVERY_N_PAGES, pages_per_split=1, cancel=token)
+        assert list(out_dir.iterdir()) == []
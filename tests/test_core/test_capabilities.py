@@ -0,0 +1,47 @@
+"""Tests for core capabilities module."""
+
+from pdf_toolbox.core.capabilities import (
+    PIKEPDF,
+    Capability,
+    CapabilityRegistry,
+    get_registry,
+)
+
+
+class _CountingProbe:
+    def __init__(self, version: str) -> None:
+        self.calls = 0
+        self.version = version
+
+    def __call__(self) -> Capability:
+        self.calls += 1
+        return Capability("tool", True, self.version, "tool")
+
+
+class TestCapabilityRegistry:
+    def test_probes_once(self) -> None:
+        probe = _CountingProbe("1.0")
+        registry = CapabilityRegistry({"tool": probe})
+        for _ in range(100):
+            assert registry.command("tool") == "tool"
+        assert probe.calls == 1
+
+    def test_refresh_probes_again(self) -> None:
+        probe = _CountingProbe("1.0")
+        registry = CapabilityRegistry({"tool": probe})
+        registry.get("tool")
+        probe.version = "2.0"
+        assert registry.get("tool").version == "1.0"
+        registry.refresh("tool")
+        assert registry.get("tool").version == "2.0"
+        assert probe.calls == 2
+
+    def test_library_probe_reports_version(self) -> None:
+        import pikepdf
+
+        capability = CapabilityRegistry().get(PIKEPDF)
+        assert capability.available
+        assert capability.version == pikepdf.__version__
+
+    def test_registry_is_shared(self) -> None:
+        assert get_registry() is get_registry()
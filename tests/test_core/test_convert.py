@@ -0,0 +1,399 @@
+"""Tests for core convert module."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import fitz
+import pytest
+from PIL import Image
+
+from pdf_toolbox.core import convert
+from pdf_toolbox.core.cancel import CancelToken, OperationCancelledError
+from pdf_toolbox.core.convert import (
+    RenderEngine,
+    _page_runs,
+    _page_shards,
+    _remove_pages_since,
+    convert_pdf_to_png,
+    find_pdftoppm,
+    page_file_name,
+    read_manifest,
+)
+from pdf_toolbox.core.raster import ImageFormat
+from tests.helpers import MakePdf
+
+
+class TestPageFileName:
+    def test_pads_to_page_count_digits(self) -> None:
+        assert page_file_name("doc", 7, 9) == "doc-7.png"
+        assert page_file_name("doc", 7, 400) == "doc-007.png"
+        assert page_file_name("doc", 12, 12) == "doc-12.png"
+
+
+class TestPageShards:
+    def test_covers_every_page_once(self) -> None:
+        assert _page_shards(10, 4) == [(1, 3), (4, 6), (7, 8), (9, 10)]
+        assert _page_shards(3, 8) == [(1, 1), (2, 2), (3, 3)]
+        assert _page_shards(5, 1) == [(1, 5)]
+
+
+class TestPageRuns:
+    def test_consecutive_pages_split_to_shards(self) -> None:
+        assert _page_runs([1, 2, 3, 4, 7, 8, 10], 3) == [(1, 3), (4, 4), (7, 8), (10, 10)]
+        assert _page_runs([5, 6, 7], 1) == [(5, 7)]
+        assert _page_runs([], 4) == []
+
+
+@pytest.mark.skipif(find_pdftoppm() is None, reason="pdftoppm not installed")
+class TestShardedPdftoppm:
+    def test_matches_single_process(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 12, size=(200, 200))
+        (tmp_path / "single").mkdir()
+        (tmp_path / "sharded").mkdir()
+        single = convert_pdf_to_png(pdf, tmp_path / "single", dpi=36)
+        progress = []
+        sharded = convert_pdf_to_png(
+            pdf,
+            tmp_path / "sharded",
+            dpi=36,
+            max_workers=3,
+            on_progress=lambda done, total: progress.append((done, total)),
+        )
+        assert sharded.success
+        assert [p.name for p in sharded.output_files] == [p.name for p in single.output_files]
+        assert progress[-1] == (12, 12)
+
+    def test_incremental_renders_missing_ranges(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 12, size=(200, 200))
+        convert_pdf_to_png(pdf, tmp_path, dpi=36, incremental=True)
+        for page in (3, 4, 9):
+            (tmp_path / f"doc-{page:02d}.png").unlink()
+        progress = []
+        result = convert_pdf_to_png(
+            pdf,
+            tmp_path,
+            dpi=36,
+            incremental=True,
+            on_progress=lambda done, total: progress.append((done, total)),
+        )
+        assert result.success
+        assert progress[-1] == (3, 3)
+        assert all(p.exists() for p in result.output_files)
+        assert len(result.output_files) == 12
+
+
+class TestPyMuPDFEngine:
+    def test_renders_every_page_in_order(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 12, size=(200, 200))
+        result = convert_pdf_to_png(pdf, tmp_path, dpi=36, engine=RenderEngine.PYMUPDF)
+        assert result.success
+        assert [p.name for p in result.output_files] == [f"doc-{i:02d}.png" for i in range(1, 13)]
+        assert all(p.read_bytes().startswith(b"\x89PNG") for p in result.output_files)
+
+    def test_parallel_matches_serial(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 5, size=(200, 200))
+        (tmp_path / "serial").mkdir()
+        (tmp_path / "parallel").mkdir()
+        serial = convert_pdf_to_png(pdf, tmp_path / "serial", dpi=36, engine=RenderEngine.PYMUPDF)
+        parallel = convert_pdf_to_png(
+            pdf, tmp_path / "parallel", dpi=36, engine=RenderEngine.PYMUPDF, max_workers=2
+        )
+        assert [p.read_bytes() for p in serial.output_files] == [
+            p.read_bytes() for p in parallel.output_files
+        ]
+
+    def test_encoder_threads_match_inline(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 5, size=(200, 200))
+        (tmp_path / "inline").mkdir()
+        (tmp_path / "threads").mkdir()
+        inline = convert_pdf_to_png(pdf, tmp_path / "inline", dpi=36, engine=RenderEngine.PYMUPDF)
+        threads = convert_pdf_to_png(
+            pdf, tmp_path / "threads", dpi=36, engine=RenderEngine.PYMUPDF, encode_workers=2
+        )
+        assert [p.read_bytes() for p in inline.output_files] == [
+            p.read_bytes() for p in threads.output_files
+        ]
+
+    def test_jpeg_pages(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 3, size=(200, 200))
+        result = convert_pdf_to_png(
+            pdf,
+            tmp_path,
+            dpi=36,
+            engine=RenderEngine.PYMUPDF,
+            image_format=ImageFormat.JPEG,
+            quality=50,
+            encode_workers=1,
+        )
+        assert [p.name for p in result.output_files] == ["doc-1.jpg", "doc-2.jpg", "doc-3.jpg"]
+        assert all(p.read_bytes().startswith(b"\xff\xd8") for p in result.output_files)
+
+    def test_multi_page_tiff(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 4, size=(200, 200))
+        result = convert_pdf_to_png(
+            pdf,
+            tmp_path,
+            dpi=36,
+            engine=RenderEngine.PYMUPDF,
+            image_format=ImageFormat.TIFF,
+            max_workers=2,
+            encode_workers=2,
+        )
+        assert result.success
+        assert result.output_files == [tmp_path / "doc.tif"]
+        with Image.open(result.output_files[0]) as img:
+            assert img.n_frames == 4
+
+    def test_cleanup_allows_coarse_file_clocks(self, tmp_path: Path) -> None:
+        started = 1_000_000.0
+        page = tmp_path / "doc-1.png"
+        page.write_bytes(b"png")
+        # Written after the run started, stamped a clock tick earlier.
+        os.utime(page, (started - 0.004, started - 0.004))
+        older = tmp_path / "doc-2.png"
+        older.write_bytes(b"png")
+        os.utime(older, (started - 60, started - 60))
+
+        _remove_pages_since(tmp_path / "doc.pdf", tmp_path, started, "png", 2)
+        assert [p.name for p in tmp_path.iterdir()] == ["doc-2.png"]
+
+    def test_cancel_removes_pages(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 5, size=(200, 200))
+        out = tmp_path / "out"
+        out.mkdir()
+        cancel = CancelToken()
+
+        def on_progress(done: int, total: int) -> None:
+            if done == 2:
+                cancel.cancel()
+
+        with pytest.raises(OperationCancelledError):
+            convert_pdf_to_png(
+                pdf,
+                out,
+                dpi=36,
+                on_progress=on_progress,
+                cancel=cancel,
+                engine=RenderEngine.PYMUPDF,
+            )
+        assert list(out.iterdir()) == []
+
+
+class TestManifest:
+    def test_lists_only_this_documents_pages(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        # "report" is a prefix of "report_final"; a name pattern would mix them up.
+        final = make_pdf(tmp_path / "report_final.pdf", 2, size=(200, 200))
+        convert_pdf_to_png(final, tmp_path, dpi=36, engine=RenderEngine.PYMUPDF)
+        report = make_pdf(tmp_path / "report.pdf", 3, size=(200, 200))
+        result = convert_pdf_to_png(
+            report, tmp_path, dpi=36, engine=RenderEngine.PYMUPDF, write_manifest=True
+        )
+        assert [p.name for p in result.output_files] == [
+            "report-1.png",
+            "report-2.png",
+            "report-3.png",
+        ]
+        assert result.manifest_file == tmp_path / "report.manifest.json"
+        assert read_manifest(result.manifest_file) == result.pages
+        assert result.pages[2] == tmp_path / "report-2.png"
+
+    def test_tiff_pages_share_one_file(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 3, size=(200, 200))
+        result = convert_pdf_to_png(
+            pdf, tmp_path, dpi=36, engine=RenderEngine.PYMUPDF, image_format=ImageFormat.TIFF
+        )
+        assert result.pages == {page: tmp_path / "doc.tif" for page in (1, 2, 3)}
+        assert result.output_files == [tmp_path / "doc.tif"]
+
+    def test_subdirectory_per_document(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 2, size=(200, 200))
+        result = convert_pdf_to_png(
+            pdf,
+            tmp_path / "out",
+            dpi=36,
+            engine=RenderEngine.PYMUPDF,
+            subdirectory=True,
+            write_manifest=True,
+        )
+        folder = tmp_path / "out" / "doc"
+        assert result.output_files == [folder / "doc-1.png", folder / "doc-2.png"]
+        assert result.manifest_file == folder / "doc.manifest.json"
+        assert read_manifest(result.manifest_file) == result.pages
+
+    def test_cancel_removes_new_subdirectory(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 3, size=(200, 200))
+        cancel = CancelToken()
+        cancel.cancel()
+        with pytest.raises(OperationCancelledError):
+            convert_pdf_to_png(
+                pdf,
+                tmp_path / "out",
+                dpi=36,
+                cancel=cancel,
+                engine=RenderEngine.PYMUPDF,
+                subdirectory=True,
+            )
+        assert list((tmp_path / "out").iterdir()) == []
+
+
+class TestIncremental:
+    def _convert(self, pdf: Path, out: Path, **kwargs: object) -> list[int]:
+        rendered: list[int] = []
+        result = convert_pdf_to_png(
+            pdf,
+            out,
+            dpi=36,
+            engine=RenderEngine.PYMUPDF,
+            incremental=True,
+            on_progress=lambda done, total: rendered.append(total),
+            **kwargs,
+        )
+        assert result.success
+        assert len(result.pages) == fitz.open(pdf).page_count
+        return rendered[-1:] or [0]
+
+    def test_renders_only_missing_or_changed_pages(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 4, size=(200, 200))
+        out = tmp_path / "out"
+        out.mkdir()
+        assert self._convert(pdf, out) == [4]
+        assert self._convert(pdf, out) == [0]
+
+        (out / "doc-2.png").unlink()
+        (out / "doc-4.png").write_bytes(b"edited")
+        assert self._convert(pdf, out) == [2]
+        assert fitz.Pixmap(str(out / "doc-4.png")).width == 100
+
+    def test_changed_source_or_settings_render_all(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 3, size=(200, 200))
+        out = tmp_path / "out"
+        out.mkdir()
+        self._convert(pdf, out)
+        assert self._convert(pdf, out, png_level=1) == [3]
+
+        # Touched without changing its content: still up to date.
+        os.utime(pdf, (1, 1))
+        assert self._convert(pdf, out, png_level=1) == [0]
+        make_pdf(pdf, 3, size=(200, 200))
+        assert self._convert(pdf, out, png_level=1) == [3]
+
+
+class TestPyramid:
+    def test_levels_match_direct_renders(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 3, size=(200, 200))
+        result = convert_pdf_to_png(
+            pdf,
+            tmp_path,
+            dpi=144,
+            engine=RenderEngine.PYMUPDF,
+            pyramid=(36, 72),
+            encode_workers=2,
+            write_manifest=True,
+        )
+        assert result.success
+        assert sorted(result.levels) == [36, 72]
+        assert result.levels[72][3] == tmp_path / "72dpi" / "doc-3.png"
+        assert len(result.output_files) == 9
+        for level in (72, 36):
+            direct = convert_pdf_to_png(
+                pdf, tmp_path / "direct", dpi=level, engine=RenderEngine.PYMUPDF, subdirectory=True
+            )
+            for page, path in result.levels[level].items():
+                scaled, rendered = fitz.Pixmap(str(path)), fitz.Pixmap(str(direct.pages[page]))
+                assert (scaled.width, scaled.height) == (rendered.width, rendered.height)
+        manifest = json.loads(result.manifest_file.read_text(encoding="utf-8"))
+        assert [level["dpi"] for level in manifest["levels"]] == [72, 36]
+
+    def test_parallel_tiff_and_banded_levels(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 2, size=(200, 200))
+        (tmp_path / "png").mkdir()
+        banded = convert_pdf_to_png(
+            pdf,
+            tmp_path / "png",
+            dpi=144,
+            engine=RenderEngine.PYMUPDF,
+            max_workers=2,
+            pyramid=(72,),
+            # 200 kB per process: 144 DPI pages (480 kB) are banded, 72 DPI (120 kB) are not.
+            memory_budget=400_000,
+        )
+        assert banded.success
+        sizes = [fitz.Pixmap(str(p)).width for p in banded.output_files]
+        assert sizes == [400, 400, 200, 200]
+        tiff = convert_pdf_to_png(
+            pdf,
+            tmp_path,
+            dpi=72,
+            engine=RenderEngine.PYMUPDF,
+            image_format=ImageFormat.TIFF,
+            pyramid=(36,),
+        )
+        assert tiff.output_files == [tmp_path / "doc.tif", tmp_path / "36dpi" / "doc.tif"]
+        with Image.open(tiff.output_files[1]) as img:
+            assert (img.n_frames, img.size) == (2, (100, 100))
+
+    def test_budget_covers_pages_waiting_for_encoders(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, make_pdf: MakePdf
+    ) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", 3, size=(200, 200))
+        banded: list[Path] = []
+        write_banded = convert._write_page_banded
+
+        def spy(page: fitz.Page, dst: Path, *args: Any) -> None:
+            banded.append(dst)
+            write_banded(page, dst, *args)
+
+        monkeypatch.setattr(convert, "_write_page_banded", spy)
+        result = convert_pdf_to_png(
+            pdf,
+            tmp_path,
+            dpi=144,
+            engine=RenderEngine.PYMUPDF,
+            encode_workers=2,
+            # Above one 144 DPI page (480 kB), but three are held at a time.
+            memory_budget=1_000_000,
+        )
+        assert result.success
+        assert banded == result.output_files
+
+    def test_needs_pymupdf_and_lower_dpis(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        pdf = make_pdf(tmp_path / "doc.pdf", size=(200, 200))
+        assert not convert_pdf_to_png(pdf, tmp_path, dpi=72, pyramid=(36,)).success
+        assert not convert_pdf_to_png(
+            pdf, tmp_path, dpi=72, engine=RenderEngine.PYMUPDF, pyramid=(72,)
+        ).success
+        assert list(tmp_path.iterdir()) == [pdf]
+
+
+class TestBandedRendering:
+    def test_bands_match_whole_page(self, tmp_path: Path) -> None:
+        doc = fitz.open()
+        page = doc.new_page(width=300, height=200)
+        page.insert_text((20, 100), "banded", fontsize=40)
+        page.draw_circle((150, 100), 60)
+        doc.save(tmp_path / "doc.pdf")
+        doc.close()
+        (tmp_path / "whole").mkdir()
+        (tmp_path / "banded").mkdir()
+
+        whole = convert_pdf_to_png(
+            tmp_path / "doc.pdf", tmp_path / "whole", dpi=150, engine=RenderEngine.PYMUPDF
+        )
+        # 625 px rows of 3 bytes: about 20 rows per band.
+        banded = convert_pdf_to_png(
+            tmp_path / "doc.pdf",
+            tmp_path / "banded",
+            dpi=150,
+            engine=RenderEngine.PYMUPDF,
+            memory_budget=625 * 3 * 20,
+        )
+        assert banded.success
+        expected = fitz.Pixmap(str(whole.output_files[0]))
+        actual = fitz.Pixmap(str(banded.output_files[0]))
+        assert (actual.width, actual.height) == (expected.width, expected.height)
+        assert actual.xres == 150
+        # Anti-aliasing may differ by a few levels where bands meet.
+        diff = max(abs(a - b) for a, b in zip(actual.samples, expected.samples, strict=True))
+        assert diff < 32
@@ -0,0 +1,183 @@
+"""Tests for core ghostscript module."""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from pdf_toolbox.core.cancel import CancelToken, OperationCancelledError
+from pdf_toolbox.core.capabilities import ghostscript_command
+from pdf_toolbox.core.ghostscript import _ps_string, close_session, session_for
+from tests.helpers import MakePdf
+
+needs_gs = pytest.mark.skipif(ghostscript_command() is None, reason="Ghostscript not installed")
+
+
+# Stands in for gs: reads the requests GhostscriptSession writes to stdin and
+# acts on the input file's content: "ok" writes the output, "fail" reports a
+# PostScript error, "die" exits mid-request and "hang" never answers.
+_STUB_GS = r"""
+import os, re, sys, time
+
+def unescape(literal):
+    def repl(m):
+        esc = m.group(1)
+        return chr(int(esc, 8)) if esc.isdigit() else esc
+    return os.fsdecode(re.sub(r"\\([0-7]{3}|.)", repl, literal).encode("latin-1"))
+
+program = []
+for line in sys.stdin:
+    program.append(line)
+    if not line.startswith("clear cleardictstack"):
+        continue
+    text = "".join(program)
+    program.clear()
+    dst, src = (unescape(s) for s in re.findall(r"\(((?:\\.|[^()\\])*)\)", text)[:2])
+    request = re.search(r"@@pdf_toolbox (\d+) failed", text).group(1)
+    action = open(src).read().strip()
+    if action == "die":
+        print("Unrecoverable error", flush=True)
+        sys.exit(1)
+    if action == "hang":
+        time.sleep(60)
+    if action == "fail":
+        print("Error: /undefined in --run--")
+        print(f"\n@@pdf_toolbox {request} failed undefined", flush=True)
+        continue
+    with open(dst, "wb") as f:
+        f.write(b"%PDF-1.4 stub")
+    print(f"\n@@pdf_toolbox {request} ok", flush=True)
+"""
+
+
+@pytest.fixture
+def stub_gs(tmp_path: Path) -> str:
+    """Path of an executable stub interpreter speaking the session protocol."""
+    script = tmp_path / "stub" / "gs"
+    script.parent.mkdir()
+    script.write_text(f"#!{sys.executable}\n{_STUB_GS}")
+    script.chmod(0o755)
+    return str(script)
+
+
+def _input(path: Path, action: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(action)
+    return path
+
+
+class TestPsString:
+    def test_escapes_delimiters(self) -> None:
+        assert _ps_string("a(b)\\c.pdf") == "(a\\(b\\)\\\\c.pdf)"
+
+    def test_non_ascii_as_octal(self) -> None:
+        assert _ps_string("檔.pdf") == "(\\346\\252\\224.pdf)"
+
+
+@needs_gs
+class TestGhostscriptSession:
+    def test_one_interpreter_for_many_files(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        args = ["-dPDFSETTINGS=/ebook"]
+        try:
+            first = session_for(ghostscript_command(), args, tmp_path / "a.pdf", tmp_path / "x")
+            for i in range(3):
+                src = make_pdf(tmp_path / f"{i}.pdf")
+                session = session_for(ghostscript_command(), args, src, tmp_path / f"{i}_out.pdf")
+                assert session is first
+                assert session.convert(src, tmp_path / f"{i}_out.pdf").success
+                assert (tmp_path / f"{i}_out.pdf").stat().st_size > 0
+        finally:
+            close_session()
+
+    def test_broken_file_fails_alone(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        args = ["-dPDFSETTINGS=/ebook"]
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf at all")
+        good = make_pdf(tmp_path / "good.pdf")
+        try:
+            session = session_for(ghostscript_command(), args, broken, tmp_path / "b_out.pdf")
+            assert not session.convert(broken, tmp_path / "b_out.pdf").success
+            assert not (tmp_path / "b_out.pdf").exists()
+            session = session_for(ghostscript_command(), args, good, tmp_path / "g_out.pdf")
+            assert session.convert(good, tmp_path / "g_out.pdf").success
+        finally:
+            close_session()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stub interpreter needs a #! script")
+class TestSessionProtocol:
+    def test_ok_and_failed_markers(self, tmp_path: Path, stub_gs: str) -> None:
+        good = _input(tmp_path / "good.pdf", "ok")
+        bad = _input(tmp_path / "bad.pdf", "fail")
+        lines: list[str] = []
+        try:
+            session = session_for(stub_gs, [], good, tmp_path / "g_out.pdf")
+            assert session.convert(good, tmp_path / "g_out.pdf").success
+            assert (tmp_path / "g_out.pdf").read_bytes() == b"%PDF-1.4 stub"
+
+            result = session.convert(bad, tmp_path / "b_out.pdf", on_output=lines.append)
+            assert not result.success
+            assert "undefined" in result.output
+            assert lines == ["Error: /undefined in --run--"]
+            assert not (tmp_path / "b_out.pdf").exists()
+            # The failed request leaves the interpreter running for the next one.
+            assert session.alive
+            assert session_for(stub_gs, [], good, tmp_path / "again.pdf") is session
+            assert session.convert(good, tmp_path / "again.pdf").success
+        finally:
+            close_session()
+
+    def test_restarts_after_interpreter_dies(self, tmp_path: Path, stub_gs: str) -> None:
+        fatal = _input(tmp_path / "fatal.pdf", "die")
+        good = _input(tmp_path / "good.pdf", "ok")
+        try:
+            session = session_for(stub_gs, [], fatal, tmp_path / "f_out.pdf")
+            result = session.convert(fatal, tmp_path / "f_out.pdf")
+            assert not result.success
+            assert "Unrecoverable error" in result.output
+            assert not session.alive
+
+            fresh = session_for(stub_gs, [], good, tmp_path / "g_out.pdf")
+            assert fresh is not session
+            assert fresh.convert(good, tmp_path / "g_out.pdf").success
+        finally:
+            close_session()
+
+    def test_cancel_stops_interpreter(self, tmp_path: Path, stub_gs: str) -> None:
+        slow = _input(tmp_path / "slow.pdf", "hang")
+        cancel = CancelToken()
+        timer = threading.Timer(0.3, cancel.cancel)
+        try:
+            session = session_for(stub_gs, [], slow, tmp_path / "s_out.pdf")
+            timer.start()
+            with pytest.raises(OperationCancelledError):
+                session.convert(slow, tmp_path / "s_out.pdf", cancel=cancel)
+            assert not session.alive
+            assert not (tmp_path / "s_out.pdf").exists()
+        finally:
+            timer.cancel()
+            close_session()
+
+    def test_new_directories_widen_session(self, tmp_path: Path, stub_gs: str) -> None:
+        first = _input(tmp_path / "a" / "in.pdf", "ok")
+        second = _input(tmp_path / "b" / "in.pdf", "ok")
+        out_a = tmp_path / "out_a"
+        out_b = tmp_path / "out_b"
+        out_a.mkdir()
+        out_b.mkdir()
+        try:
+            session = session_for(stub_gs, [], first, out_a / "x.pdf")
+            widened = session_for(stub_gs, [], second, out_b / "x.pdf")
+            assert widened is not session
+            assert not session.alive
+            assert widened.read_dirs == {first.parent.resolve(), second.parent.resolve()}
+            assert widened.write_dirs == {out_a.resolve(), out_b.resolve()}
+            assert widened.covers(first, out_a / "y.pdf")
+            assert session_for(stub_gs, [], first, out_a / "y.pdf") is widened
+            # Other device options start a session for just this pair.
+            other = session_for(stub_gs, ["-dPDFSETTINGS=/ebook"], first, out_a / "z.pdf")
+            assert other.read_dirs == {first.parent.resolve()}
+            assert other.convert(first, out_a / "z.pdf").success
+        finally:
+            close_session()
@@ -16,6 +16,8 @@ CORE_MODULES = [
     "pdf_toolbox.core.watermark",
     "pdf_toolbox.core.compress",
     "pdf_toolbox.core.reorder",
+    "pdf_toolbox.core.batch",
+    "pdf_toolbox.core.cancel",
 ]
 
 
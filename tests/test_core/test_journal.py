@@ -0,0 +1,74 @@
+"""Tests for core journal module."""
+
+from pathlib import Path
+
+from pdf_toolbox.core.batch import FileJob
+from pdf_toolbox.core.journal import JobJournal, JobStatus
+from pdf_toolbox.core.utils import human_readable_size
+
+
+def _job(src: Path, dst: Path, size: int = 1) -> FileJob:
+    return FileJob(src, human_readable_size, {"src": src, "dst": dst, "size_bytes": size})
+
+
+def _setup(tmp_path: Path) -> tuple[Path, Path]:
+    src = tmp_path / "in.pdf"
+    src.write_bytes(b"%PDF-1.4 test")
+    dst = tmp_path / "out.pdf"
+    dst.write_bytes(b"%PDF-1.4 out")
+    return src, dst
+
+
+class TestJobJournal:
+    def test_record_survives_reopen(self, tmp_path: Path) -> None:
+        src, dst = _setup(tmp_path)
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        journal.record(_job(src, dst), JobStatus.SUCCESS, [dst])
+        journal.close()
+
+        record = JobJournal(tmp_path / "journal.jsonl").lookup(_job(src, dst))
+        assert record is not None
+        assert record.output_paths == [dst]
+
+    def test_renamed_output_still_matches(self, tmp_path: Path) -> None:
+        src, dst = _setup(tmp_path)
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        journal.record(_job(src, dst), JobStatus.SUCCESS, [dst])
+        # A rerun's ensure_unique_path hands out out_1.pdf; the job is still the same.
+        assert journal.lookup(_job(src, tmp_path / "out_1.pdf")) is not None
+
+    def test_changed_settings_or_source_do_not_match(self, tmp_path: Path) -> None:
+        src, dst = _setup(tmp_path)
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        journal.record(_job(src, dst), JobStatus.SUCCESS, [dst])
+
+        assert journal.lookup(_job(src, dst, size=2)) is None
+        src.write_bytes(b"%PDF-1.4 changed content")
+        assert journal.lookup(_job(src, dst)) is None
+
+    def test_failed_or_missing_output_does_not_match(self, tmp_path: Path) -> None:
+        src, dst = _setup(tmp_path)
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        journal.record(_job(src, dst), JobStatus.FAILED)
+        assert journal.lookup(_job(src, dst)) is None
+
+        journal.record(_job(src, dst), JobStatus.SUCCESS, [dst])
+        dst.unlink()
+        assert journal.lookup(_job(src, dst)) is None
+
+    def test_torn_line_is_ignored(self, tmp_path: Path) -> None:
+        src, dst = _setup(tmp_path)
+        path = tmp_path / "journal.jsonl"
+        journal = JobJournal(path)
+        journal.record(_job(src, dst), JobStatus.SUCCESS, [dst])
+        journal.close()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"source": "half a rec')
+
+        journal = JobJournal(path)
+        assert len(journal) == 1
+        other = tmp_path / "other.pdf"
+        other.write_bytes(b"%PDF-1.4 other")
+        journal.record(_job(other, dst), JobStatus.SUCCESS, [dst])
+        journal.close()
+        assert len(JobJournal(path)) == 2
@@ -0,0 +1,342 @@
+"""Tests for core merge module."""
+
+from pathlib import Path
+
+import fitz
+import pikepdf
+import pytest
+from PIL import Image
+
+from pdf_toolbox.core.cancel import CancelToken, OperationCancelledError
+from pdf_toolbox.core.merge import (
+    _split,
+    _tree_levels,
+    append_pdfs,
+    merge_pdfs,
+    merge_pdfs_tree,
+    parse_merge_input,
+    select_pages,
+)
+from tests.helpers import MakePdf
+
+
+def _make_template_pdfs(folder: Path, count: int) -> list[Path]:
+    """One-page PDFs that share a logo (the same PNG) but differ in text."""
+    logo = folder / "logo.png"
+    Image.effect_noise((96, 96), 64).convert("RGB").save(logo)
+    files = []
+    for i in range(count):
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), f"invoice-{i}")
+        page.insert_image(fitz.Rect(72, 100, 168, 196), filename=str(logo))
+        doc.save(folder / f"{i}.pdf")
+        doc.close()
+        files.append(folder / f"{i}.pdf")
+    return files
+
+
+def _page_texts(path: Path) -> list[str]:
+    with fitz.open(path) as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+class TestStreamingMerge:
+    def test_batches_keep_input_order(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", 2, text="{stem}-{i}") for i in range(7)]
+        out = tmp_path / "merged.pdf"
+        result = merge_pdfs(inputs, out, batch_size=3)
+        assert result.success, result.message
+        assert result.page_count == 14
+        assert _page_texts(out) == [f"{i}-{p}" for i in range(7) for p in range(2)]
+        with pikepdf.open(out) as pdf:
+            assert len(pdf.pages) == 14
+
+    def test_same_pages_as_in_memory_merge(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", text="{stem}-{i}") for i in range(5)]
+        merge_pdfs(inputs, tmp_path / "memory.pdf", batch_size=None)
+        merge_pdfs(inputs, tmp_path / "streamed.pdf", batch_size=2)
+        assert _page_texts(tmp_path / "memory.pdf") == _page_texts(tmp_path / "streamed.pdf")
+
+    def test_progress_ends_at_total(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", text="{stem}-{i}") for i in range(5)]
+        calls: list[tuple[int, int]] = []
+        merge_pdfs(inputs, tmp_path / "merged.pdf", lambda d, t: calls.append((d, t)), None, 2)
+        assert calls[-1] == (6, 6)
+        assert [d for d, _ in calls] == sorted(d for d, _ in calls)
+
+    def test_cancel_leaves_no_output(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", text="{stem}-{i}") for i in range(5)]
+        out = tmp_path / "merged.pdf"
+        token = CancelToken()
+
+        def on_progress(done: int, total: int) -> None:
+            if done == 3:
+                token.cancel()
+
+        with pytest.raises(OperationCancelledError):
+            merge_pdfs(inputs, out, on_progress, token, batch_size=2)
+        assert not out.exists()
+
+    @pytest.mark.parametrize("batch_size", [None, 2])
+    def test_interrupt_leaves_no_output(
+        self, tmp_path: Path, batch_size: int | None, make_pdf: MakePdf
+    ) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", text="{stem}-{i}") for i in range(5)]
+        out = tmp_path / "merged.pdf"
+
+        def on_progress(done: int, total: int) -> None:
+            if done == 3:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            merge_pdfs(inputs, out, on_progress, batch_size=batch_size)
+        assert not out.exists()
+
+
+class TestDeduplication:
+    @pytest.mark.parametrize("batch_size", [None, 2])
+    def test_shares_identical_resources(self, tmp_path: Path, batch_size: int | None) -> None:
+        inputs = _make_template_pdfs(tmp_path, 5)
+        plain, shared = tmp_path / "plain.pdf", tmp_path / "shared.pdf"
+        merge_pdfs(inputs, plain, batch_size=batch_size, deduplicate=False)
+        result = merge_pdfs(inputs, shared, batch_size=batch_size)
+        assert result.success, result.message
+        assert result.bytes_saved > 0
+        assert shared.stat().st_size < plain.stat().st_size / 2
+        assert _page_texts(shared) == [f"invoice-{i}" for i in range(5)]
+        with fitz.open(shared) as doc, fitz.open(plain) as expected:
+            images = {xref for page in doc for xref, *_ in page.get_images()}
+            assert len(images) == 1
+            for page, page_expected in zip(doc, expected, strict=True):
+                assert page.get_pixmap().samples == page_expected.get_pixmap().samples
+
+    def test_reports_bytes_saved_in_output(self, tmp_path: Path) -> None:
+        # Unfiltered images, as deflated by the save: the raw size is far larger.
+        data = bytes(range(256)) * 1024
+        inputs = []
+        for i in range(6):
+            pdf = pikepdf.Pdf.new()
+            pdf.add_blank_page()
+            page = pdf.pages[0]
+            image = pikepdf.Stream(pdf, data)
+            image.Type, image.Subtype = pikepdf.Name.XObject, pikepdf.Name.Image
+            image.Width, image.Height, image.BitsPerComponent = 256, 1024, 8
+            image.ColorSpace = pikepdf.Name.DeviceGray
+            page.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Im0=image))
+            page.Contents = pikepdf.Stream(pdf, f"% {i}\nq 100 0 0 400 72 72 cm /Im0 Do Q".encode())
+            pdf.save(tmp_path / f"{i}.pdf", compress_streams=False)
+            inputs.append(tmp_path / f"{i}.pdf")
+        plain, shared = tmp_path / "plain.pdf", tmp_path / "shared.pdf"
+        merge_pdfs(inputs, plain, batch_size=None, deduplicate=False)
+        result = merge_pdfs(inputs, shared, batch_size=None)
+        written = plain.stat().st_size - shared.stat().st_size
+        assert written > 0
+        assert written / 2 < result.bytes_saved < written * 2
+
+    def test_identical_pages_stay_separate(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", text="same") for i in range(3)]
+        out = tmp_path / "merged.pdf"
+        merge_pdfs(inputs, out)
+        with pikepdf.open(out) as pdf:
+            assert len({page.objgen for page in pdf.pages}) == 3
+
+
+class TestInputOutcomes:
+    @pytest.mark.parametrize("batch_size", [None, 2])
+    def test_unreadable_input_is_left_out(
+        self, tmp_path: Path, batch_size: int | None, make_pdf: MakePdf
+    ) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", text="{stem}-{i}") for i in range(4)]
+        inputs[1].write_bytes(b"%PDF-1.7 truncated")
+        out = tmp_path / "merged.pdf"
+        result = merge_pdfs(inputs, out, batch_size=batch_size)
+        assert result.success, result.message
+        assert [item.merged for item in result.inputs] == [True, False, True, True]
+        assert result.inputs[1].error
+        assert _page_texts(out) == ["0-0", "2-0", "3-0"]
+
+    def test_nothing_readable_fails(self, tmp_path: Path) -> None:
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+        out = tmp_path / "merged.pdf"
+        result = merge_pdfs([broken], out)
+        assert not result.success
+        assert not out.exists()
+
+    @pytest.mark.parametrize("batch_size", [None, 1])
+    def test_reports_pages_of_each_input(
+        self, tmp_path: Path, batch_size: int | None, make_pdf: MakePdf
+    ) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", i + 1, text="{stem}-{i}") for i in range(3)]
+        pages: list[tuple[int, int]] = []
+        result = merge_pdfs(
+            inputs,
+            tmp_path / "merged.pdf",
+            batch_size=batch_size,
+            on_page=lambda d, t: pages.append((d, t)),
+        )
+        assert [item.page_count for item in result.inputs] == [1, 2, 3]
+        assert (1, 1) in pages and (2, 2) in pages and pages[-1] == (3, 3)
+
+    def test_cancel_within_input(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", 3, text="{stem}-{i}") for i in range(2)]
+        out = tmp_path / "merged.pdf"
+        token = CancelToken()
+
+        def on_page(done: int, total: int) -> None:
+            token.cancel()
+
+        with pytest.raises(OperationCancelledError):
+            merge_pdfs(inputs, out, cancel=token, on_page=on_page)
+        assert not out.exists()
+
+
+class TestPageSelection:
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [
+            ("", [(0, 9)]),
+            ("all", [(0, 9)]),
+            ("1-3,7", [(0, 2), (6, 6)]),
+            ("-2:", [(8, 9)]),
+            (":3, -1", [(0, 2), (9, 9)]),
+            ("7,1-2,7", [(6, 6), (0, 1), (6, 6)]),
+        ],
+    )
+    def test_select_pages(self, spec: str, expected: list[tuple[int, int]]) -> None:
+        assert select_pages(spec, 10) == expected
+
+    @pytest.mark.parametrize("spec", ["0", "11", "3-1", "5:2", "x", "1-"])
+    def test_select_pages_rejects(self, spec: str) -> None:
+        with pytest.raises(ValueError):
+            select_pages(spec, 10)
+
+    def test_parse_merge_input(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        assert parse_merge_input("a.pdf[1-3,7]") == (Path("a.pdf"), "1-3,7")
+        assert parse_merge_input("c.pdf[-2:]") == (Path("c.pdf"), "-2:")
+        assert parse_merge_input("b.pdf") == (Path("b.pdf"), "")
+        named = make_pdf(tmp_path / "scan[1].pdf", text="{stem}-{i}")
+        assert parse_merge_input(str(named)) == (named, "")
+        with pytest.raises(ValueError):
+            parse_merge_input("a.pdf[1;2]")
+
+    @pytest.mark.parametrize("batch_size", [None, 1])
+    def test_merges_selected_pages(
+        self, tmp_path: Path, batch_size: int | None, make_pdf: MakePdf
+    ) -> None:
+        a = make_pdf(tmp_path / "a.pdf", 8, text="{stem}-{i}")
+        b = make_pdf(tmp_path / "b.pdf", 2, text="{stem}-{i}")
+        c = make_pdf(tmp_path / "c.pdf", 5, text="{stem}-{i}")
+        out = tmp_path / "merged.pdf"
+        result = merge_pdfs([a, b, c], out, batch_size=batch_size, pages=["1-3,7", "all", "-2:"])
+        assert result.success, result.message
+        assert [item.page_count for item in result.inputs] == [4, 2, 2]
+        assert _page_texts(out) == ["a-0", "a-1", "a-2", "a-6", "b-0", "b-1", "c-3", "c-4"]
+
+    @pytest.mark.parametrize("batch_size", [None, 1])
+    def test_spec_past_the_end_leaves_input_out(
+        self, tmp_path: Path, batch_size: int | None, make_pdf: MakePdf
+    ) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", 2, text="{stem}-{i}") for i in range(2)]
+        out = tmp_path / "merged.pdf"
+        result = merge_pdfs(inputs, out, batch_size=batch_size, pages=["5", "2"])
+        assert result.success, result.message
+        assert "5" in result.inputs[0].error
+        assert _page_texts(out) == ["1-1"]
+
+    def test_tree_merge_keeps_specs_with_their_inputs(
+        self, tmp_path: Path, make_pdf: MakePdf
+    ) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", 3, text="{stem}-{i}") for i in range(5)]
+        out = tmp_path / "merged.pdf"
+        result = merge_pdfs_tree(
+            inputs, out, max_workers=2, fan_in=2, pages=["1", "", "-1", "2-3", ":1"]
+        )
+        assert result.success, result.message
+        assert _page_texts(out) == ["0-0", "1-0", "1-1", "1-2", "2-2", "3-1", "3-2", "4-0"]
+
+
+class TestTreeMerge:
+    def test_levels_end_within_fan_in(self) -> None:
+        assert _tree_levels(5000, 8, 256) == [20]
+        assert _tree_levels(300, 8, 256) == [8]
+        assert _tree_levels(100, 8, 256) == []
+        assert _tree_levels(9, 2, 2) == [5, 3, 2]
+
+    def test_split_keeps_order(self) -> None:
+        items = [Path(str(i)) for i in range(7)]
+        groups = _split(items, 3)
+        assert [len(g) for g in groups] == [3, 2, 2]
+        assert [p for g in groups for p in g] == items
+
+    def test_merges_level_by_level_in_order(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", text="{stem}-{i}") for i in range(6)]
+        inputs[2].write_bytes(b"broken")
+        out = tmp_path / "merged.pdf"
+        stages: list[tuple[int, int]] = []
+        progress: list[tuple[int, int]] = []
+
+        result = merge_pdfs_tree(
+            inputs,
+            out,
+            max_workers=2,
+            fan_in=2,
+            on_stage=lambda s, n: stages.append((s, n)),
+            on_progress=lambda d, t: progress.append((d, t)),
+        )
+
+        assert result.success, result.message
+        assert _page_texts(out) == ["0-0", "1-0", "3-0", "4-0", "5-0"]
+        assert [item.merged for item in result.inputs] == [True, True, False, True, True, True]
+        assert stages == [(1, 3), (2, 3), (3, 3)]
+        assert progress[-1][0] == progress[-1][1]
+        assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".merge-")] == []
+
+
+class TestAppend:
+    def test_appends_after_existing_bytes(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        archive = make_pdf(tmp_path / "archive.pdf", 3, text="old-{i}")
+        original = archive.read_bytes()
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", text="{stem}-{i}") for i in range(3)]
+        result = append_pdfs(archive, inputs, batch_size=2)
+        assert result.success, result.message
+        assert result.page_count == 3
+        assert archive.read_bytes().startswith(original)
+        assert _page_texts(archive) == ["old-0", "old-1", "old-2", "0-0", "1-0", "2-0"]
+        with pikepdf.open(archive) as pdf:
+            assert len(pdf.pages) == 6
+
+    def test_cancel_restores_archive(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        archive = make_pdf(tmp_path / "archive.pdf", text="old-{i}")
+        original = archive.read_bytes()
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", text="{stem}-{i}") for i in range(4)]
+        token = CancelToken()
+
+        def on_progress(done: int, total: int) -> None:
+            if done == 3:
+                token.cancel()
+
+        with pytest.raises(OperationCancelledError):
+            append_pdfs(archive, inputs, on_progress, token, batch_size=1)
+        assert archive.read_bytes() == original
+
+    def test_interrupt_restores_archive(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        archive = make_pdf(tmp_path / "archive.pdf", text="old-{i}")
+        original = archive.read_bytes()
+        inputs = [make_pdf(tmp_path / f"{i}.pdf", text="{stem}-{i}") for i in range(4)]
+
+        def on_progress(done: int, total: int) -> None:
+            if done == 2:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            append_pdfs(archive, inputs, on_progress, batch_size=1)
+        assert archive.read_bytes() == original
+
+    def test_rejects_non_pdf_archive(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        archive = tmp_path / "archive.pdf"
+        archive.write_bytes(b"not a pdf")
+        result = append_pdfs(archive, [make_pdf(tmp_path / "0.pdf", text="{stem}-{i}")])
+        assert not result.success
+        assert archive.read_bytes() == b"not a pdf"
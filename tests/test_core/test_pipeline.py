@@ -0,0 +1,69 @@
+"""Tests for core pipeline module."""
+
+from pathlib import Path
+
+import fitz
+import pytest
+
+from pdf_toolbox.core.cancel import CancelToken, OperationCancelledError
+from pdf_toolbox.core.compress import CompressionLevel
+from pdf_toolbox.core.pipeline import (
+    CompressStep,
+    Pipeline,
+    ReorderStep,
+    RotateStep,
+    UnlockStep,
+    WatermarkStep,
+    run_pipeline,
+)
+from pdf_toolbox.core.watermark import WatermarkConfig
+from tests.helpers import MakePdf
+
+
+class TestPipeline:
+    def test_intake_flow_writes_once(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "in.pdf", 3, user_pw="secret")
+        dst = tmp_path / "out.pdf"
+        progress: list[tuple[int, int]] = []
+        pipeline = (
+            Pipeline()
+            .add(UnlockStep("secret"))
+            .add(RotateStep(90))
+            .add(WatermarkStep(WatermarkConfig(text="DRAFT", angle=0)))
+            .add(CompressStep(CompressionLevel.HIGH))
+        )
+
+        result = pipeline.run(src, dst, on_progress=lambda d, t: progress.append((d, t)))
+
+        assert result.success
+        assert progress == [(i, 5) for i in range(1, 6)]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["in.pdf", "out.pdf"]
+        with fitz.open(str(dst)) as doc:
+            assert not doc.needs_pass
+            assert [page.rotation for page in doc] == [90, 90, 90]
+            assert "DRAFT" in doc[0].get_text()
+
+    def test_reverse_pages(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "in.pdf", 3)
+        dst = tmp_path / "out.pdf"
+        assert run_pipeline(src, dst, [ReorderStep()]).success
+        with fitz.open(str(dst)) as doc:
+            assert doc[0].get_text().strip() == "page 3"
+
+    def test_wrong_password(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "in.pdf", 3, user_pw="secret")
+        with pytest.raises(ValueError):
+            run_pipeline(src, tmp_path / "out.pdf", [UnlockStep("nope")])
+        assert not (tmp_path / "out.pdf").exists()
+
+    def test_no_steps(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "in.pdf", 3)
+        assert not run_pipeline(src, tmp_path / "out.pdf", []).success
+
+    def test_cancel_leaves_no_output(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "in.pdf", 3)
+        cancel = CancelToken()
+        cancel.cancel()
+        with pytest.raises(OperationCancelledError):
+            run_pipeline(src, tmp_path / "out.pdf", [RotateStep(90)], cancel=cancel)
+        assert not (tmp_path / "out.pdf").exists()
@@ -0,0 +1,79 @@
+"""Tests for core png module."""
+
+from pathlib import Path
+
+import fitz
+import pytest
+from PIL import Image
+
+from pdf_toolbox.core.png import PngWriter
+
+
+def test_rows_round_trip(tmp_path: Path) -> None:
+    width, height = 37, 23
+    samples = bytes(
+        (x * 7 + y * 3 + c) % 256 for y in range(height) for x in range(width) for c in range(3)
+    )
+    dst = tmp_path / "out.png"
+    with PngWriter(dst, width, height, dpi=300) as png:
+        # Uneven batches, as bands of different heights arrive.
+        row = width * 3
+        png.write_rows(samples[: 5 * row])
+        png.write_rows(memoryview(samples)[5 * row : 6 * row])
+        png.write_rows(samples[6 * row :])
+
+    pix = fitz.Pixmap(str(dst))
+    assert (pix.width, pix.height, pix.n) == (width, height, 3)
+    assert pix.samples == samples
+    assert pix.xres == 300
+
+
+def test_grayscale(tmp_path: Path) -> None:
+    dst = tmp_path / "gray.png"
+    with PngWriter(dst, 4, 2, channels=1) as png:
+        png.write_rows(bytes(range(8)))
+    assert fitz.Pixmap(str(dst)).samples == bytes(range(8))
+
+
+def test_missing_rows_rejected(tmp_path: Path) -> None:
+    png = PngWriter(tmp_path / "short.png", 4, 4)
+    png.write_rows(bytes(4 * 3))
+    with pytest.raises(ValueError):
+        png.close()
+
+
+def test_partial_rows_rejected(tmp_path: Path) -> None:
+    png = PngWriter(tmp_path / "bad.png", 4, 1)
+    with pytest.raises(ValueError):
+        png.write_rows(bytes(5))
+    with pytest.raises(ValueError):
+        png.write_rows(bytes(2 * 4 * 3))
+
+
+def test_filtered_size_close_to_pillow(tmp_path: Path) -> None:
+    # A page with text and a smooth, photo-like image, rendered as the
+    # converter does.
+    photo = tmp_path / "photo.png"
+    Image.merge(
+        "RGB",
+        [
+            Image.radial_gradient("L"),
+            Image.linear_gradient("L"),
+            Image.linear_gradient("L").rotate(90),
+        ],
+    ).resize((400, 300)).save(photo)
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_image(fitz.Rect(72, 72, 520, 420), filename=str(photo))
+    for y in range(460, 780, 14):
+        page.insert_text((72, y), "Lorem ipsum dolor sit amet, consectetur adipiscing", fontsize=10)
+    pix = page.get_pixmap(dpi=100, alpha=False)
+
+    ours = tmp_path / "ours.png"
+    with PngWriter(ours, pix.width, pix.height) as png:
+        png.write_rows(pix.samples_mv)
+    pillow = tmp_path / "pillow.png"
+    Image.frombytes("RGB", (pix.width, pix.height), pix.samples).save(pillow)
+
+    assert fitz.Pixmap(str(ours)).samples == pix.samples
+    assert ours.stat().st_size <= pillow.stat().st_size * 1.05
@@ -0,0 +1,66 @@
+"""Tests for page-granular progress callbacks of core operations."""
+
+from pathlib import Path
+
+from pdf_toolbox.core.merge import merge_pdfs
+from pdf_toolbox.core.reorder import reorder_pdf
+from pdf_toolbox.core.rotate import rotate_pdf
+from pdf_toolbox.core.split import SplitMode, split_pdf
+from pdf_toolbox.core.watermark import WatermarkConfig, add_watermark
+from tests.helpers import MakePdf
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, int]] = []
+
+    def __call__(self, done: int, total: int) -> None:
+        self.calls.append((done, total))
+
+
+class TestPageProgress:
+    def test_split_reports_every_page(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "doc.pdf", 5)
+        progress = _Recorder()
+        split_pdf(
+            src,
+            tmp_path / "out",
+            SplitMode.EVERY_N_PAGES,
+            pages_per_split=2,
+            on_progress=progress,
+        )
+        assert progress.calls == [(i, 5) for i in range(1, 6)]
+
+    def test_split_by_range_counts_selected_pages(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "doc.pdf", 10)
+        progress = _Recorder()
+        split_pdf(
+            src, tmp_path / "out", SplitMode.BY_RANGE, page_ranges="1-2, 5", on_progress=progress
+        )
+        assert progress.calls[-1] == (3, 3)
+
+    def test_rotate(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "doc.pdf", 3)
+        progress = _Recorder()
+        rotate_pdf(src, tmp_path / "rotated.pdf", 90, on_progress=progress)
+        assert progress.calls == [(1, 3), (2, 3), (3, 3)]
+
+    def test_reorder(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "doc.pdf", 3)
+        progress = _Recorder()
+        reorder_pdf(src, tmp_path / "reordered.pdf", [2, 1, 0], on_progress=progress)
+        assert progress.calls[-1] == (3, 3)
+
+    def test_watermark(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "doc.pdf", 2)
+        progress = _Recorder()
+        add_watermark(
+            src, tmp_path / "wm.pdf", WatermarkConfig(text="DRAFT", angle=0), on_progress=progress
+        )
+        assert progress.calls == [(1, 2), (2, 2)]
+
+    def test_merge_counts_inputs_and_save(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        inputs = [make_pdf(tmp_path / f"{i}.pdf") for i in range(3)]
+        progress = _Recorder()
+        merge_pdfs(inputs, tmp_path / "merged.pdf", on_progress=progress)
+        assert progress.calls[-1] == (4, 4)
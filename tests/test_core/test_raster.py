@@ -0,0 +1,61 @@
+"""Tests for core raster module."""
+
+from pathlib import Path
+
+import fitz
+import pytest
+from PIL import Image
+
+from pdf_toolbox.core.raster import Encoding, ImageFormat, PageImage, TiffWriter, encode_page
+
+
+def _image(shade: int, width: int = 40, height: int = 30) -> PageImage:
+    samples = memoryview(bytes([shade]) * (width * height * 3))
+    return PageImage(width, height, samples, 150)
+
+
+@pytest.mark.parametrize("fmt", [ImageFormat.PNG, ImageFormat.JPEG, ImageFormat.WEBP])
+def test_single_page_formats(tmp_path: Path, fmt: ImageFormat) -> None:
+    dst = tmp_path / f"page.{fmt.value}"
+    encode_page(_image(200), dst, Encoding(fmt))
+    with Image.open(dst) as img:
+        assert img.size == (40, 30)
+        assert img.convert("RGB").getpixel((5, 5))[0] == pytest.approx(200, abs=3)
+
+
+def test_png_level_trades_size(tmp_path: Path) -> None:
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 300, 300), False)
+    pix.clear_with(255)
+    image = PageImage.from_pixmap(pix, 72)
+    fast = encode_page(image, tmp_path / "fast.png", Encoding(png_level=0))
+    small = encode_page(image, tmp_path / "small.png", Encoding(png_level=9))
+    assert small.stat().st_size < fast.stat().st_size
+    assert fitz.Pixmap(str(fast)).samples == fitz.Pixmap(str(small)).samples
+
+
+def test_multi_page_tiff(tmp_path: Path) -> None:
+    dst = tmp_path / "doc.tif"
+    with TiffWriter(dst) as tiff:
+        for shade in (0, 100, 200):
+            tiff.add(_image(shade))
+    with Image.open(dst) as img:
+        assert img.n_frames == 3
+        img.seek(2)
+        assert img.getpixel((0, 0)) == (200, 200, 200)
+
+
+def test_tiff_removed_on_error(tmp_path: Path) -> None:
+    dst = tmp_path / "doc.tif"
+    with pytest.raises(RuntimeError), TiffWriter(dst) as tiff:
+        tiff.add(_image(0))
+        raise RuntimeError
+    assert not dst.exists()
+
+
+def test_scaled_to_lower_dpi(tmp_path: Path) -> None:
+    small = _image(120, 300, 150).scaled(50)
+    assert (small.width, small.height, small.dpi) == (100, 50, 50)
+    encode_page(small, tmp_path / "small.png", Encoding())
+    with Image.open(tmp_path / "small.png") as img:
+        assert img.size == (100, 50)
+        assert img.getpixel((50, 25)) == (120, 120, 120)
@@ -1,6 +1,22 @@
 """Tests for core split module."""
 
-from pdf_toolbox.core.split import SplitMode, parse_page_ranges
+from pathlib import Path
+
+import fitz
+import pytest
+
+from pdf_toolbox.core import split
+from pdf_toolbox.core.cancel import CancelToken, OperationCancelledError
+from pdf_toolbox.core.split import SplitMode, parse_page_ranges, split_pdf
+from tests.helpers import MakePdf
+
+
+def _page_texts(paths: list[Path]) -> list[str]:
+    texts = []
+    for path in paths:
+        with fitz.open(path) as doc:
+            texts.extend(page.get_text().strip() for page in doc)
+    return texts
 
 
 class TestParsePageRanges:
@@ -25,3 +41,66 @@ class TestSplitMode:
         assert SplitMode.BY_RANGE is not None
         assert SplitMode.EVERY_N_PAGES is not None
         assert SplitMode.EXTRACT_PAGES is not None
+
+
+class TestSplitPdf:
+    def test_every_n_pages(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "doc.pdf", 7, text="p{n}")
+        progress: list[tuple[int, int]] = []
+        result = split_pdf(
+            src,
+            tmp_path / "out",
+            SplitMode.EVERY_N_PAGES,
+            pages_per_split=3,
+            on_progress=lambda d, t: progress.append((d, t)),
+        )
+        assert result.success, result.message
+        assert [p.name for p in result.output_files] == [
+            "doc_p1-3.pdf",
+            "doc_p4-6.pdf",
+            "doc_p7-7.pdf",
+        ]
+        assert _page_texts(result.output_files) == [f"p{i}" for i in range(1, 8)]
+        assert progress == [(i, 7) for i in range(1, 8)]
+
+    def test_extract_keeps_given_order(self, tmp_path: Path, make_pdf: MakePdf) -> None:
+        src = make_pdf(tmp_path / "doc.pdf", 5, text="p{n}")
+        result = split_pdf(src, tmp_path, SplitMode.EXTRACT_PAGES, page_numbers=[3, 4, 0, 3])
+        assert result.success, result.message
+        assert _page_texts(result.output_files) == ["p4", "p5", "p1", "p4"]
+
+    @pytest.mark.parametrize("mode", [SplitMode.EVERY_N_PAGES, SplitMode.BY_RANGE])
+    def test_sharded_matches_serial(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mode: SplitMode, make_pdf: MakePdf
+    ) -> None:
+        monkeypatch.setattr(split, "_MIN_PAGES_PER_WORKER", 4)
+        src = make_pdf(tmp_path / "doc.pdf", 30, text="p{n}")
+        settings = {"page_ranges": "1-4, 9, 10-30", "pages_per_split": 4}
+        serial = split_pdf(src, tmp_path / "serial", mode, **settings)
+        sharded = split_pdf(src, tmp_path / "sharded", mode, max_workers=2, **settings)
+        assert sharded.success, sharded.message
+        assert [p.name for p in sharded.output_files] == [p.name for p in serial.output_files]
+        assert _page_texts(sharded.output_files) == _page_texts(serial.output_files)
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_cancel_removes_parts(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, max_workers: int, make_pdf: MakePdf
+    ) -> None:
+        monkeypatch.setattr(split, "_MIN_PAGES_PER_WORKER", 4)
+        src = make_pdf(tmp_path / "doc.pdf", 40, text="p{n}")
+        out = tmp_path / "out"
+        token = CancelToken()
+
+        def on_progress(done: int, total: int) -> None:
+            token.cancel()
+
+        with pytest.raises(OperationCancelledError):
+            split_pdf(
+                src,
+                out,
+                SplitMode.EVERY_N_PAGES,
+                on_progress=on_progress,
+                cancel=token,
+                max_workers=max_workers,
+            )
+        assert list(out.iterdir()) == []
@@ -19,6 +19,11 @@ class TestEnsureUniquePath:
         assert result.stem.startswith("output")
         assert result.suffix == ".pdf"
 
+    def test_unique_path_skips_reserved(self, tmp_path: Path) -> None:
+        target = tmp_path / "output.pdf"
+        result = ensure_unique_path(target, reserved={target, tmp_path / "output_1.pdf"})
+        assert result == tmp_path / "output_2.pdf"
+
 
 class TestValidatePdf:
     def test_valid_pdf(self, tmp_path: Path) -> None:
@@ -0,0 +1,39 @@
+"""Tests for the shared page behaviour."""
+
+from pathlib import Path
+
+import pytest
+
+from pdf_toolbox.gui.pages import base_page
+from pdf_toolbox.gui.pages.rotate_page import RotatePage
+from pdf_toolbox.workers import scheduler
+from pdf_toolbox.workers.scheduler import JobScheduler, JobState
+from tests.helpers import SleepWorker
+
+
+class TestQueuedCancel:
+    def test_page_finishes_when_queued_job_is_cancelled(
+        self, qtbot, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        queue = JobScheduler(max_slots=1)
+        monkeypatch.setattr(scheduler, "_scheduler", queue)
+        warnings: list[str] = []
+        monkeypatch.setattr(
+            base_page.QMessageBox, "warning", lambda _parent, _title, text: warnings.append(text)
+        )
+        blocker = queue.submit(SleepWorker(millis=300), "busy")
+
+        page = RotatePage()
+        qtbot.addWidget(page)
+        page.file_list.add_file(tmp_path / "a.pdf")
+        page._on_start_clicked()
+        job = queue.job(page._job_id)
+        assert job.state == JobState.QUEUED
+        assert not page.start_btn.isEnabled()
+
+        page._on_cancel_clicked()
+        assert job.state == JobState.CANCELLED
+        assert page.start_btn.isEnabled()
+        assert page._worker is None
+        assert warnings == [job.summary]
+        qtbot.waitUntil(lambda: blocker.state == JobState.DONE, timeout=5000)
@@ -0,0 +1,49 @@
+"""Tests for the file list widget."""
+
+from pathlib import Path
+
+from pdf_toolbox.gui.widgets.file_list import FileListWidget
+
+
+def _edit(widget: FileListWidget, row: int, text: str) -> None:
+    widget.list_widget.item(row).setText(text)
+
+
+class TestEditableEntries:
+    def test_same_file_with_other_pages(self, qtbot) -> None:
+        widget = FileListWidget(editable=True)
+        qtbot.addWidget(widget)
+        widget.add_file(Path("a.pdf"))
+        _edit(widget, 0, "a.pdf[1-2]")
+        widget.add_file(Path("a.pdf"))
+        _edit(widget, 1, "a.pdf[5]")
+
+        assert widget.get_all_files() == [Path("a.pdf[1-2]"), Path("a.pdf[5]")]
+        assert widget.count() == 2
+        widget.add_file(Path("a.pdf[5]"))
+        assert widget.count() == 2
+
+    def test_remove_after_edit(self, qtbot) -> None:
+        widget = FileListWidget(editable=True)
+        qtbot.addWidget(widget)
+        widget.add_files([Path("a.pdf"), Path("b.pdf")])
+        _edit(widget, 0, "a.pdf[2]")
+        widget.list_widget.item(1).setSelected(True)
+        widget.remove_selected()
+
+        assert widget.get_all_files() == [Path("a.pdf[2]")]
+        widget.add_file(Path("a.pdf"))
+        assert widget.count() == 2
+
+    def test_reorder_follows_display(self, qtbot) -> None:
+        widget = FileListWidget(allow_reorder=True)
+        qtbot.addWidget(widget)
+        widget.add_files([Path("a.pdf"), Path("b.pdf"), Path("c.pdf")])
+        widget.list_widget.model().moveRow(
+            widget.list_widget.rootIndex(), 2, widget.list_widget.rootIndex(), 0
+        )
+
+        assert widget.get_all_files() == [Path("c.pdf"), Path("a.pdf"), Path("b.pdf")]
+        widget.list_widget.item(0).setSelected(True)
+        widget.remove_selected()
+        assert widget.get_all_files() == [Path("a.pdf"), Path("b.pdf")]
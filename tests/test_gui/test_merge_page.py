@@ -0,0 +1,18 @@
+"""Tests for the merge page."""
+
+from pathlib import Path
+
+from pdf_toolbox.gui.pages.merge_page import MergePage
+
+
+class TestMergePage:
+    def test_visible_jobs_reach_worker(self, qtbot, tmp_path: Path) -> None:
+        page = MergePage()
+        qtbot.addWidget(page)
+        spin = page._merge_jobs_spin
+        assert spin.isVisibleTo(page)
+        spin.setMaximum(4)
+        spin.setValue(3)
+
+        worker = page.create_worker([tmp_path / "a.pdf", tmp_path / "b.pdf[2]"])
+        assert worker.max_workers == 3
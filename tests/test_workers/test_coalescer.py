@@ -0,0 +1,79 @@
+"""Tests for worker-to-GUI update coalescing."""
+
+import threading
+import time
+from pathlib import Path
+
+from pdf_toolbox.workers.base_worker import BaseWorker, FileResult, TaskStatus
+from pdf_toolbox.workers.coalescer import SignalCoalescer, UpdateBatch
+
+
+class _Sink:
+    def __init__(self) -> None:
+        self.batches: list[UpdateBatch] = []
+        self.delivered = threading.Event()
+
+    def __call__(self, batch: UpdateBatch) -> None:
+        self.batches.append(batch)
+        self.delivered.set()
+
+
+class TestSignalCoalescer:
+    def test_first_update_is_delivered_at_once(self) -> None:
+        sink = _Sink()
+        SignalCoalescer(sink, interval=10).log("hello")
+        assert [b.logs for b in sink.batches] == [["hello"]]
+
+    def test_burst_is_batched_and_kept_in_order(self) -> None:
+        sink = _Sink()
+        coalescer = SignalCoalescer(sink, interval=10)
+        for i in range(1000):
+            coalescer.log(str(i))
+            coalescer.progress(i + 1, 1000, "")
+        coalescer.flush()
+
+        assert len(sink.batches) == 2
+        assert [line for b in sink.batches for line in b.logs] == [str(i) for i in range(1000)]
+        assert sink.batches[-1].progress == (1000, 1000, "")
+
+    def test_held_updates_are_flushed_by_timer(self) -> None:
+        sink = _Sink()
+        coalescer = SignalCoalescer(sink, interval=0.05)
+        coalescer.log("first")
+        sink.delivered.clear()
+        coalescer.log("second")
+        assert sink.delivered.wait(timeout=2)
+        assert [b.logs for b in sink.batches] == [["first"], ["second"]]
+
+    def test_progress_drops_stale_step(self) -> None:
+        sink = _Sink()
+        coalescer = SignalCoalescer(sink, interval=10)
+        coalescer.log("start")
+        coalescer.step(3, 4)
+        coalescer.progress(2, 2, "next")
+        coalescer.flush()
+        assert sink.batches[-1].step is None
+        assert sink.batches[-1].progress == (2, 2, "next")
+
+
+class _FastWorker(BaseWorker):
+    def process_file(self, file_path: Path, index: int, total: int) -> FileResult:
+        return FileResult(file_path, None, TaskStatus.SUCCESS, f"ok {file_path.name}")
+
+
+class TestWorkerCoalescing:
+    def test_many_files_few_signals(self, qtbot) -> None:
+        worker = _FastWorker([Path(f"{i}.pdf") for i in range(2000)])
+        batches: list[list] = []
+        logs: list[str] = []
+        worker.files_completed.connect(batches.append)
+        worker.log_messages.connect(logs.extend)
+
+        with qtbot.waitSignal(worker.task_finished, timeout=10000):
+            started = time.monotonic()
+            worker.start()
+        elapsed = time.monotonic() - started
+
+        assert sum(len(b) for b in batches) == 2000
+        assert len(batches) <= elapsed / 0.04 + 2
+        assert logs[-1] == "ok 1999.pdf"
@@ -0,0 +1,48 @@
+"""Tests for per-input results and cancellation of MergeWorker."""
+
+from pathlib import Path
+
+import pikepdf
+
+from pdf_toolbox.workers.base_worker import TaskStatus
+from pdf_toolbox.workers.merge_worker import MergeWorker
+from tests.helpers import MakePdf
+
+
+def _run(qtbot, worker: MergeWorker) -> list:
+    with qtbot.waitSignal(worker.task_finished, timeout=10000) as blocker:
+        worker.start()
+    worker.wait()
+    return blocker.args
+
+
+class TestMergeWorker:
+    def test_result_per_input(self, qtbot, tmp_path: Path, make_pdf: MakePdf) -> None:
+        files = [make_pdf(tmp_path / f"{i}.pdf", i + 1) for i in range(3)]
+        files[1].write_bytes(b"broken")
+        out = tmp_path / "merged.pdf"
+        worker = MergeWorker(files, out)
+
+        success, _, results = _run(qtbot, worker)
+
+        assert success
+        assert [r.status for r in results] == [
+            TaskStatus.SUCCESS,
+            TaskStatus.FAILED,
+            TaskStatus.SUCCESS,
+        ]
+        assert results[0].output == out
+        with pikepdf.open(out) as pdf:
+            assert len(pdf.pages) == 4
+
+    def test_cancel_writes_nothing(self, qtbot, tmp_path: Path, make_pdf: MakePdf) -> None:
+        files = [make_pdf(tmp_path / f"{i}.pdf", i + 1) for i in range(2)]
+        out = tmp_path / "merged.pdf"
+        worker = MergeWorker(files, out)
+        worker.cancel()
+
+        success, _, results = _run(qtbot, worker)
+
+        assert not success
+        assert [r.status for r in results] == [TaskStatus.CANCELLED] * 2
+        assert not out.exists()
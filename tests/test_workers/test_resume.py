@@ -0,0 +1,102 @@
+"""Tests for journal-based resume of worker batches."""
+
+from pathlib import Path
+
+from pdf_toolbox.core.batch import FileJob
+from pdf_toolbox.core.cache import ResultCache
+from pdf_toolbox.workers.base_worker import TaskStatus
+from pdf_toolbox.workers.rotate_worker import RotateWorker
+from tests.helpers import MakePdf
+
+
+def _run(qtbot, files: list[Path], out: Path, journal: Path, resume: bool) -> RotateWorker:
+    worker = RotateWorker(files, degrees=90, output_dir=out)
+    worker.set_journal(journal, resume=resume)
+    with qtbot.waitSignal(worker.task_finished, timeout=10000):
+        worker.start()
+    worker.wait()
+    return worker
+
+
+class TestResume:
+    def test_resume_skips_completed_files(self, qtbot, tmp_path: Path, make_pdf: MakePdf) -> None:
+        files = [make_pdf(tmp_path / "in" / f"{i}.pdf") for i in range(3)]
+        out = tmp_path / "out"
+        out.mkdir()
+        journal = tmp_path / "journal.jsonl"
+
+        first = _run(qtbot, files[:2], out, journal, resume=False)
+        assert [r.status for r in first.results] == [TaskStatus.SUCCESS] * 2
+
+        second = _run(qtbot, files, out, journal, resume=True)
+        assert [r.status for r in second.results] == [
+            TaskStatus.SKIPPED,
+            TaskStatus.SKIPPED,
+            TaskStatus.SUCCESS,
+        ]
+        assert sorted(p.name for p in out.iterdir()) == [
+            "0_rotated.pdf",
+            "1_rotated.pdf",
+            "2_rotated.pdf",
+        ]
+
+    def test_without_resume_everything_runs(self, qtbot, tmp_path: Path, make_pdf: MakePdf) -> None:
+        files = [make_pdf(tmp_path / "in" / "0.pdf")]
+        out = tmp_path / "out"
+        out.mkdir()
+        journal = tmp_path / "journal.jsonl"
+
+        _run(qtbot, files, out, journal, resume=False)
+        again = _run(qtbot, files, out, journal, resume=False)
+        assert again.results[0].status == TaskStatus.SUCCESS
+        assert (out / "0_rotated_1.pdf").exists()
+
+    def test_each_job_built_once(self, qtbot, tmp_path: Path, make_pdf: MakePdf) -> None:
+        built: list[Path] = []
+
+        class CountingWorker(RotateWorker):
+            def build_job(self, file_path: Path, index: int, total: int) -> FileJob:
+                built.append(file_path)
+                return super().build_job(file_path, index, total)
+
+        files = [make_pdf(tmp_path / "in" / f"{i}.pdf") for i in range(2)]
+        out = tmp_path / "out"
+        out.mkdir()
+        worker = CountingWorker(files, degrees=90, output_dir=out)
+        worker.set_journal(tmp_path / "journal.jsonl")
+        worker.set_cache(ResultCache(tmp_path / "cache"))
+        with qtbot.waitSignal(worker.task_finished, timeout=10000):
+            worker.start()
+        worker.wait()
+
+        assert [r.status for r in worker.results] == [TaskStatus.SUCCESS] * 2
+        assert built == files
+
+
+class TestResultCache:
+    def test_second_batch_reuses_cached_outputs(
+        self, qtbot, tmp_path: Path, make_pdf: MakePdf
+    ) -> None:
+        files = [make_pdf(tmp_path / "in" / f"{i}.pdf") for i in range(2)]
+        cache = tmp_path / "cache"
+        (tmp_path / "out1").mkdir()
+        (tmp_path / "out2").mkdir()
+
+        first = RotateWorker(files, degrees=90, output_dir=tmp_path / "out1")
+        first.set_cache(ResultCache(cache))
+        with qtbot.waitSignal(first.task_finished, timeout=10000):
+            first.start()
+        first.wait()
+
+        second = RotateWorker(files, degrees=90, output_dir=tmp_path / "out2")
+        second.set_cache(ResultCache(cache))
+        with qtbot.waitSignal(second.task_finished, timeout=10000) as blocker:
+            second.start()
+        second.wait()
+
+        assert [r.engine for r in second.results] == ["cache", "cache"]
+        assert all(r.status == TaskStatus.SUCCESS for r in second.results)
+        assert (tmp_path / "out2" / "0_rotated.pdf").read_bytes() == (
+            tmp_path / "out1" / "0_rotated.pdf"
+        ).read_bytes()
+        assert "命中 2" in blocker.args[1]
@@ -0,0 +1,68 @@
+"""Tests for the application-wide job scheduler."""
+
+from pdf_toolbox.workers.scheduler import JobScheduler, JobState
+from tests.helpers import SleepWorker
+
+
+class TestJobScheduler:
+    def test_global_budget_queues_jobs(self, qtbot) -> None:
+        scheduler = JobScheduler(max_slots=1)
+        first = scheduler.submit(SleepWorker(), "first")
+        second = scheduler.submit(SleepWorker(), "second")
+        assert first.state == JobState.RUNNING
+        assert second.state == JobState.QUEUED
+
+        qtbot.waitUntil(lambda: second.state == JobState.DONE, timeout=5000)
+        assert first.state == JobState.DONE
+        assert second.summary == "ok"
+
+    def test_engine_limit(self, qtbot) -> None:
+        scheduler = JobScheduler(max_slots=4, engine_limits={"ghostscript": 1})
+        gs1 = scheduler.submit(SleepWorker("ghostscript"), "gs1")
+        gs2 = scheduler.submit(SleepWorker("ghostscript"), "gs2")
+        other = scheduler.submit(SleepWorker("pikepdf"), "other")
+        assert gs1.state == JobState.RUNNING
+        assert gs2.state == JobState.QUEUED
+        assert other.state == JobState.RUNNING
+
+        qtbot.waitUntil(lambda: gs2.state == JobState.DONE, timeout=5000)
+
+    def test_parallel_request_clamped_to_budget(self, qtbot) -> None:
+        scheduler = JobScheduler(max_slots=2)
+        worker = SleepWorker()
+        worker.set_max_workers(8)
+        job = scheduler.submit(worker, "wide")
+        assert job.slots == 2
+        assert worker.max_workers == 2
+        qtbot.waitUntil(lambda: job.state == JobState.DONE, timeout=5000)
+
+    def test_cancel_queued_job_never_starts(self, qtbot) -> None:
+        scheduler = JobScheduler(max_slots=1)
+        running = scheduler.submit(SleepWorker(), "running")
+        queued_worker = SleepWorker()
+        started: list[bool] = []
+        queued_worker.started.connect(lambda: started.append(True))
+        finished: list[bool] = []
+        queued_worker.task_finished.connect(lambda *_: finished.append(True))
+        queued = scheduler.submit(queued_worker, "queued")
+
+        with qtbot.waitSignal(scheduler.job_cancelled) as blocker:
+            scheduler.cancel(queued_worker)
+        assert blocker.args == [queued.job_id]
+        assert queued.state == JobState.CANCELLED
+        assert queued.worker is None
+
+        qtbot.waitUntil(lambda: running.state == JobState.DONE, timeout=5000)
+        assert queued.state == JobState.CANCELLED
+        assert started == []
+        # The worker itself never reports a finish it did not have.
+        assert finished == []
+
+    def test_finished_jobs_release_workers(self, qtbot) -> None:
+        scheduler = JobScheduler(max_slots=1)
+        worker = SleepWorker("ghostscript")
+        job = scheduler.submit(worker, "done")
+        with qtbot.waitSignal(worker.destroyed, timeout=5000):
+            qtbot.waitUntil(lambda: job.state == JobState.DONE, timeout=5000)
+        assert job.worker is None
+        assert (job.engine, job.file_count, job.summary) == ("ghostscript", 1, "ok")
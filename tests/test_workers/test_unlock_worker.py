@@ -0,0 +1,23 @@
+"""Tests for the unlock worker."""
+
+from pathlib import Path
+
+import pytest
+
+from pdf_toolbox.core.unlock import RepairEngine
+from pdf_toolbox.workers import unlock_worker
+from pdf_toolbox.workers.unlock_worker import UnlockWorker
+
+
+@pytest.mark.parametrize(
+    ("engines", "expected"),
+    [
+        ([RepairEngine.PYMUPDF, RepairEngine.GHOSTSCRIPT], "ghostscript"),
+        ([RepairEngine.PYMUPDF, RepairEngine.SIMPLE_COPY], "pymupdf"),
+    ],
+)
+def test_counts_against_ghostscript_limit_when_installed(
+    qtbot, monkeypatch: pytest.MonkeyPatch, engines: list[RepairEngine], expected: str
+) -> None:
+    monkeypatch.setattr(unlock_worker, "available_engines", lambda: engines)
+    assert UnlockWorker([Path("a.pdf")], batched=True).engine == expected